@@ -1,16 +1,62 @@
+import json
+from hashlib import md5
+from base64 import urlsafe_b64encode, urlsafe_b64decode
 from datetime import datetime
 from threading import RLock, current_thread
 from time import sleep
 
 from sqlalchemy import *
-from sqlalchemy import types
+from sqlalchemy import exc, types
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import mapper
 
 from ActMonitor.server_application.database_actions import DB_SCHEMA, DYNAMIC_API_OBJECT_NAME, ALERT_RULES_OBJECT_NAME, \
-    ALERT_FINDS_OBJECT_NAME, DEFAULT_OBJECT_NAMES
-from db_task import DBTask
+    ALERT_FINDS_OBJECT_NAME, DEFAULT_OBJECT_NAMES, ROW_COUNTS_TABLE_NAME
+from db_alert_rules import get_matching_rules
+from db_task import DBTask, DBTaskListFull, READ_ACTIONS, get_insert_times
 from template_dynamic_object import TemplateDynamicObject
 
+# max seconds a statement of each action type may run before the database cancels it (statement_timeout)
+ACTION_TIMEOUTS = {
+    "select": 10,
+    "stream": 10,
+    "page": 10,
+    "insert": 30,
+    "update": 60,
+    "delete": 60,
+    "update_count": 300,
+    "drop": 60,
+    "create_index": 3600
+}
+
+# max seconds a statement of an action type missing from ACTION_TIMEOUTS may run
+DEFAULT_ACTION_TIMEOUT = 60
+
+# inserts of at least this many rows skip the ORM and use SQLAlchemy Core (see __insert_bulk_rows__)
+BULK_INSERT_MIN_ROWS = 2
+
+# max rows per INSERT statement of an executemany on PostgreSQL (see get_engine_options)
+BULK_INSERT_CHUNK_ROWS = 1000
+
+# rows fetched from the server-side cursor of a "stream" action at a time - one chunk of its DBStream
+STREAM_CHUNK_ROWS = 500
+
+# columns a "page" action can seek by (its sort_by) and the key of each - the key is unique, so no row is skipped
+#   _id is the primary key, (_timestamp_created, _id) has an index of its own (see get_page_index_name)
+PAGE_KEYS = {
+    "_id": ["_id"],
+    "_timestamp_created": ["_timestamp_created", "_id"]
+}
+
+# rows of a "page" action without a limit
+DEFAULT_PAGE_ROWS = 100
+
+# format of a datetime in a page cursor
+PAGE_CURSOR_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+# max length of an index name (PostgreSQL truncates longer identifiers)
+MAX_INDEX_NAME_LENGTH = 63
+
 
 class DBAction:
     """
@@ -19,7 +65,21 @@ class DBAction:
     VARIABLES
         member_vars_lock    -> RLock instance to make sure creating/dropping tables is thread-safe
         utils               -> DBUtils instance that carries most of the 'global' tools
-        session             -> SQLAlchemy scoped sessionto perform an action
+        session             -> SQLAlchemy session to perform actions (None until the first action)
+            every DBWorker has a DBAction of its own, so no other thread ever uses (or commits) this session
+            the session is reused across actions - it is not recreated per action
+        backend_pid         -> database backend process ID of the current connection of session (None if unknown)
+            used by DBPool to cancel the statement of a stuck worker (see cancel_backend)
+        alert_rules_changed -> boolean indicating the current action changed _Alert_Rules
+            the in-memory index of the rules is invalidated once the action is committed (see __end_dynamic_action__)
+        pending_counts      -> dictionary of row counts of dynamic objects changed by the current action
+            published to dynamic_objects once the action is committed (see __add_to_row_count__)
+        pending_alert_finds -> list of alert findings of the rows inserted by the current action
+            enqueued once the action is committed (see __check_if_to_create_alerts__)
+        pending_objects     -> dictionary of the dynamic objects created (dynamic object) or dropped (None) by the
+            current action - published to dynamic_objects once the action is committed
+        pending_tables      -> list of the tables the current action added to the metadata
+            removed from the metadata again if the action is rolled back
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -32,9 +92,11 @@ class DBAction:
     NAME
         __init__ - constructor to set variables and load dynamic objects
     SYNOPSIS
-        __init__(self, utils)
-            self    -> the instance of the class
-            utils   -> DBUtils instance that carries most of the 'global' tools
+        __init__(self, utils, load_objects=True)
+            self            -> the instance of the class
+            utils           -> DBUtils instance that carries most of the 'global' tools
+            load_objects    -> boolean value if to load the dynamic objects (default is True)
+                dynamic objects are shared through utils - only the first DBAction loads them
     DESCRIPTION
         initialize the instance and load dynamic objects
     RETURNS
@@ -44,10 +106,18 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __init__(self, utils):
+    def __init__(self, utils, load_objects=True):
         self.utils = utils
+        self.session = None
+        self.backend_pid = None
+        self.alert_rules_changed = False
+        self.pending_counts = {}
+        self.pending_alert_finds = []
+        self.pending_objects = {}
+        self.pending_tables = []
 
-        self.__load_objects__()
+        if load_objects:
+            self.__load_objects__()
 
     """
     NAME
@@ -56,9 +126,14 @@ class DBAction:
         __load_objects__(self)
             self    -> the instance of the class
     DESCRIPTION
-        1. retrieves all existing tables
+        1. retrieves the default tables (only those are reflected - not the tables of the custom dynamic objects)
+            a default table with a valid snapshot is not reflected (see DBSchemaCache)
+            creates the table of row counts if it does not exist (see __verify_row_counts_table__)
         2. for all default tables found in step 1, create a dynamic object
-        3. if dynamic_api table was found in step 1, create a custom dynamic object for each row in dynamic_api table
+        3. if dynamic_api table was found in step 1, record a stub of a custom dynamic object for each row in
+            dynamic_api table with its row count (see __record_dynamic_stub__)
+            the table of a stub is reflected and mapped on its first use (see __load_dynamic_object__)
+            so start up takes the same time no matter how many dynamic objects there are
     RETURNS
         None
     AUTHOR
@@ -67,9 +142,18 @@ class DBAction:
         4/25/2016
     """
     def __load_objects__(self):
-        # get list of all tables in the database
-        self.utils.metadata.reflect(bind=self.utils.engine, schema=DB_SCHEMA)
-        existing_tables = dict(self.utils.metadata.tables)
+        # get the default tables in the database
+        self.utils.schema.load_fingerprints(self.utils.engine, DB_SCHEMA)
+        default_table_names = [default_object_name.lower() for default_object_name in DEFAULT_OBJECT_NAMES]
+        with self.member_vars_lock:
+            cached_table_names = [table_name for table_name in default_table_names
+                                  if self.utils.schema.get_table(table_name, self.utils.metadata) is not None]
+            if len(cached_table_names) < len(default_table_names):
+                self.utils.metadata.reflect(bind=self.utils.engine, schema=DB_SCHEMA,
+                                            only=lambda table_name, metadata: table_name in default_table_names and
+                                            table_name not in cached_table_names)
+            existing_tables = dict(self.utils.metadata.tables)
+        self.__verify_row_counts_table__()
 
         # create the Dynamic Api object to begin mapping
         found_dynamic_api_table = False
@@ -77,6 +161,8 @@ class DBAction:
             for default_object_name in DEFAULT_OBJECT_NAMES:
                 if default_object_name.lower() in table_name:
                     self.__create_dynamic_object__(default_object_name, object_table=table)
+                    if table.name not in cached_table_names:
+                        self.utils.schema.put_table(self.utils.engine, table)
                     if default_object_name == DYNAMIC_API_OBJECT_NAME:
                         found_dynamic_api_table = True
 
@@ -90,11 +176,13 @@ class DBAction:
                                                      object_name=DYNAMIC_API_OBJECT_NAME,
                                                      select_data=["object_name", "api_url"]))
         print existing_objects
+        row_counts = self.utils.row_counts
+        existing_counts = dict(self.utils.engine.execute(select([row_counts.c.object_name, row_counts.c.row_count]))
+                               .fetchall())
         for exst_obj in list(existing_objects):
             object_api = exst_obj.get("api_url")
-            object_table = existing_tables.get("{0}.{1}".format(DB_SCHEMA, object_api))
             object_name = str(exst_obj.get("object_name"))
-            self.__create_dynamic_object__(object_name, object_table=object_table)
+            self.__record_dynamic_stub__(object_name, object_api, existing_counts.get(object_name))
 
     """
     NAME
@@ -112,15 +200,32 @@ class DBAction:
             delete - delete data from some dynamic object (delete rows from table)
             update - update data for some dynamic object (update rows from table)
             select - select data from some dynamic object (select rows from table)
+            stream - select data from some dynamic object chunk by chunk into the DBStream of the task
+            page - select a page of data from some dynamic object after a page cursor (keyset pagination)
             update_count - update the cached row count of some dynamic object (SELECT count(*) from SOME_TABLE)
+                only if the count is not known yet (-1) - returns the count
+            create_index - index columns of the table of some dynamic object (see __create_index__)
         Unsupported action types will raise an exception
 
-        All actions (except "create") perform the following:
+        "create" and "drop" are one action each - the row of dynamic_api, the table and its row count are changed in
+            the same transaction, and dynamic_objects only changes once it is committed
+
+        All actions (except "create" and "create_index") perform the following:
             1. gather metadata about dynamic object (class, table, lock)
             2. use dynamic object's lock to make sure only 1 thread acts on an object at a time
-            3. generate a DB session
+                except reads (READ_ACTIONS) - they never hold the lock, so a slow read never holds up writes
+            3. generate a DB session with the statement timeout of the action type (see ACTION_TIMEOUTS)
+            4. if the action fails (ex: its statement was cancelled), roll back the session so the thread's next
+                action starts clean
     RETURNS
-        None
+        select - list of selected rows (dictionaries)
+        stream - number of rows streamed
+        page - { "page_data": list of selected rows, "next_cursor": cursor of the next page (None if last page) }
+        insert - list of the IDs of the new rows (None for a merged task - see merge_insert_tasks)
+        delete, update - number of affected rows
+        update_count - row count of the dynamic object
+        create_index - name of the index
+        other actions - None
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -133,100 +238,168 @@ class DBAction:
             #
             # db data types:
             #   Unicode(255), String, Float, Integer
-            self.__create_dynamic_object__(db_task.object_name, properties=db_task.additional_args.get("properties"),
-                               api_url=db_task.additional_args.get("api_url"))
+            #
+            # kwargs.get("indexes")
+            #   [ column name, or [ column names ] of a composite index ]
+            try:
+                self.__begin_dynamic_action__(db_task.action)
+                self.__create_dynamic_object__(db_task.object_name,
+                                               properties=db_task.additional_args.get("properties"),
+                                               api_url=db_task.additional_args.get("api_url"),
+                                               indexes=db_task.additional_args.get("indexes"))
+                self.__end_dynamic_action__()
+            except Exception:
+                self.__rollback_dynamic_action__()
+                raise
+
+        elif db_task.action == "create_index":
+            # kwargs.get("columns")
+            #   column name, or [ column names ] of a composite index
+            #
+            # the lock of the dynamic object is not held - writes to the object go on while the index is built
+            object_class, object_table, object_lock = self.__get_dynamic_object_properties__(db_task.object_name)
+            return self.__create_index__(db_task.object_name, object_table, db_task.additional_args.get("columns"))
+
+        elif db_task.action in READ_ACTIONS:
+            # the lock of the dynamic object is not held - a slow read (ex: a long download) never holds up writes
+            object_class, object_table, object_lock = self.__get_dynamic_object_properties__(db_task.object_name)
+            try:
+                self.__begin_dynamic_action__(db_task.action)
+
+                # where_data
+                #   { property_to_filter_by: value_to_filter_by }
+                # kwargs.get("select_data")
+                #   [ some object properties to retrieve ]
+                # kwargs.get("limit")
+                #   number of rows to retrieve
+                # kwargs.get("offset")
+                #   offset of where to start query
+                # kwargs.get("sort_by")
+                #   column/property to sort by (default is "_id")
+                # kwargs.get("sort_order")
+                #   True if ascending (default), False if descending
+                where_data = db_task.additional_args.get("where_data", {})
+                select_data = db_task.additional_args.get("select_data", [])
+                limit = db_task.additional_args.get("limit", 0)
+                offset = db_task.additional_args.get("offset", 0)
+                sort_by = db_task.additional_args.get("sort_by", "_id")
+                sort_order = db_task.additional_args.get("sort_order", True)
+                if db_task.action == "page":
+                    # kwargs.get("cursor")
+                    #   next_cursor of the previous page (None or "" for the first page)
+                    data = self.__page_record__(object_name=db_task.object_name,
+                                                object_table=object_table,
+                                                where_data=where_data,
+                                                select_data=select_data,
+                                                limit=limit,
+                                                sort_by=sort_by,
+                                                sort_order=sort_order,
+                                                cursor=db_task.additional_args.get("cursor"))
+                elif db_task.action == "stream":
+                    data = self.__stream_record__(object_name=db_task.object_name,
+                                                  object_table=object_table,
+                                                  where_data=where_data,
+                                                  select_data=select_data,
+                                                  limit=limit,
+                                                  offset=offset,
+                                                  sort_by=sort_by,
+                                                  sort_order=sort_order,
+                                                  stream=db_task.future)
+                else:
+                    data = self.__select_record__(object_name=db_task.object_name,
+                                                  object_table=object_table,
+                                                  where_data=where_data,
+                                                  select_data=select_data,
+                                                  limit=limit,
+                                                  offset=offset,
+                                                  sort_by=sort_by,
+                                                  sort_order=sort_order)
+                self.__end_dynamic_action__()
+                return data
+            except Exception:
+                self.__rollback_dynamic_action__()
+                raise
 
         else:
             object_class, object_table, object_lock = self.__get_dynamic_object_properties__(db_task.object_name)
 
             with object_lock:
-                self.__begin_dynamic_action__()
-
-                if db_task.action == "drop":
-                    self.__drop_dynamic_object__(db_task.object_name, object_table)
-                else:
-                    if db_task.action == "insert":
-                        # kwargs.get("insert_data")
-                        #   one: { all object properties and values to insert }
-                        #   many: [ { all object properties and values to insert } ]
-                        insert_data = db_task.additional_args.get("insert_data", {})
-                        self.__insert_record__(object_name=db_task.object_name,
-                                               object_class=object_class,
-                                               insert_data=insert_data)
-                    elif db_task.action == "delete":
-                        # kwargs.get("where_data")
-                        #   { some object properties and values for delete filter }
-                        # kwargs.get("limit")
-                        #   number of rows to delete
-                        # kwargs.get("offset")
-                        #   offset of where to start query
-                        where_data = db_task.additional_args.get("where_data", {})
-                        limit = db_task.additional_args.get("limit", 0)
-                        offset = db_task.additional_args.get("offset", 0)
-                        self.__delete_record__(object_name=db_task.object_name,
-                                               object_class=object_class,
-                                               where_data=where_data,
-                                               limit=limit,
-                                               offset=offset)
-                    elif db_task.action == "update":
-                        # kwargs.get("where_data")
-                        #   { some object properties and values for delete filter }
-                        # kwargs.get("update_data")
-                        #   { some object properties and values to update }
-                        # kwargs.get("limit")
-                        #   number of rows to update
-                        # kwargs.get("offset")
-                        #   offset of where to start query
-                        where_data = db_task.additional_args.get("where_data", {})
-                        update_data = db_task.additional_args.get("update_data", {})
-                        limit = db_task.additional_args.get("limit", 0)
-                        offset = db_task.additional_args.get("offset", 0)
-                        self.__update_record__(object_name=db_task.object_name,
-                                               object_class=object_class,
-                                               where_data=where_data,
-                                               update_data=update_data,
-                                               limit=limit,
-                                               offset=offset)
-                    elif db_task.action == "select":
-                        # where_data
-                        #   { property_to_filter_by: value_to_filter_by }
-                        # kwargs.get("select_data")
-                        #   [ some object properties to retrieve ]
-                        # kwargs.get("limit")
-                        #   number of rows to retrieve
-                        # kwargs.get("offset")
-                        #   offset of where to start query
-                        # kwargs.get("sort_by")
-                        #   column/property to sort by (default is "_id")
-                        # kwargs.get("sort_order")
-                        #   True if ascending (default), False if descending
-                        where_data = db_task.additional_args.get("where_data", {})
-                        select_data = db_task.additional_args.get("select_data", [])
-                        limit = db_task.additional_args.get("limit", 0)
-                        offset = db_task.additional_args.get("offset", 0)
-                        sort_by = db_task.additional_args.get("sort_by", "_id")
-                        sort_order = db_task.additional_args.get("sort_order", True)
-                        data = self.__select_record__(object_name=db_task.object_name,
-                                                      object_class=object_class,
-                                                      where_data=where_data,
-                                                      select_data=select_data,
-                                                      limit=limit,
-                                                      offset=offset,
-                                                      sort_by=sort_by,
-                                                      sort_order=sort_order)
-                        self.__end_dynamic_action__()
-                        return data
-
-                    elif db_task.action == "update_count":
-                        while self.utils.dynamic_objects[db_task.object_name]["count"] == -1:
-                            self.__update_count__(db_task.object_name, object_class)
-                        self.__end_dynamic_action__()
+                try:
+                    self.__begin_dynamic_action__(db_task.action)
 
+                    if db_task.action == "drop":
+                        self.__drop_dynamic_object__(db_task.object_name, object_table)
                     else:
-                        self.__end_dynamic_action__()
-                        raise ValueError("Action type invalid: {0}".format(db_task.action_type))
-
-                self.__end_dynamic_action__()
+                        if db_task.action == "insert":
+                            # kwargs.get("insert_data")
+                            #   one: { all object properties and values to insert }
+                            #   many: [ { all object properties and values to insert } ]
+                            # kwargs.get("created_at")
+                            #   seconds since epoch the task was created at (see DBManager.create_task)
+                            insert_data = db_task.additional_args.get("insert_data", {})
+                            if db_task.object_name == ALERT_FINDS_OBJECT_NAME:
+                                self.__insert_alert_finds__(db_task, object_class)
+                            elif db_task.merged is not None:
+                                self.__insert_merged_records__(db_task, object_class)
+                            else:
+                                new_ids = self.__insert_record__(object_name=db_task.object_name,
+                                                                 object_class=object_class,
+                                                                 insert_data=insert_data,
+                                                                 created_at=get_insert_times([db_task]))
+                                self.__end_dynamic_action__()
+                                return new_ids
+                        elif db_task.action == "delete":
+                            # kwargs.get("where_data")
+                            #   { some object properties and values for delete filter }
+                            # kwargs.get("limit")
+                            #   number of rows to delete
+                            # kwargs.get("offset")
+                            #   offset of where to start query
+                            where_data = db_task.additional_args.get("where_data", {})
+                            limit = db_task.additional_args.get("limit", 0)
+                            offset = db_task.additional_args.get("offset", 0)
+                            deleted = self.__delete_record__(object_name=db_task.object_name,
+                                                             object_table=object_table,
+                                                             where_data=where_data,
+                                                             limit=limit,
+                                                             offset=offset)
+                            self.__end_dynamic_action__()
+                            return deleted
+                        elif db_task.action == "update":
+                            # kwargs.get("where_data")
+                            #   { some object properties and values for delete filter }
+                            # kwargs.get("update_data")
+                            #   { some object properties and values to update }
+                            # kwargs.get("limit")
+                            #   number of rows to update
+                            # kwargs.get("offset")
+                            #   offset of where to start query
+                            where_data = db_task.additional_args.get("where_data", {})
+                            update_data = db_task.additional_args.get("update_data", {})
+                            limit = db_task.additional_args.get("limit", 0)
+                            offset = db_task.additional_args.get("offset", 0)
+                            updated = self.__update_record__(object_name=db_task.object_name,
+                                                             object_table=object_table,
+                                                             where_data=where_data,
+                                                             update_data=update_data,
+                                                             limit=limit,
+                                                             offset=offset)
+                            self.__end_dynamic_action__()
+                            return updated
+                        elif db_task.action == "update_count":
+                            if self.utils.dynamic_objects[db_task.object_name]["count"] == -1:
+                                self.__update_count__(db_task.object_name, object_class)
+                            self.__end_dynamic_action__()
+                            return self.utils.dynamic_objects[db_task.object_name]["count"]
+
+                        else:
+                            self.__end_dynamic_action__()
+                            raise ValueError("Action type invalid: {0}".format(db_task.action))
+
+                    self.__end_dynamic_action__()
+                except Exception:
+                    self.__rollback_dynamic_action__()
+                    raise
 
     """
     NAME
@@ -238,6 +411,7 @@ class DBAction:
     DESCRIPTION
         If object_name is not a name of an existing dynamic object, raise ValueError
 
+        If the dynamic object is a stub, load it first (see __load_dynamic_object__)
         Gather the dynamic object's metadata and return it
     RETURNS
         dynamic object's class, dynamic object's table, dynamic object's lock
@@ -249,6 +423,8 @@ class DBAction:
     def __get_dynamic_object_properties__(self, object_name):
         if object_name in self.utils.dynamic_objects:
             dynamic_object = self.utils.dynamic_objects.get(object_name)
+            if dynamic_object.get("class") is None:
+                self.__load_dynamic_object__(object_name, dynamic_object)
 
             dynamic_class = dynamic_object.get("class")
             dynamic_table = dynamic_object.get("table")
@@ -271,10 +447,16 @@ class DBAction:
             object_name     -> string name of dynamic object
             object_table    -> SQLAlchemy Table of the dynamic object
     DESCRIPTION
-        1. delete dynamic object's API from dynamic api table
-            removes this api from the system
-        2. drop database table (if exists)
-        3. delete dynamic object from the list of dynamic_objects
+        All in the transaction of the current action (session):
+            1. delete dynamic object's API from dynamic api table
+                removes this api from the system
+            2. drop database table (if exists) - only this table, other tables are not inspected
+            3. delete the row count of the dynamic object
+
+        Once the action is committed (see __forget_dynamic_object__):
+            1. remove the table from the metadata (thread-safe) - the metadata is not reflected again
+                its snapshot and columns are forgotten (see DBSchemaCache)
+            2. delete dynamic object from the list of dynamic_objects and its cached statements
     RETURNS
         None
     AUTHOR
@@ -288,23 +470,55 @@ class DBAction:
         # get rid of the api first
         self.__delete_dynamic_api__(object_name)
 
-        with self.member_vars_lock:
-            self.utils.metadata.drop_all(tables=[object_table], checkfirst=True)
-            # object_table.drop(self.utils.engine)
-            self.utils.metadata.reflect(bind=self.utils.engine, schema=DB_SCHEMA)
+        object_table.drop(bind=self.session.connection(), checkfirst=True)
+
+        row_counts = self.utils.row_counts
+        self.session.execute(row_counts.delete().where(row_counts.c.object_name == object_name))
+        self.pending_objects[object_name] = None
+
+    """
+    NAME
+        __forget_dynamic_object__ - forgets a dropped dynamic object
+    SYNOPSIS
+        __forget_dynamic_object__(self, object_name)
+            self            -> the instance of the class
+            object_name     -> string name of the dropped dynamic object
+    DESCRIPTION
+        Called once the drop is committed (see __end_dynamic_action__)
+
+        1. remove the table from the metadata (thread-safe) - the metadata is not reflected again
+            its snapshot and columns are forgotten (see DBSchemaCache)
+        2. delete dynamic object from the list of dynamic_objects and its cached statements
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __forget_dynamic_object__(self, object_name):
+        dynamic_object = self.utils.dynamic_objects.pop(object_name, None)
+        if dynamic_object is None:
+            return
 
-        del self.utils.dynamic_objects[object_name]
+        object_table = dynamic_object.get("table")
+        if object_table is not None:
+            with self.member_vars_lock:
+                self.utils.metadata.remove(object_table)
+        self.utils.schema.forget(dynamic_object["table_name"])
+        self.utils.statements.invalidate(object_name)
 
     """
     NAME
         __create_dynamic_object__ - create a dynamic object
     SYNOPSIS
-        __create_dynamic_object__(self, object_name, properties=None, object_table=None, api_url=None)
+        __create_dynamic_object__(self, object_name, properties=None, object_table=None, api_url=None, indexes=None)
             self            -> the instance of the class
             object_name     -> string name of dynamic object
             properties      -> list of column specifications to include in DB table (optional)
             object_table    -> SQLAlchemy Table of the dynamic object (optional)
             api_url         -> string API name of dynamic object - also the name of the table (optional)
+            indexes         -> list of index definitions of a new table (optional - see __create_dynamic_table__)
     DESCRIPTION
         This function has 2 use cases:
             1. correlate an existing table with a new object (should only happen on start up)
@@ -319,6 +533,16 @@ class DBAction:
         In both use cases:
             1. an object class is recorded
             2. a dynamic object object is recorded
+                a new one is only published to dynamic_objects once the action is committed
+                (see __record_dynamic_object__)
+
+        The row of dynamic_api, the new table and its row count are changed in the transaction of the current
+            action (session) - "create" is one action (see create_new_action)
+
+        The metadata already holds object_table (reflected on start up or added when created), so it is not reflected
+            again - the cost does not grow with the number of existing dynamic objects
+
+        For an existing table, makes sure it has the index of the page key (see __verify_page_index__)
 
     RETURNS
         None
@@ -327,7 +551,7 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __create_dynamic_object__(self, object_name, properties=None, object_table=None, api_url=None):
+    def __create_dynamic_object__(self, object_name, properties=None, object_table=None, api_url=None, indexes=None):
         object_class = self.__create_dynamic_class__(object_name)
         table_name = object_name.lower()
 
@@ -344,13 +568,148 @@ class DBAction:
                 else:
                     api_url = table_name
 
-                object_table = self.__create_dynamic_table__(api_url, properties)
+                object_table = self.__create_dynamic_table__(api_url, properties, indexes)
                 is_new_table = True
+        else:
+            self.__verify_page_index__(object_name, object_table)
 
         self.__record_dynamic_object__(object_name, object_class, object_table, is_new_table)
 
+    """
+    NAME
+        __verify_page_index__ - makes sure an existing table has the index of the (_timestamp_created, _id) page key
+    SYNOPSIS
+        __verify_page_index__(self, object_name, object_table)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object (reflected - includes its indexes)
+    DESCRIPTION
+        Tables created before pages had an index of their own get it here (see get_page_index_name)
+            the reflected indexes are checked - no query unless the index is missing
+
+        A missing index is not built here - a "create_index" task of the page key is enqueued instead
+            (see __create_index__), so loading the object never waits for the index to be built
+        If the DBTaskList is full, print the error - pages still work, only slower (it is checked again on the next
+            start up)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __verify_page_index__(self, object_name, object_table):
+        index_name = get_page_index_name(object_table.name)
+        if "_timestamp_created" not in object_table.c or \
+                any(index.name == index_name for index in object_table.indexes):
+            return
+
+        try:
+            self.utils.tasks.push(DBTask("create_index", object_name, columns=PAGE_KEYS["_timestamp_created"]))
+        except DBTaskListFull as e:
+            self.utils.printer.push("Could not create index '{0}': {1}".format(index_name, e))
+
+    """
+    NAME
+        __create_index__ - indexes columns of the table of a dynamic object
+    SYNOPSIS
+        __create_index__(self, object_name, object_table, index_columns)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
+            index_columns   -> column name, or list of column names of a composite index (in order)
+    DESCRIPTION
+        Filters (where_data) and sorts (sort_by) on the columns use the index instead of scanning the table
+
+        The index is named after the table and the columns (see get_index_name)
+            if the table already has it (or it is being built), nothing is built
+        Built without blocking writes to the table (see __build_index__) - may take long on a large table
+            "create_index" tasks run on a lane that is not exclusive (see INDEX_LANE), so the object's other tasks
+            are popped meanwhile
+        The snapshot of the table is forgotten - it is reflected again on the next start up (see DBSchemaCache)
+
+        If index_columns is not a valid index definition or names a column the table does not have, raise ValueError
+    RETURNS
+        name of the index
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __create_index__(self, object_name, object_table, index_columns):
+        column_names = verify_index_columns(object_name, index_columns, object_table.c)
+
+        index_name = get_index_name(object_table.name, column_names)
+        self.utils.printer.push("{0} - Creating index '{1}' of '{2}'".format(current_thread().name, index_name,
+                                                                           object_name))
+        if self.__build_index__(object_table, index_name, column_names):
+            self.utils.schema.forget(object_table.name)
+        return index_name
+
+    """
+    NAME
+        __build_index__ - builds an index of an existing table
+    SYNOPSIS
+        __build_index__(self, object_table, index_name, column_names)
+            self            -> the instance of the class
+            object_table    -> SQLAlchemy Table of the dynamic object
+            index_name      -> string name of the index
+            column_names    -> list of names of the indexed columns (in order)
+    DESCRIPTION
+        The index is added to object_table (thread-safe) and created on a connection of its own
+            if object_table already has an index named index_name (built, or being built by another thread), nothing
+            is built
+
+        On PostgreSQL, the index is created CONCURRENTLY (outside of a transaction) so writes to the table go on
+            the statement may run up to the timeout of "create_index" (see ACTION_TIMEOUTS)
+            backend_pid is the connection's while it runs - DBPool can cancel it (see cancel_backend)
+            a failed CONCURRENTLY build leaves an invalid index behind - it is dropped
+
+        If creating the index fails, the index is removed from object_table and the error is raised
+    RETURNS
+        True if the index was built
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __build_index__(self, object_table, index_name, column_names):
+        is_postgresql = self.utils.engine.dialect.name == "postgresql"
+
         with self.member_vars_lock:
-            self.utils.metadata.reflect(bind=self.utils.engine, schema=DB_SCHEMA)
+            if any(index.name == index_name for index in object_table.indexes):
+                return False
+            new_index = Index(index_name, *[object_table.c[column_name] for column_name in column_names],
+                              postgresql_concurrently=True)
+
+        connection = self.utils.engine.connect()
+        try:
+            if is_postgresql:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                self.backend_pid = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+                timeout_ms = int(get_action_timeout("create_index") * 1000)
+                connection.execute(text("SET statement_timeout = {0}".format(timeout_ms)))
+
+            try:
+                new_index.create(bind=connection)
+            except Exception:
+                with self.member_vars_lock:
+                    object_table.indexes.discard(new_index)
+                if is_postgresql:
+                    try:
+                        connection.execute(text("DROP INDEX CONCURRENTLY IF EXISTS {0}.{1}".format(
+                            DB_SCHEMA, self.utils.engine.dialect.identifier_preparer.quote(index_name))))
+                    except Exception as e:
+                        self.utils.printer.push("Could not drop invalid index '{0}': {1}".format(index_name, e))
+                raise
+            finally:
+                if is_postgresql:
+                    connection.execute(text("RESET statement_timeout"))
+        finally:
+            self.backend_pid = None
+            connection.close()
+        return True
 
     """
     NAME
@@ -376,7 +735,7 @@ class DBAction:
     NAME
         __create_dynamic_table__ - create a DB table for the dynamic object
     SYNOPSIS
-        __create_dynamic_table__(self, table_name, table_columns)
+        __create_dynamic_table__(self, table_name, table_columns, table_indexes=None)
             self            -> the instance of the class
             table_name      -> string name of the DB table
             table_columns   -> list of table columns. Each column should have the following format
@@ -387,8 +746,21 @@ class DBAction:
                     "unique": bool if column must have a unique value (default is False),
                     "default": default value of column
                 }
+            table_indexes   -> list of index definitions (default is None - no other indexes)
+                each is a column name, or a list of column names of a composite index (see __create_index__)
     DESCRIPTION
         Creates a new DB table with the columns specified - thread-safe
+
+        1. add the table to the metadata (under member_vars_lock - the only shared step)
+            with an index of (_timestamp_created, _id) for pages sorted by creation (see __page_record__)
+                it also serves sorts by _timestamp_created and filters on it
+            with an index of every definition in table_indexes (see get_index_name)
+                the table is empty - the indexes are created with it
+                if a definition is not valid or names a column the table does not have, raise ValueError
+        2. create only this table (and its index) in the database - other tables are not inspected
+            in the transaction of the current action (session)
+            if creating it fails (or the action is rolled back), the table is removed from the metadata again
+            anything known of an earlier table of the same name is forgotten (see DBSchemaCache)
     RETURNS
         SQLAlchemy Table instance of dynamic object
     AUTHOR
@@ -396,17 +768,31 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __create_dynamic_table__(self, table_name, table_columns):
-        new_table = Table(table_name, self.utils.metadata, Column("_id", Integer, primary_key=True),
-                          Column("_timestamp_created", DateTime, nullable=False),
-                          Column("_timestamp_modified", DateTime, nullable=False),
-                          *(Column(col.get("name"), get_sql_column(col.get("type")),
-                                nullable=col.get("nullable", True), unique=col.get("unique", False),
-                                default=col.get("default")) for col in table_columns), schema=DB_SCHEMA)
-
+    def __create_dynamic_table__(self, table_name, table_columns, table_indexes=None):
         with self.member_vars_lock:
-            self.utils.metadata.create_all()
-
+            new_table = Table(table_name, self.utils.metadata, Column("_id", Integer, primary_key=True),
+                              Column("_timestamp_created", DateTime, nullable=False),
+                              Column("_timestamp_modified", DateTime, nullable=False),
+                              *(Column(col.get("name"), get_sql_column(col.get("type")),
+                                    nullable=col.get("nullable", True), unique=col.get("unique", False),
+                                    default=col.get("default")) for col in table_columns), schema=DB_SCHEMA)
+            Index(get_page_index_name(table_name), new_table.c._timestamp_created, new_table.c._id)
+
+            try:
+                for index_columns in table_indexes or []:
+                    column_names = verify_index_columns(table_name, index_columns, new_table.c)
+                    index_name = get_index_name(table_name, column_names)
+                    if any(index.name == index_name for index in new_table.indexes):
+                        continue
+                    Index(index_name, *[new_table.c[column_name] for column_name in column_names])
+            except ValueError:
+                self.utils.metadata.remove(new_table)
+                raise
+
+        self.pending_tables.append(new_table)
+        new_table.create(bind=self.session.connection(), checkfirst=True)
+
+        self.utils.schema.forget(table_name)
         return new_table
 
     """
@@ -423,12 +809,19 @@ class DBAction:
                 False if using an existing table
     DESCRIPTION
         Add dynamic object as key to the dictionary of dynamic_objects with a dictionary value containing:
-            class, table, api_url/table name, lock, row count
+            class, table, table name, api_url, lock, row count
 
         Map the class to the table so they correlate - new class instances create new rows
+        Statements cached for an earlier table of the same name are dropped (see DBStatementCache)
 
+        If is_new_table == True:
+            the row count of the table is 0 - recorded in the table of row counts (in the current action)
+            the dynamic object is published to dynamic_objects once the action is committed
         If is_new_table == False:
-            create and enqueue a DBTask to update the count of the table
+            the row count is read from the table of row counts - the table itself is not scanned
+            if it has no row count yet (ex: created before row counts were kept), create and enqueue a DBTask to
+                update the count of the table (counted once in the background)
+                if the DBTaskList is full, the count stays -1 (DBManager checks it again on start up)
     RETURNS
         None
     AUTHOR
@@ -437,21 +830,135 @@ class DBAction:
         4/25/2016
     """
     def __record_dynamic_object__(self, object_name, object_class, object_table, is_new_table):
-        self.utils.dynamic_objects[object_name] = {
+        dynamic_object = {
             "class": object_class,
             "table": object_table,
+            "table_name": object_table.name,
             "api": object_name.lower().replace(" ", "_").replace("-", "_"),
             "lock": RLock(),
             "count": -1
         }
 
         mapper(object_class, object_table)
+        self.utils.statements.invalidate(object_name)
         sleep(0.1)
 
         if is_new_table:
-            self.utils.dynamic_objects[object_name]["count"] = 0
+            self.__set_row_count__(self.session.connection(), object_name, 0)
+            dynamic_object["count"] = 0
+            self.pending_objects[object_name] = dynamic_object
         else:
-            self.utils.tasks.push(DBTask("update_count", object_name))
+            self.utils.dynamic_objects[object_name] = dynamic_object
+
+            row_counts = self.utils.row_counts
+            row_count = self.utils.engine.execute(select([row_counts.c.row_count])
+                                                  .where(row_counts.c.object_name == object_name)).scalar()
+            if row_count is not None:
+                self.utils.dynamic_objects[object_name]["count"] = int(row_count)
+                return
+
+            try:
+                self.utils.tasks.push(DBTask("update_count", object_name))
+            except DBTaskListFull as e:
+                self.utils.printer.push("Could not update count of '{0}': {1}".format(object_name, e))
+
+    """
+    NAME
+        __record_dynamic_stub__ - record a dynamic object without loading its table
+    SYNOPSIS
+        __record_dynamic_stub__(self, object_name, table_name, row_count)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            table_name      -> string name of the existing DB table of the dynamic object (its api_url)
+            row_count       -> row count from the table of row counts (None if it has none)
+    DESCRIPTION
+        Add dynamic object as key to the dictionary of dynamic_objects like __record_dynamic_object__
+            with no class or table (None) - no query is made and no class is mapped
+
+        The dynamic object is loaded on its first use (see __load_dynamic_object__)
+
+        If row_count is None, create and enqueue a DBTask to update the count of the table
+            if the DBTaskList is full, the count stays -1 (DBManager checks it again on start up)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __record_dynamic_stub__(self, object_name, table_name, row_count):
+        self.utils.dynamic_objects[object_name] = {
+            "class": None,
+            "table": None,
+            "table_name": table_name,
+            "api": object_name.lower().replace(" ", "_").replace("-", "_"),
+            "lock": RLock(),
+            "count": int(row_count) if row_count is not None else -1
+        }
+
+        if row_count is None:
+            try:
+                self.utils.tasks.push(DBTask("update_count", object_name))
+            except DBTaskListFull as e:
+                self.utils.printer.push("Could not update count of '{0}': {1}".format(object_name, e))
+
+    """
+    NAME
+        __load_dynamic_object__ - reflect and map the table of a stub of a dynamic object
+    SYNOPSIS
+        __load_dynamic_object__(self, object_name, dynamic_object)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            dynamic_object  -> dictionary of the dynamic object in dynamic_objects (see __record_dynamic_stub__)
+    DESCRIPTION
+        Called on the first use of a stub - only its own table is reflected (thread-safe)
+            if it has a valid snapshot, the snapshot is used instead and nothing is reflected (see DBSchemaCache)
+            else, a snapshot of the reflected table is saved for the next start up
+
+        Holds the lock of the dynamic object while loading - a concurrent first use waits for it and finds the
+            dynamic object loaded, so it is loaded once
+        If the table has no index of the page key, a task is enqueued to build it (see __verify_page_index__)
+        The class is set last - a dynamic object with a class is fully loaded
+
+        If the table does not exist, raise ValueError (the dynamic object stays a stub)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __load_dynamic_object__(self, object_name, dynamic_object):
+        with dynamic_object["lock"]:
+            if dynamic_object["class"] is not None:
+                return
+
+            self.utils.printer.push("{0} - Loading dynamic table '{1}'".format(current_thread().name, object_name))
+
+            table_key = "{0}.{1}".format(DB_SCHEMA, dynamic_object["table_name"])
+            is_reflected = False
+            with self.member_vars_lock:
+                object_table = self.utils.metadata.tables.get(table_key)
+                if object_table is None:
+                    object_table = self.utils.schema.get_table(dynamic_object["table_name"], self.utils.metadata)
+                if object_table is None:
+                    try:
+                        object_table = Table(dynamic_object["table_name"], self.utils.metadata, autoload=True,
+                                             autoload_with=self.utils.engine, schema=DB_SCHEMA)
+                        is_reflected = True
+                    except exc.NoSuchTableError:
+                        raise ValueError("Table of '{0}' does not exist: {1}".format(object_name, table_key))
+
+            self.__verify_page_index__(object_name, object_table)
+            if is_reflected:
+                self.utils.schema.put_table(self.utils.engine, object_table)
+
+            object_class = self.__create_dynamic_class__(object_name)
+            mapper(object_class, object_table)
+            self.utils.statements.invalidate(object_name)
+
+            dynamic_object["table"] = object_table
+            dynamic_object["class"] = object_class
 
     """
     NAME
@@ -463,6 +970,7 @@ class DBAction:
             api_url         -> string url name of object
     DESCRIPTION
         Inserts object name and api_url of new dynamic object to dynamic_api table
+            in the transaction of the current action (session) - committed with the rest of the "create"
 
         Allows to keep track of the dynamic object on future runs of the program
     RETURNS
@@ -478,8 +986,9 @@ class DBAction:
             "api_url": api_url
         }
 
-        new_task = DBTask("insert", DYNAMIC_API_OBJECT_NAME, insert_data=api_data)
-        self.create_new_action(new_task)
+        api_class, api_table, api_lock = self.__get_dynamic_object_properties__(DYNAMIC_API_OBJECT_NAME)
+        with api_lock:
+            self.__insert_record__(object_name=DYNAMIC_API_OBJECT_NAME, object_class=api_class, insert_data=api_data)
 
     """
     NAME
@@ -490,6 +999,7 @@ class DBAction:
             object_name     -> string name of the dynamic object
     DESCRIPTION
         Deletes row containing the object name of the dynamic object
+            in the transaction of the current action (session) - committed with the rest of the "drop"
 
         Stops to keep track of the dynamic object on future runs of the program
     RETURNS
@@ -505,8 +1015,10 @@ class DBAction:
         }
         limit = 1
 
-        new_task = DBTask("delete", DYNAMIC_API_OBJECT_NAME, where_data=where_data, limit=limit)
-        self.create_new_action(new_task)
+        api_class, api_table, api_lock = self.__get_dynamic_object_properties__(DYNAMIC_API_OBJECT_NAME)
+        with api_lock:
+            self.__delete_record__(object_name=DYNAMIC_API_OBJECT_NAME, object_table=api_table, where_data=where_data,
+                                   limit=limit, offset=0)
 
     ####
     # actions on records
@@ -516,31 +1028,38 @@ class DBAction:
     NAME
         __insert_record__ - insert new rows to a table
     SYNOPSIS
-        __insert_record__(self, object_name, object_class, insert_data)
+        __insert_record__(self, object_name, object_class, insert_data, created_at=None)
             self            -> the instance of the class
             object_name     -> string name of the dynamic object
             object_class    -> class representing the dynamic object
             insert_data     -> 2 options
                 1. dictionary of columns as keys and values as values
                 2. list of dictionaries from option 1
+            created_at      -> list of the datetimes each row was created at (same order as insert_data)
+                default is None - all rows are created now
+                ex: the times the merged insert tasks were created at (see DBManager.create_task)
     DESCRIPTION
         Flexible insert that allows to add one or multiple rows to a table
 
         By default - no matter what columns entered - timestamps of creation and modification are
-            ALSO included in the new rows
+            ALSO included in the new rows (overwriting the ones entered)
 
-        For each row inserted
-            increase count of dynamic object
+        Less than BULK_INSERT_MIN_ROWS rows are inserted through the ORM (see __insert_orm_rows__)
+            more rows skip the ORM (see __insert_bulk_rows__)
+
+        All rows are flushed together, then:
+            increase count of dynamic object by the number of rows (see __add_to_row_count__)
             if object is not a default object
-                check to see if row matches any alert rule
+                check all rows (with their new IDs) against the in-memory index of the alert rules at once
+                    (see __get_alert_rules__ and __check_if_to_create_alerts__) - no query or task per row
     RETURNS
-        None
+        list of the IDs of the new rows (same order as insert_data)
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    def __insert_record__(self, object_name, object_class, insert_data):
+    def __insert_record__(self, object_name, object_class, insert_data, created_at=None):
         # insert_data
         #   if just one row
         #       { property_to_add: value_to_add }
@@ -550,102 +1069,283 @@ class DBAction:
             self.utils.printer.push(["Inserting to '{0}' 1 new record now.".format(object_name),
                                      "\t{0}".format(insert_data)
                                      ])
+            insert_data = [insert_data]
+        else:
+            self.utils.printer.push("Inserting to '{0}' {1} new records now.".format(object_name, len(insert_data)))
+
+        # add timestamp to new records
+        if created_at is None:
+            created_at = [datetime.now()] * len(insert_data)
+        for new_record, timestamp in zip(insert_data, created_at):
+            new_record['_timestamp_created'] = timestamp
+            new_record['_timestamp_modified'] = timestamp
+
+        if len(insert_data) >= BULK_INSERT_MIN_ROWS:
+            object_table = self.utils.dynamic_objects[object_name]["table"]
+            new_ids = self.__insert_bulk_rows__(object_name, object_table, insert_data)
+        else:
+            new_ids = self.__insert_orm_rows__(object_class, insert_data)
+
+        self.__add_to_row_count__(object_name, len(insert_data))
+
+        if object_name == ALERT_RULES_OBJECT_NAME:
+            self.alert_rules_changed = True
+        elif object_name[0] != "_":
+            self.__check_if_to_create_alerts__(object_name, insert_data, new_ids, self.__get_alert_rules__())
 
-            # add timestamp to new rows
-            insert_data['_timestamp_created'] = datetime.now()
-            insert_data['_timestamp_modified'] = datetime.now()
+        return new_ids
 
-            new_object_instance = object_class(**insert_data)
+    """
+    NAME
+        __insert_orm_rows__ - insert rows as ORM instances
+    SYNOPSIS
+        __insert_orm_rows__(self, object_class, rows)
+            self            -> the instance of the class
+            object_class    -> class representing the dynamic object
+            rows            -> list of dictionaries of columns as keys and values as values (timestamps included)
+    DESCRIPTION
+        Creates an instance of object_class per row, adds it to the session and flushes them together
+    RETURNS
+        list of the IDs of the new rows (same order as rows)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __insert_orm_rows__(self, object_class, rows):
+        new_instances = []
+        for new_record in rows:
+            new_object_instance = object_class(**new_record)
             self.session.add(new_object_instance)
+            new_instances.append(new_object_instance)
 
-            if object_name[0] != "_":
-                self.__check_if_to_create_alert(object_name, insert_data)
+        self.session.flush()
+        return [new_object_instance._id for new_object_instance in new_instances]
 
-            self.utils.dynamic_objects[object_name]["count"] += 1
+    """
+    NAME
+        __insert_bulk_rows__ - insert rows without building ORM instances
+    SYNOPSIS
+        __insert_bulk_rows__(self, object_name, object_table, rows)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
+            rows            -> list of dictionaries of columns as keys and values as values (timestamps included)
+    DESCRIPTION
+        Uses SQLAlchemy Core in the session's transaction - no ORM instances, no unit of work
+
+        1. keep only the columns of object_table (the ORM ignores the rest too) and give every row the same columns
+            a column missing from a row gets the column's default (or NULL)
+        2. on PostgreSQL - the IDs of all rows are reserved from the sequence of _id in one query
+                then all rows (IDs included) are inserted with one executemany
+                    sent as multi-row INSERTs of up to BULK_INSERT_CHUNK_ROWS rows (see get_engine_options)
+            on other databases - one INSERT per row (there is no RETURNING to get the IDs of an executemany)
+            the statements are cached by their columns only - one statement per column set, whatever the number of rows
+                (see __get_statement__)
+    RETURNS
+        list of the IDs of the new rows (same order as rows)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __insert_bulk_rows__(self, object_name, object_table, rows):
+        column_names = set()
+        for new_record in rows:
+            column_names.update(name for name in new_record if name in object_table.c and name != "_id")
+
+        defaults = {}
+        for name in column_names:
+            default = object_table.c[name].default
+            defaults[name] = default.arg if default is not None and default.is_scalar else None
+        bulk_rows = [dict((name, new_record.get(name, defaults[name])) for name in column_names)
+                     for new_record in rows]
+
+        column_names = sorted(column_names)
+
+        insert_query = self.__get_statement__(object_name, ("insert", tuple(column_names)),
+                                              lambda: object_table.insert())
+        if self.utils.engine.dialect.name == "postgresql":
+            reserve_query = self.__get_statement__(
+                object_name, ("reserve_ids",),
+                lambda: select([func.nextval(func.pg_get_serial_sequence(
+                    self.utils.engine.dialect.identifier_preparer.format_table(object_table), "_id"))])
+                .select_from(func.generate_series(1, bindparam("_rows", type_=Integer))))
+            new_ids = [row[0] for row in self.__execute__(reserve_query, {"_rows": len(bulk_rows)})]
+            for bulk_row, new_id in zip(bulk_rows, new_ids):
+                bulk_row["_id"] = new_id
+            self.__execute__(insert_query, bulk_rows)
         else:
-            insert_count = len(insert_data)
-            self.utils.printer.push(["Inserting to '{0}' {1} new records now.".format(object_name, insert_count),
-                                     "\t{0}".format(insert_data)
-                                     ])
-            for new_record in insert_data:
+            new_ids = []
+            for bulk_row in bulk_rows:
+                new_ids.append(self.__execute__(insert_query, bulk_row).inserted_primary_key[0])
+
+        return new_ids
 
-                # add timestamp to new records
-                new_record['_timestamp_created'] = datetime.now()
-                new_record['_timestamp_modified'] = datetime.now()
+    """
+    NAME
+        __insert_merged_records__ - insert the rows of a merged insert task
+    SYNOPSIS
+        __insert_merged_records__(self, db_task, object_class)
+            self            -> the instance of the class
+            db_task         -> merged DBTask instance (see merge_insert_tasks)
+            object_class    -> class representing the dynamic object
+    DESCRIPTION
+        Inserts the rows of all merged tasks in one session
+            every row is created at the time its own task was created at (see get_insert_times)
 
-                new_object_instance = object_class(**new_record)
-                self.session.add(new_object_instance)
+        If that fails (ex: one bad row), the session is rolled back and every merged task is inserted on its own
+            so one bad event does not drop the events merged with it
+            each in an action of its own - begun again (statement timeout, backend_pid) and committed or rolled back
+            a merged task that still fails gets the exception in its future (see DBTask.future)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __insert_merged_records__(self, db_task, object_class):
+        try:
+            self.__insert_record__(object_name=db_task.object_name,
+                                   object_class=object_class,
+                                   insert_data=db_task.additional_args.get("insert_data", []),
+                                   created_at=get_insert_times(db_task.merged))
+        except Exception as e:
+            self.__rollback_dynamic_action__()
+            self.utils.printer.push("Merged insert of {0} tasks to '{1}' failed, inserting one by one: {2}"
+                                    .format(len(db_task.merged), db_task.object_name, e))
+
+            for merged_task in db_task.merged:
+                self.__begin_dynamic_action__(db_task.action)
+                try:
+                    self.__insert_record__(object_name=db_task.object_name,
+                                           object_class=object_class,
+                                           insert_data=merged_task.additional_args.get("insert_data", {}),
+                                           created_at=get_insert_times([merged_task]))
+                    self.__end_dynamic_action__()
+                except Exception as e:
+                    self.__rollback_dynamic_action__()
+                    self.utils.printer.push("Insert to '{0}' failed: {1}".format(db_task.object_name, e))
+                    if merged_task.future is not None:
+                        merged_task.future.set_exception(e)
 
-                if object_name[0] != "_":
-                    self.__check_if_to_create_alert(object_name, new_record)
+    """
+    NAME
+        __insert_alert_finds__ - insert the rows of an insert task of alert findings
+    SYNOPSIS
+        __insert_alert_finds__(self, db_task, object_class)
+            self            -> the instance of the class
+            db_task         -> insert DBTask instance of ALERT_FINDS_OBJECT_NAME
+                may be merged (see merge_insert_tasks)
+            object_class    -> class representing the alert findings
+    DESCRIPTION
+        Inserts all findings in one session
 
-            self.utils.dynamic_objects[object_name]["count"] += insert_count
+        found_id is unique - a row that was already found (ex: rows of different dynamic objects with the same _id)
+            fails the whole insert with an IntegrityError
+            if so, the session is rolled back and every finding is inserted on its own, so only the findings that
+            were already found are dropped
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __insert_alert_finds__(self, db_task, object_class):
+        insert_data = db_task.additional_args.get("insert_data", [])
+        if type(insert_data) is dict:
+            insert_data = [insert_data]
+
+        try:
+            self.__insert_record__(object_name=db_task.object_name, object_class=object_class,
+                                   insert_data=insert_data)
+        except exc.IntegrityError as e:
+            self.__rollback_dynamic_action__()
+            self.utils.printer.push("Insert of {0} alert finding(s) failed, inserting one by one: {1}"
+                                    .format(len(insert_data), e))
+
+            for new_alert_data in insert_data:
+                self.__begin_dynamic_action__(db_task.action)
+                try:
+                    self.__insert_record__(object_name=db_task.object_name, object_class=object_class,
+                                           insert_data=new_alert_data)
+                    self.__end_dynamic_action__()
+                except exc.IntegrityError as e:
+                    self.__rollback_dynamic_action__()
+                    self.utils.printer.push("Dropped alert finding of row '{0}' (already found): {1}"
+                                            .format(new_alert_data.get("found_id"), e))
 
     """
     NAME
         __delete_record__ - delete rows from a table
     SYNOPSIS
-        __delete_record__(self, object_name, object_class, where_data, limit, offset)
+        __delete_record__(self, object_name, object_table, where_data, limit, offset)
             self            -> the instance of the class
             object_name     -> string name of the dynamic object
-            object_class    -> class representing the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
             where_data      -> a dictionary indicating how to filter rows to delete
             limit           -> max number of rows to delete (0 means all rows)
             offset          -> at which row number to start this query (0 is typical)
     DESCRIPTION
-        Deletes filtered rows from a table
+        Deletes filtered rows from a table with a single DELETE ... WHERE statement
+            rows are never loaded into memory (see __get_row_filter__ for limit and offset)
+            the statement is cached by the filtered columns (see __get_statement__)
 
-        Reduces count of dynamic object by the number of rows deleted
+        Reduces count of dynamic object by the number of rows deleted (see __add_to_row_count__)
     RETURNS
-        None
+        number of rows deleted
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    def __delete_record__(self, object_name, object_class, where_data, limit, offset):
+    def __delete_record__(self, object_name, object_table, where_data, limit, offset):
         # where_data
         #   { property_to_filter_by: value_to_filter_by }
-        self.utils.printer.push(["{0} - Deleting from '{0}' {1} record(s) from offset {3}."
+        self.utils.printer.push(["{0} - Deleting from '{1}' {2} record(s) from offset {3}."
                                     .format(current_thread().name, object_name, __limit_string__(limit), offset),
                                  "\tDelete data: {0}".format(where_data)
                                 ])
 
-        if limit == 0:
-            # all results from offset
-            res = self.session.query(object_class).filter_by(**where_data).offset(offset).all()
-        else:
-            # limit results from offset
-            res = self.session.query(object_class).filter_by(**where_data).offset(offset).limit(limit).all()
-
-        self.utils.dynamic_objects[object_name]["count"] -= len(res)
+        delete_query = self.__get_statement__(
+            object_name, ("delete", get_where_shape(where_data), limit > 0, offset > 0),
+            lambda: object_table.delete().where(self.__get_row_filter__(object_table, where_data, limit, offset)))
+        deleted = self.__execute__(delete_query, get_row_params(where_data, limit, offset)).rowcount
 
-        for row in res:
-            self.session.delete(row)
+        self.__add_to_row_count__(object_name, -deleted)
+        if object_name == ALERT_RULES_OBJECT_NAME:
+            self.alert_rules_changed = True
+        return deleted
 
     """
     NAME
         __update_record__ - update rows from a table
     SYNOPSIS
-        __update_record__(self, object_name, object_class, where_data, update_data, limit, offset)
+        __update_record__(self, object_name, object_table, where_data, update_data, limit, offset)
             self            -> the instance of the class
             object_name     -> string name of the dynamic object
-            object_class    -> class representing the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
             where_data      -> a dictionary indicating how to filter rows to delete
             update_data     -> a dictionary indicating which columns should be updated with which values
             limit           -> max number of rows to delete (0 means all rows)
             offset          -> at which row number to start this query (0 is typical)
     DESCRIPTION
-        Updates filtered rows in a table
-        Also updates the _timestamp_modified column to the current timestamp
+        Updates filtered rows in a table with a single UPDATE ... SET ... WHERE statement
+            rows are never loaded into memory (see __get_row_filter__ for limit and offset)
+            the statement is cached by the filtered and updated columns (see __get_statement__)
+        Also updates the _timestamp_modified column to the current timestamp of the database
+
+        Timestamp columns and columns the table does not have are not updated
     RETURNS
-        None
+        number of rows updated
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    def __update_record__(self, object_name, object_class, where_data, update_data, limit, offset):
+    def __update_record__(self, object_name, object_table, where_data, update_data, limit, offset):
         # where_data
         #   { property_to_filter_by: value_to_filter_by }
         # select_data
@@ -656,28 +1356,83 @@ class DBAction:
                                  "\tUpdate data: {0}".format(update_data)
                                 ])
 
-        if limit < 1:
-            # all results from offset
-            res = self.session.query(object_class).filter_by(**where_data).offset(offset).all()
-        else:
-            # limit results from offset
-            res = self.session.query(object_class).filter_by(**where_data).offset(offset).limit(limit).all()
+        update_values = dict((attr, value) for attr, value in update_data.iteritems()
+                             if "timestamp" not in attr and attr in object_table.c)
+
+        if object_name == ALERT_RULES_OBJECT_NAME:
+            self.alert_rules_changed = True
+
+        def build_update_query():
+            set_values = dict((attr, bindparam("_set_" + attr, type_=object_table.c[attr].type))
+                              for attr in update_values)
+            set_values["_timestamp_modified"] = func.now()
+            update_query = object_table.update().where(self.__get_row_filter__(object_table, where_data, limit,
+                                                                               offset))
+            return update_query.values(set_values)
+
+        update_query = self.__get_statement__(
+            object_name, ("update", get_where_shape(where_data), limit > 0, offset > 0, tuple(sorted(update_values))),
+            build_update_query)
+
+        params = get_row_params(where_data, limit, offset)
+        for attr, value in update_values.iteritems():
+            params["_set_" + attr] = value
+        return self.__execute__(update_query, params).rowcount
+
+    """
+    NAME
+        __get_row_filter__ - builds the WHERE clause of a delete or an update
+    SYNOPSIS
+        __get_row_filter__(self, object_table, where_data, limit, offset)
+            self            -> the instance of the class
+            object_table    -> SQLAlchemy Table of the dynamic object
+            where_data      -> a dictionary of columns as keys and values to filter by as values
+            limit           -> max number of rows to match (0 or less means all rows)
+            offset          -> number of matching rows to skip
+    DESCRIPTION
+        Every column of where_data must equal its value - if object_table has no such column, raise ValueError
+            a None value matches NULL (IS NULL)
+
+        With a limit or an offset, matches the _id of the filtered rows in a subquery (ordered by _id):
+            _id IN (SELECT _id FROM object_table WHERE ... ORDER BY _id LIMIT limit OFFSET offset)
+
+        Values, limit and offset are bind parameters (see get_row_params) - the clause only depends on the shape
+            of where_data (see get_where_shape) and on whether there is a limit and an offset
+    RETURNS
+        SQLAlchemy clause to use in a WHERE
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_row_filter__(self, object_table, where_data, limit, offset):
+        conditions = []
+        for column_name, value in sorted(where_data.iteritems()):
+            column = get_table_column(object_table, column_name)
+            if value is None:
+                conditions.append(column.is_(None))
+            else:
+                conditions.append(column == bindparam("_where_" + column_name))
+        row_filter = and_(true(), *conditions)
 
-        for row in res:
-            for attr, value in update_data.iteritems():
-                if "timestamp" in attr:
-                    continue
-                setattr(row, attr, value)
-            setattr(row, "_timestamp_modified", datetime.now())
+        if limit < 1 and offset < 1:
+            return row_filter
+
+        id_query = select([object_table.c._id]).where(row_filter).order_by(object_table.c._id)
+        if offset > 0:
+            id_query = id_query.offset(bindparam("_row_offset"))
+        if limit > 0:
+            id_query = id_query.limit(bindparam("_row_limit"))
+        return object_table.c._id.in_(id_query)
 
     """
     NAME
         __select_record__ - select rows from a table
     SYNOPSIS
-        __select_record__(self, object_name, object_class, where_data, select_data, limit, offset, sort_by, sort_order)
+        __select_record__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by, sort_order)
             self            -> the instance of the class
             object_name     -> string name of the dynamic object
-            object_class    -> class representing the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
             where_data      -> a dictionary indicating how to filter rows to delete
             select_data     -> a list of column names to select
             limit           -> max number of rows to delete (0 means all rows)
@@ -688,6 +1443,11 @@ class DBAction:
                 False = Descending
     DESCRIPTION
         Selects filtered rows from a table
+
+        Only the columns of select_data are fetched (SELECT col1, col2 ... - not the whole row)
+            rows are not loaded into ORM instances - each row becomes a dictionary right away
+
+        If select_data or sort_by has a column object_table does not have, raise ValueError
     RETURNS
         list of dictionaries of columns and values. Each item in the list is 1 row.
     AUTHOR
@@ -695,7 +1455,7 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __select_record__(self, object_name, object_class, where_data, select_data, limit, offset, sort_by, sort_order):
+    def __select_record__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by, sort_order):
         # where_data
         #   { property_to_filter_by: value_to_filter_by }
         # kwargs.get("select_data")
@@ -713,66 +1473,409 @@ class DBAction:
                                  "\tWhere data: {0}".format(where_data),
                                  "\tSelect data: {0}".format(select_data)
                                  ])
-        query = self.session.query(object_class).filter_by(**where_data)
-
-        if sort_order:
-            query = query.order_by(getattr(object_class, sort_by))
-        else:
-            query = query.order_by(desc(getattr(object_class, sort_by)))
-
-        if limit < 1:
-            # all results from offset
-            res = query.offset(offset).all()
-        else:
-            # limit results from offset
-            res = query.offset(offset).limit(limit).all()
-
-        selected_data_from_rows = []
-        for row in res:
-            row_selected_data = {}
-            for selected_column in select_data:
-                row_selected_data[selected_column] = getattr(row, selected_column)
-
-            selected_data_from_rows.append(row_selected_data)
-
-        return selected_data_from_rows
+        query = self.__get_select_query__(object_name, object_table, where_data, select_data, limit, offset, sort_by,
+                                          sort_order)
+        return [dict(zip(select_data, row)) for row in self.__execute__(query, get_row_params(where_data, limit,
+                                                                                               offset))]
 
     """
     NAME
-        __update_count__ - updates the row count of a dynamic object
+        __stream_record__ - select rows from a table chunk by chunk
     SYNOPSIS
-        __update_count__(self, object_name, object_class)
+        __stream_record__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by, sort_order,
+                          stream)
             self            -> the instance of the class
             object_name     -> string name of the dynamic object
-            object_class    -> class representing the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
+            where_data      -> a dictionary indicating how to filter rows
+            select_data     -> a list of column names to select
+            limit           -> max number of rows to select (0 means all rows)
+            offset          -> at which row number to start this query (0 is typical)
+            sort_by         -> column/property of dynamic object to sort by
+            sort_order      -> boolean of how to sort (True = Ascending, False = Descending)
+            stream          -> DBStream instance to hand the rows to
     DESCRIPTION
-        Updates row count of a dynamic object
+        Same query as __select_record__, executed with a server-side cursor (stream_results)
+            STREAM_CHUNK_ROWS rows are fetched at a time and handed to stream (see DBStream.put_chunk)
+            the rows are never all in memory at once - neither in the database driver nor in the worker
+
+        If stream is None, raise ValueError
     RETURNS
-        None
+        number of rows streamed
     AUTHOR
         Yoav Nathaniel
     DATE
-        4/25/2016
+        10/18/2026
     """
-    def __update_count__(self, object_name, object_class):
-        self.utils.printer.push("{0} - Retrieving 'count' from '{1}'".format(current_thread().name, object_name))
-
-        res = int(self.session.query(func.count(object_class._id)).scalar())
-
-        self.utils.dynamic_objects[object_name]["count"] = res
+    def __stream_record__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by, sort_order,
+                          stream):
+        if stream is None:
+            raise ValueError("Attempt to stream '{0}' without a stream.".format(object_name))
 
-    ###
-    # action helpers
-    ###
+        self.utils.printer.push(["{0} - Streaming from '{1}' {2} record(s) from offset {3}."
+                                    .format(current_thread().name, object_name, __limit_string__(limit), offset),
+                                 "\tWhere data: {0}".format(where_data),
+                                 "\tSelect data: {0}".format(select_data)
+                                 ])
+        query = self.__get_select_query__(object_name, object_table, where_data, select_data, limit, offset, sort_by,
+                                          sort_order)
+        result = self.__execute__(query, get_row_params(where_data, limit, offset), stream_results=True)
+
+        streamed = 0
+        try:
+            while True:
+                rows = result.fetchmany(STREAM_CHUNK_ROWS)
+                if not rows:
+                    break
+                stream.put_chunk([dict(zip(select_data, row)) for row in rows])
+                streamed += len(rows)
+        finally:
+            result.close()
+
+        return streamed
 
     """
     NAME
-        __begin_dynamic_action__ - starts a new database action session
+        __page_record__ - select a page of rows from a table by seeking past the previous page
     SYNOPSIS
-        __begin_dynamic_action__(self)
+        __page_record__(self, object_name, object_table, where_data, select_data, limit, sort_by, sort_order, cursor)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
+            where_data      -> a dictionary indicating how to filter rows
+            select_data     -> a list of column names to select
+            limit           -> number of rows of the page (0 means DEFAULT_PAGE_ROWS)
+            sort_by         -> column to page by - one of PAGE_KEYS
+            sort_order      -> boolean of how to sort (True = Ascending, False = Descending)
+            cursor          -> next_cursor of the previous page (None or "" for the first page)
+    DESCRIPTION
+        Keyset pagination - instead of skipping rows with OFFSET, the query seeks past the key of the last row
+            of the previous page (WHERE (key columns) > (key of cursor) ORDER BY key columns LIMIT limit + 1)
+            served by the index of the key, so every page costs the same as the first page
+
+        Selects 1 row more than limit - if it exists, there is a next page and next_cursor is the key of the last row
+        The statement is cached by the shape of the page (see __get_statement__) - the cursor and limit are bound
+
+        If sort_by is not one of PAGE_KEYS or cursor is not a cursor of sort_by, raise ValueError
+    RETURNS
+        {
+            "page_data": list of dictionaries of columns and values - each item in the list is 1 row,
+            "next_cursor": opaque string to get the next page with (None if this is the last page)
+        }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __page_record__(self, object_name, object_table, where_data, select_data, limit, sort_by, sort_order, cursor):
+        if sort_by not in PAGE_KEYS:
+            raise ValueError("Cannot page by column: {0}".format(sort_by))
+        if limit < 1:
+            limit = DEFAULT_PAGE_ROWS
+
+        self.utils.printer.push(["{0} - Retrieving from '{1}' a page of {2} record(s) by '{3}'."
+                                    .format(current_thread().name, object_name, limit, sort_by),
+                                 "\tWhere data: {0}".format(where_data),
+                                 "\tSelect data: {0}".format(select_data)
+                                 ])
+        params = get_row_params(where_data, 0, 0)
+        params["_row_limit"] = limit + 1
+        if cursor:
+            for i, value in enumerate(decode_page_cursor(cursor, sort_by)):
+                params["_cursor{0}".format(i)] = value
+
+        def build_page_query():
+            selected_columns = [get_table_column(object_table, column_name) for column_name in select_data]
+            key_columns = [get_table_column(object_table, column_name) for column_name in PAGE_KEYS[sort_by]]
+
+            # key columns are selected under labels of their own so they do not merge with the same selected column
+            query = select(selected_columns + [column.label("_page_key{0}".format(i))
+                                               for i, column in enumerate(key_columns)])
+            query = query.where(self.__get_row_filter__(object_table, where_data, 0, 0))
+
+            if cursor:
+                cursor_key = tuple_(*[bindparam("_cursor{0}".format(i), type_=column.type)
+                                      for i, column in enumerate(key_columns)])
+                if sort_order:
+                    query = query.where(tuple_(*key_columns) > cursor_key)
+                else:
+                    query = query.where(tuple_(*key_columns) < cursor_key)
+
+            if sort_order:
+                query = query.order_by(*key_columns)
+            else:
+                query = query.order_by(*[desc(column) for column in key_columns])
+            return query.limit(bindparam("_row_limit"))
+
+        query = self.__get_statement__(object_name, ("page", tuple(select_data), get_where_shape(where_data),
+                                                     sort_by, bool(sort_order), bool(cursor)),
+                                       build_page_query)
+        rows = self.__execute__(query, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_page_cursor(sort_by, rows[-1][len(select_data):])
+
+        return {
+            "page_data": [dict(zip(select_data, row)) for row in rows],
+            "next_cursor": next_cursor
+        }
+
+    """
+    NAME
+        __get_select_query__ - gets the query of a select
+    SYNOPSIS
+        __get_select_query__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by,
+                             sort_order)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_table    -> SQLAlchemy Table of the dynamic object
+            where_data      -> a dictionary indicating how to filter rows
+            select_data     -> a list of column names to select
+            limit           -> max number of rows to select (0 means all rows)
+            offset          -> at which row number to start this query (0 is typical)
+            sort_by         -> column/property of dynamic object to sort by
+            sort_order      -> boolean of how to sort (True = Ascending, False = Descending)
+    DESCRIPTION
+        Only the columns of select_data are selected
+            with no columns to select, _id is selected only to count rows (every row becomes an empty dictionary)
+
+        The query is cached by its shape (see __get_statement__) - values, limit and offset are bind parameters
+            executed with get_row_params(where_data, limit, offset)
+
+        If select_data or sort_by has a column object_table does not have, raise ValueError
+    RETURNS
+        SQLAlchemy Select instance
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_select_query__(self, object_name, object_table, where_data, select_data, limit, offset, sort_by,
+                             sort_order):
+        def build_select_query():
+            selected_columns = [get_table_column(object_table, column_name) for column_name in select_data]
+            sort_column = get_table_column(object_table, sort_by)
+
+            query = select(selected_columns or [object_table.c._id]).where(self.__get_row_filter__(object_table,
+                                                                                                   where_data, 0, 0))
+            if sort_order:
+                query = query.order_by(sort_column)
+            else:
+                query = query.order_by(desc(sort_column))
+
+            if offset > 0:
+                query = query.offset(bindparam("_row_offset"))
+            if limit > 0:
+                # limit results from offset
+                query = query.limit(bindparam("_row_limit"))
+            return query
+
+        return self.__get_statement__(object_name, ("select", tuple(select_data), get_where_shape(where_data),
+                                                    limit > 0, offset > 0, sort_by, bool(sort_order)),
+                                      build_select_query)
+
+    """
+    NAME
+        __get_statement__ - gets a statement of a dynamic object from the statement cache
+    SYNOPSIS
+        __get_statement__(self, object_name, shape, build_statement)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            shape           -> hashable tuple of everything the statement is built from except bound values
+                (starts with the action type)
+            build_statement -> function with no arguments that builds the statement
+    DESCRIPTION
+        Statements repeat - the same filtered columns, selected columns and sort - so they are built once per shape
+            and shared by all DBActions through utils (see DBStatementCache)
+    RETURNS
+        SQLAlchemy statement
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_statement__(self, object_name, shape, build_statement):
+        return self.utils.statements.get_statement(object_name, shape, build_statement)
+
+    """
+    NAME
+        __execute__ - executes a cached statement in the session
+    SYNOPSIS
+        __execute__(self, statement, params, **execution_options)
+            self                -> the instance of the class
+            statement           -> SQLAlchemy statement (see __get_statement__)
+            params              -> dictionary of the values of the bind parameters of statement
+            execution_options   -> more execution options of the connection (ex: stream_results=True)
+    DESCRIPTION
+        Executes on the connection of the session (in its transaction) with the compiled statement cache of utils
+            a statement is compiled on its first execution only
+    RETURNS
+        SQLAlchemy ResultProxy
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __execute__(self, statement, params, **execution_options):
+        connection = self.session.connection().execution_options(compiled_cache=self.utils.statements.compiled,
+                                                                 **execution_options)
+        return connection.execute(statement, params)
+
+    """
+    NAME
+        __update_count__ - updates the row count of a dynamic object
+    SYNOPSIS
+        __update_count__(self, object_name, object_class)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            object_class    -> class representing the dynamic object
+    DESCRIPTION
+        Updates row count of a dynamic object
+
+        Counts the rows of the table (SELECT count(_id)) and records the count in the table of row counts
+            only for a dynamic object without a row count - from then on, inserts and deletes keep it
+            (see __add_to_row_count__)
+        The count is published to dynamic_objects once the action is committed
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        4/25/2016
+    """
+    def __update_count__(self, object_name, object_class):
+        self.utils.printer.push("{0} - Retrieving 'count' from '{1}'".format(current_thread().name, object_name))
+
+        res = int(self.session.query(func.count(object_class._id)).scalar())
+
+        self.__set_row_count__(self.session.connection(), object_name, res)
+        self.pending_counts[object_name] = res
+
+    """
+    NAME
+        __add_to_row_count__ - changes the row count of a dynamic object in the current action
+    SYNOPSIS
+        __add_to_row_count__(self, object_name, added_rows)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            added_rows      -> number of rows inserted (negative if deleted)
+    DESCRIPTION
+        Updates the row count in the table of row counts in the same transaction as the rows
+            (UPDATE ... SET row_count = row_count + added_rows) - it is never off, even after a crash
+        The new count (RETURNING on PostgreSQL, else selected by object name) is published to dynamic_objects
+            once the action is committed (see __end_dynamic_action__) - a rolled back action changes nothing
+
+        If the dynamic object has no row count yet, nothing changes - its "update_count" task counts every row
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __add_to_row_count__(self, object_name, added_rows):
+        if added_rows == 0:
+            return
+
+        row_counts = self.utils.row_counts
+        is_postgresql = self.utils.engine.dialect.name == "postgresql"
+
+        def build_update_query():
+            update_query = row_counts.update().where(row_counts.c.object_name == bindparam("_where_object_name"))
+            update_query = update_query.values(row_count=row_counts.c.row_count + bindparam("_added_rows"))
+            if is_postgresql:
+                update_query = update_query.returning(row_counts.c.row_count)
+            return update_query
+
+        params = {"_where_object_name": object_name, "_added_rows": added_rows}
+        update_query = self.__get_statement__(ROW_COUNTS_TABLE_NAME, ("add_count",), build_update_query)
+        if is_postgresql:
+            row_count = self.__execute__(update_query, params).scalar()
+        else:
+            self.__execute__(update_query, params)
+            count_query = self.__get_statement__(ROW_COUNTS_TABLE_NAME, ("count",), lambda: select(
+                [row_counts.c.row_count]).where(row_counts.c.object_name == bindparam("_where_object_name")))
+            row_count = self.__execute__(count_query, {"_where_object_name": object_name}).scalar()
+
+        if row_count is not None:
+            self.pending_counts[object_name] = int(row_count)
+
+    """
+    NAME
+        __set_row_count__ - records the row count of a dynamic object
+    SYNOPSIS
+        __set_row_count__(self, connection, object_name, row_count)
+            self            -> the instance of the class
+            connection      -> SQLAlchemy Connection to record the count on (in its transaction)
+            object_name     -> string name of the dynamic object
+            row_count       -> number of rows of the dynamic object
+    DESCRIPTION
+        Replaces the row of object_name in the table of row counts
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __set_row_count__(self, connection, object_name, row_count):
+        row_counts = self.utils.row_counts
+        connection.execute(row_counts.delete().where(row_counts.c.object_name == object_name))
+        connection.execute(row_counts.insert().values(object_name=object_name, row_count=row_count))
+
+    """
+    NAME
+        __verify_row_counts_table__ - makes sure the table of row counts exists
+    SYNOPSIS
+        __verify_row_counts_table__(self)
             self    -> the instance of the class
+    DESCRIPTION
+        Uses the reflected table if there is one - else, adds it to the metadata and creates it (ROW_COUNTS_TABLE_NAME)
+            object_name (primary key), row_count
+        The table is kept in utils.row_counts
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __verify_row_counts_table__(self):
+        with self.member_vars_lock:
+            row_counts = self.utils.metadata.tables.get("{0}.{1}".format(DB_SCHEMA, ROW_COUNTS_TABLE_NAME))
+            if row_counts is None:
+                row_counts = Table(ROW_COUNTS_TABLE_NAME, self.utils.metadata,
+                                   Column("object_name", Unicode(255), primary_key=True),
+                                   Column("row_count", BigInteger, nullable=False, default=0),
+                                   schema=DB_SCHEMA)
+
+        row_counts.create(bind=self.utils.engine, checkfirst=True)
+        self.utils.row_counts = row_counts
+
+    ###
+    # action helpers
+    ###
+
+    """
+    NAME
+        __begin_dynamic_action__ - starts a new database action session
+    SYNOPSIS
+        __begin_dynamic_action__(self, action_type=None)
+            self        -> the instance of the class
+            action_type -> type of the action about to be performed (default is None - DEFAULT_ACTION_TIMEOUT)
     DESCRIPTION
         Starts a new database action session
+            the session of this DBAction is created on the first action and reused afterwards
+
+        On PostgreSQL:
+            1. records the backend process ID of the session's connection in backend_pid
+                (queried once per connection, then kept in the connection's info)
+            2. limits the statements of the transaction to the timeout of action_type (SET LOCAL statement_timeout)
+                the database cancels a statement that runs longer - the action fails instead of hanging the worker
+        Both only last until the action is committed or rolled back (see __end_dynamic_action__) - an action that
+            goes on after that must call this again
     RETURNS
         None
     AUTHOR
@@ -780,8 +1883,49 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __begin_dynamic_action__(self):
-        self.session = self.utils.session_class()
+    def __begin_dynamic_action__(self, action_type=None):
+        if self.session is None:
+            self.session = self.utils.session_maker()
+
+        if self.utils.engine.dialect.name == "postgresql":
+            connection = self.session.connection()
+            if "backend_pid" not in connection.info:
+                connection.info["backend_pid"] = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+            self.backend_pid = connection.info["backend_pid"]
+
+            timeout_ms = int(get_action_timeout(action_type) * 1000)
+            connection.execute(text("SET LOCAL statement_timeout = {0}".format(timeout_ms)))
+
+    """
+    NAME
+        cancel_backend - cancels the statement this DBAction is running on the database
+    SYNOPSIS
+        cancel_backend(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Called from another thread (ex: DBPool, for a stuck DBWorker)
+
+        Calls pg_cancel_backend with the backend process ID session uses (see __begin_dynamic_action__)
+            on a connection of its own
+        The statement fails in the worker with an error - the worker rolls back and moves on
+    RETURNS
+        True if the database accepted the cancel request
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def cancel_backend(self):
+        backend_pid = self.backend_pid
+        if backend_pid is None or self.utils.engine.dialect.name != "postgresql":
+            return False
+
+        connection = self.utils.engine.connect()
+        try:
+            return bool(connection.execute(text("SELECT pg_cancel_backend(:pid)"), pid=backend_pid).scalar())
+        finally:
+            connection.close()
 
     """
     NAME
@@ -791,6 +1935,16 @@ class DBAction:
             self    -> the instance of the class
     DESCRIPTION
         Ends a database action session by committing changes
+            backend_pid is cleared - the connection may be handed to another session, so it must not be cancelled
+            the statement timeout only lasted for the transaction - more statements need __begin_dynamic_action__
+
+        Publishes the dynamic objects the action created or dropped to dynamic_objects (see pending_objects)
+        If the action changed _Alert_Rules, invalidates the in-memory index of the rules (after the commit, so
+            the next load sees the change)
+        Publishes the row counts the action changed to dynamic_objects (see __add_to_row_count__)
+        Enqueues a single DBTask to insert the alert findings of the action (see __check_if_to_create_alerts__)
+            only once the rows they point to are committed
+            if the DBTaskList is full, the alert findings are dropped - the inserted rows are still committed
     RETURNS
         None
     AUTHOR
@@ -800,21 +1954,105 @@ class DBAction:
     """
     def __end_dynamic_action__(self):
         self.session.commit()
+        self.backend_pid = None
+
+        for object_name, dynamic_object in self.pending_objects.iteritems():
+            if dynamic_object is None:
+                self.__forget_dynamic_object__(object_name)
+            else:
+                self.utils.dynamic_objects[object_name] = dynamic_object
+        self.pending_objects = {}
+        self.pending_tables = []
+
+        if self.alert_rules_changed:
+            self.utils.alert_rules.invalidate()
+            self.alert_rules_changed = False
+
+        for object_name, row_count in self.pending_counts.iteritems():
+            if object_name in self.utils.dynamic_objects:
+                self.utils.dynamic_objects[object_name]["count"] = row_count
+        self.pending_counts = {}
+
+        if self.pending_alert_finds:
+            new_alerts_data = self.pending_alert_finds
+            self.pending_alert_finds = []
+            self.utils.printer.push("CREATING {0} ALERT(S)!!!".format(len(new_alerts_data)))
+            try:
+                self.utils.tasks.push(DBTask("insert", ALERT_FINDS_OBJECT_NAME, insert_data=new_alerts_data))
+            except DBTaskListFull as e:
+                self.utils.printer.push("Dropped {0} alert finding(s): {1}".format(len(new_alerts_data), e))
+
+    """
+    NAME
+        __rollback_dynamic_action__ - rolls back a failed database action
+    SYNOPSIS
+        __rollback_dynamic_action__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Rolls the session back and forgets what the action would have published once committed
+            (row counts, changes to the alert rules, alert findings, created or dropped dynamic objects)
+        Tables the action added to the metadata are removed from it again (thread-safe)
+        backend_pid is cleared like in __end_dynamic_action__
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __rollback_dynamic_action__(self):
+        self.session.rollback()
+        self.backend_pid = None
+        self.alert_rules_changed = False
+        self.pending_counts = {}
+        self.pending_alert_finds = []
+        self.pending_objects = {}
+
+        if self.pending_tables:
+            with self.member_vars_lock:
+                for new_table in self.pending_tables:
+                    self.utils.metadata.remove(new_table)
+            self.pending_tables = []
+
+    """
+    NAME
+        close - closes the session of this DBAction
+    SYNOPSIS
+        close(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Called by the DBWorker using this DBAction once it exits - returns the session's connection to the pool
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
 
     """
     NAME
-        __check_if_to_create_alert - checks and potentially creates a new alert after reviewing a new row
+        __check_if_to_create_alerts__ - checks and potentially creates new alerts after reviewing new rows
     SYNOPSIS
-        __check_if_to_create_alert(self, object_name, insert_data)
+        __check_if_to_create_alerts__(self, object_name, insert_data, new_ids, alert_rules)
             self        -> the instance of the class
             object_name -> string name of the dynamic object
-            insert_data -> dictionary of values inserted in a new row
+            insert_data -> list of dictionaries of values inserted in the new rows
+            new_ids     -> list of the row IDs of the new rows (same order as insert_data)
+            alert_rules -> index of the alert rules (see AlertRules)
     DESCRIPTION
-        1. collect the last row ID inserted - this is the row recently inserted
-        2. collects all alert rules and filter them to use only alert rules belnging to this object_name
-        3. for any rule matching insert_data:
-            1. create a new alert finding with the row ID (step 1)
-            2. enqueue DBTask to insert alert finding to alert_finds table
+        1. look up the alert rules of this object_name matching any row of insert_data in the index
+            one pass over the rows (see get_matching_rules)
+        2. for any rule matching a row, create a new alert finding with the row ID
+            found_id is unique - a row matching several rules gets one finding only (of the first rule it matches)
+        3. add the alert findings to pending_alert_finds
+            they are enqueued to alert_finds table in a single DBTask once the action is committed
+            (see __end_dynamic_action__) and forgotten if it is rolled back - no finding points to a row that was
+            never committed
     RETURNS
         None
     AUTHOR
@@ -822,32 +2060,309 @@ class DBAction:
     DATE
         4/25/2016
     """
-    def __check_if_to_create_alert(self, object_name, insert_data):
-        columns_to_select = ["name", "object_name", "column_name", "column_value"]
-        alert_rules = self.create_new_action(DBTask("select", ALERT_RULES_OBJECT_NAME, select_data=columns_to_select))
-
-        all_object_ids = self.create_new_action(DBTask("select", object_name, select_data=["_id"]))
-        all_object_ids = [row.get("_id") for row in all_object_ids]
-        new_id = max(all_object_ids)
-
-        self.utils.printer.push("NEW ALERT CREATION ATTEMPT WITH THIS ID: {0}".format(new_id))
-
-        for rule in alert_rules:
-            if rule.get("object_name") == object_name:
-                self.utils.printer.push(["INSERT VALUE: {0}".format(type(insert_data.get(rule.get("column_name")))),
-                                         "COLUMN VALUE: {0}".format(type(rule.get("column_value")))])
-                if str(insert_data.get(rule.get("column_name"))) == str(rule.get("column_value")):
-                    new_alert_data = {
-                        "rule_name": rule.get("name"),
-                        "object_name": object_name,
-                        "column_name": rule.get("column_name"),
-                        "found_value": insert_data[rule.get("column_name")],
-                        "found_id": new_id
-                    }
-                    self.utils.printer.push("CREATING ALERT!!!")
-                    new_alert_task = DBTask("insert", ALERT_FINDS_OBJECT_NAME, insert_data=new_alert_data)
-
-                    self.utils.tasks.push(new_alert_task)
+    def __check_if_to_create_alerts__(self, object_name, insert_data, new_ids, alert_rules):
+        found_ids = set(alert_find["found_id"] for alert_find in self.pending_alert_finds)
+        for i, rule_name, column_name in get_matching_rules(alert_rules, object_name, insert_data):
+            if new_ids[i] in found_ids:
+                continue
+            found_ids.add(new_ids[i])
+            self.pending_alert_finds.append({
+                "rule_name": rule_name,
+                "object_name": object_name,
+                "column_name": column_name,
+                "found_value": insert_data[i].get(column_name),
+                "found_id": new_ids[i]
+            })
+
+    """
+    NAME
+        __get_alert_rules__ - gets the in-memory index of the alert rules
+    SYNOPSIS
+        __get_alert_rules__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Returns the index shared through utils (see AlertRules)
+            if it is not loaded (first insert, or _Alert_Rules changed since), loads all rules in the session
+    RETURNS
+        index of the alert rules
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_alert_rules__(self):
+        alert_rules, version = self.utils.alert_rules.get_rules()
+        if alert_rules is None:
+            rules_table = self.utils.dynamic_objects[ALERT_RULES_OBJECT_NAME]["table"]
+            rule_rows = self.session.execute(select([rules_table.c.name, rules_table.c.object_name,
+                                                     rules_table.c.column_name, rules_table.c.column_value]))
+            alert_rules = self.utils.alert_rules.set_rules(rule_rows, version)
+        return alert_rules
+
+
+"""
+NAME
+    get_index_columns - gets the columns of an index definition
+SYNOPSIS
+    get_index_columns(index_columns)
+        index_columns   -> column name, or list of column names of a composite index (in order)
+DESCRIPTION
+    If index_columns is neither, or is an empty list, raise ValueError
+RETURNS
+    list of column names
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_index_columns(index_columns):
+    if isinstance(index_columns, basestring):
+        return [str(index_columns)]
+    if isinstance(index_columns, (list, tuple)) and index_columns and \
+            all(isinstance(column_name, basestring) for column_name in index_columns):
+        return [str(column_name) for column_name in index_columns]
+    raise ValueError("Invalid index definition: {0}".format(index_columns))
+
+
+"""
+NAME
+    verify_index_columns - makes sure an index definition only has columns of a table
+SYNOPSIS
+    verify_index_columns(object_name, index_columns, column_names)
+        object_name     -> string name of the dynamic object (or table) to index
+        index_columns   -> column name, or list of column names of a composite index (in order)
+        column_names    -> names of the columns of the table (any container - ex: Table.c)
+DESCRIPTION
+    Used both when the index is requested (ex: views) and when it is built (see DBAction.__create_index__)
+
+    If index_columns is not a valid index definition (see get_index_columns) or names a column that is not in
+        column_names, raise ValueError
+RETURNS
+    list of column names
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def verify_index_columns(object_name, index_columns, column_names):
+    index_column_names = get_index_columns(index_columns)
+    missing_columns = [column_name for column_name in index_column_names if column_name not in column_names]
+    if missing_columns:
+        raise ValueError("Cannot index '{0}' - no such columns: {1}".format(object_name, missing_columns))
+    return index_column_names
+
+
+"""
+NAME
+    get_index_name - gets the name of the index of columns of a table
+SYNOPSIS
+    get_index_name(table_name, column_names)
+        table_name      -> string name of the table
+        column_names    -> list of names of the indexed columns (in order)
+DESCRIPTION
+    <table>_<columns>_idx - a name longer than MAX_INDEX_NAME_LENGTH ends with the MD5 of the full name instead
+        so two indexes of the same table never get the same name
+    The index of the (_timestamp_created, _id) page key is named by get_page_index_name
+RETURNS
+    string name of the index
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_index_name(table_name, column_names):
+    if list(column_names) == PAGE_KEYS["_timestamp_created"]:
+        return get_page_index_name(table_name)
+    index_name = "{0}_{1}_idx".format(table_name, "_".join(column_names))
+    if len(index_name) <= MAX_INDEX_NAME_LENGTH:
+        return index_name
+    index_hash = md5(index_name.encode("utf-8")).hexdigest()[:8]
+    return "{0}_{1}_idx".format(table_name[:MAX_INDEX_NAME_LENGTH - 13], index_hash)
+
+
+"""
+NAME
+    get_action_timeout - gets the statement timeout of an action type
+SYNOPSIS
+    get_action_timeout(action_type)
+        action_type     -> type of DB action
+DESCRIPTION
+    Looks action_type up in ACTION_TIMEOUTS
+RETURNS
+    max seconds a statement of action_type may run (DEFAULT_ACTION_TIMEOUT if action_type is not in ACTION_TIMEOUTS)
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_action_timeout(action_type):
+    return ACTION_TIMEOUTS.get(action_type, DEFAULT_ACTION_TIMEOUT)
+
+
+"""
+NAME
+    get_engine_options - gets the options of the engine of a database URL that DBAction relies on
+SYNOPSIS
+    get_engine_options(conn_url)
+        conn_url    -> URL of the database (ex: CONN_URL)
+DESCRIPTION
+    On PostgreSQL (psycopg2) - an executemany is sent as multi-row INSERTs of up to BULK_INSERT_CHUNK_ROWS rows
+        instead of one INSERT per row (see DBAction.__insert_bulk_rows__)
+    No options for other databases
+RETURNS
+    dictionary of keyword arguments of create_engine
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_engine_options(conn_url):
+    if make_url(conn_url).drivername in ("postgresql", "postgresql+psycopg2"):
+        return {"executemany_mode": "values", "executemany_values_page_size": BULK_INSERT_CHUNK_ROWS}
+    return {}
+
+
+"""
+NAME
+    encode_page_cursor - creates the cursor of the page after a row
+SYNOPSIS
+    encode_page_cursor(sort_by, key_values)
+        sort_by         -> column the pages are sorted by - one of PAGE_KEYS
+        key_values      -> values of the key columns (PAGE_KEYS[sort_by]) of the last row of a page
+DESCRIPTION
+    The cursor is opaque to clients - URL-safe base64 of a JSON list of sort_by and the key values
+        datetimes are written in PAGE_CURSOR_DATETIME_FORMAT
+RETURNS
+    string cursor
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def encode_page_cursor(sort_by, key_values):
+    key_values = [value.strftime(PAGE_CURSOR_DATETIME_FORMAT) if isinstance(value, datetime) else value
+                  for value in key_values]
+    return urlsafe_b64encode(json.dumps([sort_by] + key_values))
+
+
+"""
+NAME
+    decode_page_cursor - reads the key values out of a page cursor
+SYNOPSIS
+    decode_page_cursor(cursor, sort_by)
+        cursor          -> string cursor created by encode_page_cursor
+        sort_by         -> column the pages are sorted by - one of PAGE_KEYS
+DESCRIPTION
+    If cursor is not a cursor of sort_by, raise ValueError
+RETURNS
+    list of the values of the key columns (PAGE_KEYS[sort_by]) - datetimes are parsed back
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def decode_page_cursor(cursor, sort_by):
+    try:
+        values = json.loads(urlsafe_b64decode(str(cursor)))
+        if values[0] != sort_by or len(values) != len(PAGE_KEYS[sort_by]) + 1:
+            raise ValueError()
+
+        key_values = values[1:]
+        for i, column_name in enumerate(PAGE_KEYS[sort_by]):
+            if column_name.startswith("_timestamp"):
+                key_values[i] = datetime.strptime(key_values[i], PAGE_CURSOR_DATETIME_FORMAT)
+        return key_values
+    except (TypeError, ValueError, IndexError):
+        raise ValueError("Invalid page cursor for '{0}': {1}".format(sort_by, cursor))
+
+
+"""
+NAME
+    get_where_shape - gets the shape of a filter
+SYNOPSIS
+    get_where_shape(where_data)
+        where_data      -> a dictionary of columns as keys and values to filter by as values
+DESCRIPTION
+    Filters of the same shape share a statement (see DBAction.__get_row_filter__) - a None value is part of the shape
+        (IS NULL is not a bind parameter)
+RETURNS
+    tuple of (column name, True if the value is None) - sorted by column name
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_where_shape(where_data):
+    return tuple(sorted((column_name, value is None) for column_name, value in where_data.iteritems()))
+
+
+"""
+NAME
+    get_row_params - gets the bind parameters of a filter
+SYNOPSIS
+    get_row_params(where_data, limit, offset)
+        where_data      -> a dictionary of columns as keys and values to filter by as values
+        limit           -> max number of rows (0 or less means all rows)
+        offset          -> number of rows to skip
+DESCRIPTION
+    Values of the statements built with DBAction.__get_row_filter__ (and the limit and offset of a select)
+        None values are not bound (see get_where_shape)
+RETURNS
+    dictionary of bind parameter names and values
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_row_params(where_data, limit, offset):
+    params = dict(("_where_" + column_name, value) for column_name, value in where_data.iteritems()
+                  if value is not None)
+    if limit > 0:
+        params["_row_limit"] = limit
+    if offset > 0:
+        params["_row_offset"] = offset
+    return params
+
+
+"""
+NAME
+    get_page_index_name - gets the name of the index of the (_timestamp_created, _id) page key of a table
+SYNOPSIS
+    get_page_index_name(table_name)
+        table_name      -> string name of the DB table
+DESCRIPTION
+    Index names are limited to 63 characters (PostgreSQL) - long table names are cut
+RETURNS
+    string name of the index
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_page_index_name(table_name):
+    return "{0}_page_idx".format(table_name[:54])
+
+
+"""
+NAME
+    get_table_column - gets a column of a table by name
+SYNOPSIS
+    get_table_column(object_table, column_name)
+        object_table    -> SQLAlchemy Table of a dynamic object
+        column_name     -> string name of the column
+DESCRIPTION
+    If object_table has no column named column_name, raise ValueError
+RETURNS
+    SQLAlchemy Column instance
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_table_column(object_table, column_name):
+    if column_name not in object_table.c:
+        raise ValueError("Unrecognized column name: {0}".format(column_name))
+    return object_table.c[column_name]
 
 
 """
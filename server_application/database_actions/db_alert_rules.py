@@ -0,0 +1,159 @@
+from threading import RLock
+
+
+class AlertRules:
+    """
+    NAME
+        AlertRules - in-memory index of the alert rules (rows of the _Alert_Rules object)
+    VARIABLES
+        rules           -> index of the rules - None until loaded (and after every change to _Alert_Rules)
+            { object_name: { column_name: { get_rule_key(column_value): [ rule names ] } } }
+        version         -> int increased by every change to _Alert_Rules - an index loaded before a change is not kept
+        lock            -> RLock instance guarding rules and version
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        The constructor sets up an index that is not loaded yet
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self):
+        self.rules = None
+        self.version = 0
+        self.lock = RLock()
+
+    """
+    NAME
+        get_rules - gets the index of the rules and its version
+    SYNOPSIS
+        get_rules(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        If the index is None, the caller loads the rules and hands them to set_rules with the version it got here
+    RETURNS
+        index of the rules (None if not loaded), version
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_rules(self):
+        with self.lock:
+            return self.rules, self.version
+
+    """
+    NAME
+        set_rules - indexes loaded rules
+    SYNOPSIS
+        set_rules(self, rule_rows, version)
+            self        -> the instance of the class
+            rule_rows   -> rows of _Alert_Rules - (name, object_name, column_name, column_value) each
+            version     -> version returned by get_rules before the rules were loaded
+    DESCRIPTION
+        Keeps the index only if _Alert_Rules did not change since version - else, the next caller loads it again
+    RETURNS
+        index of rule_rows
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_rules(self, rule_rows, version):
+        rules = {}
+        for rule_name, object_name, column_name, column_value in rule_rows:
+            rules.setdefault(object_name, {}).setdefault(column_name, {}) \
+                .setdefault(get_rule_key(column_value), []).append(rule_name)
+
+        with self.lock:
+            if version == self.version:
+                self.rules = rules
+        return rules
+
+    """
+    NAME
+        invalidate - drops the index after a change to _Alert_Rules
+    SYNOPSIS
+        invalidate(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Called once the change is committed - the next alert check loads the rules again
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def invalidate(self):
+        with self.lock:
+            self.rules = None
+            self.version += 1
+
+
+"""
+NAME
+    get_matching_rules - finds the rules new rows of a dynamic object match
+SYNOPSIS
+    get_matching_rules(rules, object_name, new_records)
+        rules       -> index of the rules (see AlertRules)
+        object_name -> string name of the dynamic object
+        new_records -> list of dictionaries of values inserted in the new rows
+DESCRIPTION
+    A rule matches if the key of the row's value of its column equals the key of its value (see get_rule_key)
+        (a missing column is None - it matches a rule with no value)
+
+    One pass over the rows per column that has rules on object_name - the number of rules does not matter
+        and rows of an object without rules are not looked at
+RETURNS
+    list of (index of the row in new_records, rule name, column name) of every match - in order of the rows
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_matching_rules(rules, object_name, new_records):
+    matches = []
+    for column_name, rule_values in rules.get(object_name, {}).iteritems():
+        for i, new_record in enumerate(new_records):
+            for rule_name in rule_values.get(get_rule_key(new_record.get(column_name)), []):
+                matches.append((i, rule_name, column_name))
+
+    matches.sort(key=lambda match: match[0])
+    return matches
+
+
+"""
+NAME
+    get_rule_key - gets the key a value is matched by in the index of the rules
+SYNOPSIS
+    get_rule_key(value)
+        value   -> value of a rule, or of a column of a new row
+DESCRIPTION
+    Values are matched as text - the key is the unicode string of the value
+        byte strings are decoded as UTF-8 (ex: "600" and u"600" have the same key)
+        non-ASCII text never raises (str() of it raises UnicodeEncodeError)
+RETURNS
+    unicode string
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_rule_key(value):
+    if isinstance(value, str):
+        return value.decode("utf-8", "replace")
+    return unicode(value)
@@ -0,0 +1,895 @@
+import resource
+import sys
+from datetime import datetime
+from threading import Event, RLock
+from time import sleep, time
+
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from ActMonitor.server_application.database_actions import DB_SCHEMA
+from db_action import DBAction, get_engine_options
+from db_alert_rules import AlertRules
+from db_schema_cache import DBSchemaCache
+from db_statement_cache import DBStatementCache
+from db_printer import DBPrinter
+from db_task import DBTask, DBTaskList, HARD_LIMIT_MODE
+from db_worker import DBWorker
+
+# database used by the benchmarks that need one - an in-memory SQLite database unless given a URL
+BENCHMARK_CONN_URL = "sqlite://"
+
+# name of the dynamic object the database benchmarks create (default objects start with "_" - no alert checks)
+BENCHMARK_OBJECT_NAME = "_Benchmark_Rows"
+
+
+class BenchmarkUtils:
+    """
+    NAME
+        BenchmarkUtils - the minimal part of DBUtils that DBWorker instances need to run without a database
+    VARIABLES
+        tasks           -> DBTaskList instance - the queue the workers pop tasks from
+        printer         -> DBPrinter instance (not started - nothing is printed during a benchmark)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set up the variables
+    SYNOPSIS
+        __init__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        The constructor sets up an empty task queue and a printer
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self):
+        self.tasks = DBTaskList()
+        self.printer = DBPrinter()
+
+
+class DatabaseBenchmarkUtils(BenchmarkUtils):
+    """
+    NAME
+        DatabaseBenchmarkUtils - the part of DBUtils that a DBAction needs to run against a benchmark database
+    VARIABLES
+        engine          -> database engine of the benchmark database (sqlalchemy)
+        metadata        -> metadata of the benchmark database (sqlalchemy)
+        session_maker   -> instance of sessionmaker bound to engine (sqlalchemy)
+        dynamic_objects -> dictionary containing the dynamic objects the benchmark creates
+        alert_rules     -> AlertRules instance - in-memory index of the alert rules the benchmark sets
+        statements      -> DBStatementCache instance - statements of the DB actions of the benchmark
+        row_counts      -> SQLAlchemy Table of the row counts (None until __create_benchmark_object__ creates it)
+        schema          -> DBSchemaCache instance - no fingerprints are loaded, so no snapshot is read or written
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set up the variables
+    SYNOPSIS
+        __init__(self, conn_url=BENCHMARK_CONN_URL)
+            self        -> the instance of the class
+            conn_url    -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+    DESCRIPTION
+        The constructor connects to the benchmark database
+
+        SQLite has no schemas - an in-memory database named DB_SCHEMA is attached to every connection instead
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, conn_url=BENCHMARK_CONN_URL):
+        BenchmarkUtils.__init__(self)
+        self.engine = create_engine(conn_url, **get_engine_options(conn_url))
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", __attach_schema__)
+        self.metadata = MetaData(bind=self.engine)
+        self.session_maker = sessionmaker(bind=self.engine)
+        self.dynamic_objects = {}
+        self.alert_rules = AlertRules()
+        self.statements = DBStatementCache()
+        self.row_counts = None
+        self.schema = DBSchemaCache()
+
+
+class LatencyRecorder:
+    """
+    NAME
+        LatencyRecorder - replaces DBAction in a benchmark and records how long each task waited before it started
+    VARIABLES
+        latencies       -> list of seconds between pushing a task and a worker starting it
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set up the variables
+    SYNOPSIS
+        __init__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        The constructor sets up an empty list of latencies
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self):
+        self.latencies = []
+
+    """
+    NAME
+        create_new_action - records the enqueue-to-start latency of a task
+    SYNOPSIS
+        create_new_action(self, db_task)
+            self    -> the instance of the class
+            db_task -> DBTask instance with an "enqueued_at" additional argument
+    DESCRIPTION
+        A merged task records the latency of every task it was merged from
+
+        Same signature as DBAction.create_new_action so DBWorker can use it as its actioner
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def create_new_action(self, db_task):
+        for done_task in db_task.merged or [db_task]:
+            self.latencies.append(time() - done_task.additional_args.get("enqueued_at"))
+
+    """
+    NAME
+        close - does nothing - there is no session to close
+    SYNOPSIS
+        close(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Same signature as DBAction.close so DBWorker can use it as its actioner
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def close(self):
+        pass
+
+
+class SimulatedAction:
+    """
+    NAME
+        SimulatedAction - replaces DBAction in a benchmark and simulates a database round trip per task
+    VARIABLES
+        duration        -> seconds every task takes
+        locks           -> dictionary of object name to RLock - same as the "lock" of a dynamic object
+        locks_lock      -> RLock instance to make sure creating locks is thread-safe
+        done            -> number of tasks performed (a merged task counts as every task it was merged from)
+        actions         -> number of actions performed (simulated round trips)
+        contended       -> number of tasks that had to wait for the lock of their object
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set up the variables
+    SYNOPSIS
+        __init__(self, duration)
+            self        -> the instance of the class
+            duration    -> seconds every task takes
+    DESCRIPTION
+        The constructor sets up the variables
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, duration):
+        self.duration = duration
+        self.locks = {}
+        self.locks_lock = RLock()
+        self.done = 0
+        self.actions = 0
+        self.contended = 0
+
+    """
+    NAME
+        create_new_action - holds the lock of the task's object for duration seconds
+    SYNOPSIS
+        create_new_action(self, db_task)
+            self    -> the instance of the class
+            db_task -> DBTask instance
+    DESCRIPTION
+        Same signature as DBAction.create_new_action so DBWorker can use it as its actioner
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def create_new_action(self, db_task):
+        with self.locks_lock:
+            object_lock = self.locks.setdefault(db_task.object_name, RLock())
+
+        if not object_lock.acquire(False):
+            with self.locks_lock:
+                self.contended += 1
+            object_lock.acquire()
+
+        try:
+            sleep(self.duration)
+        finally:
+            object_lock.release()
+
+        with self.locks_lock:
+            self.done += len(db_task.merged) if db_task.merged is not None else 1
+            self.actions += 1
+
+    """
+    NAME
+        close - does nothing - there is no session to close
+    SYNOPSIS
+        close(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Same signature as DBAction.close so DBWorker can use it as its actioner
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def close(self):
+        pass
+
+
+"""
+NAME
+    benchmark_dispatch_latency - measures the time between pushing a DBTask and a DBWorker starting it
+SYNOPSIS
+    benchmark_dispatch_latency(num_of_workers=3, num_of_tasks=500, spacing=0.002)
+        num_of_workers  -> number of DBWorker threads popping from the queue
+        num_of_tasks    -> number of tasks to push
+        spacing         -> seconds to wait between pushes
+DESCRIPTION
+    Starts num_of_workers DBWorker instances over a DBTaskList, pushes num_of_tasks tasks and records how long
+        every task waited before a worker started it
+    The tasks are updates - inserts may be held on purpose so they can be merged (see COALESCE_WAIT_SECONDS)
+RETURNS
+    {
+        "tasks": number of tasks started,
+        "median_ms": median latency in milliseconds,
+        "p99_ms": 99th percentile latency in milliseconds,
+        "max_ms": max latency in milliseconds
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_dispatch_latency(num_of_workers=3, num_of_tasks=500, spacing=0.002):
+    utils = BenchmarkUtils()
+    recorder = LatencyRecorder()
+    exit_event = Event()
+    workers = __start_workers__(num_of_workers, exit_event, utils, recorder)
+
+    for i in range(num_of_tasks):
+        utils.tasks.push(DBTask("update", "benchmark", enqueued_at=time()))
+        sleep(spacing)
+
+    while len(recorder.latencies) < num_of_tasks:
+        sleep(0.01)
+
+    __stop_workers__(workers, exit_event, utils)
+
+    latencies = sorted(recorder.latencies)
+    return {
+        "tasks": len(latencies),
+        "median_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "max_ms": latencies[-1] * 1000
+    }
+
+
+"""
+NAME
+    benchmark_idle_cpu - measures the CPU used by idle DBWorkers
+SYNOPSIS
+    benchmark_idle_cpu(num_of_workers=3, seconds=3)
+        num_of_workers  -> number of idle DBWorker threads
+        seconds         -> how long to measure
+DESCRIPTION
+    Starts num_of_workers DBWorker instances over an empty DBTaskList and measures the process CPU time
+RETURNS
+    percent of one CPU used while idle
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_idle_cpu(num_of_workers=3, seconds=3):
+    utils = BenchmarkUtils()
+    exit_event = Event()
+    workers = __start_workers__(num_of_workers, exit_event, utils, LatencyRecorder())
+    sleep(0.2)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    sleep(seconds)
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    __stop_workers__(workers, exit_event, utils)
+
+    cpu_seconds = (usage_after.ru_utime + usage_after.ru_stime) - (usage_before.ru_utime + usage_before.ru_stime)
+    return 100.0 * cpu_seconds / seconds
+
+
+"""
+NAME
+    benchmark_throughput - measures how many tasks per second the DBWorkers perform
+SYNOPSIS
+    benchmark_throughput(num_of_workers, num_of_objects, num_of_tasks=400, duration=0.005)
+        num_of_workers  -> number of DBWorker threads popping from the queue
+        num_of_objects  -> number of objects (trackers) the tasks are spread over
+        num_of_tasks    -> number of tasks to push
+        duration        -> seconds every task takes (simulated database round trip)
+DESCRIPTION
+    Pushes num_of_tasks insert tasks spread over num_of_objects objects, then starts num_of_workers DBWorker
+        instances and measures how long they take to perform all tasks
+RETURNS
+    {
+        "tasks_per_second": throughput,
+        "actions": number of actions (simulated round trips) performed for all tasks,
+        "contended": number of tasks that waited for the lock of their object
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_throughput(num_of_workers, num_of_objects, num_of_tasks=400, duration=0.005):
+    utils = BenchmarkUtils()
+    action = SimulatedAction(duration)
+    exit_event = Event()
+
+    for i in range(num_of_tasks):
+        utils.tasks.push(DBTask("insert", "benchmark{0}".format(i % num_of_objects)))
+
+    start = time()
+    workers = __start_workers__(num_of_workers, exit_event, utils, action)
+    while action.done < num_of_tasks:
+        sleep(0.001)
+    elapsed = time() - start
+
+    __stop_workers__(workers, exit_event, utils)
+
+    return {
+        "tasks_per_second": num_of_tasks / elapsed,
+        "actions": action.actions,
+        "contended": action.contended
+    }
+
+
+"""
+NAME
+    benchmark_task_memory - measures the memory held by every pending DBTask
+SYNOPSIS
+    benchmark_task_memory(num_of_tasks=100000, num_of_objects=32)
+        num_of_tasks    -> number of tasks to push
+        num_of_objects  -> number of objects (trackers) the tasks are spread over
+DESCRIPTION
+    Pushes num_of_tasks insert tasks (a typical tracker event) to a DBTaskList and adds up the size of everything
+        the pending tasks reference (see __get_deep_size__) - objects shared by tasks are counted once
+RETURNS
+    {
+        "tasks": number of pending tasks,
+        "bytes_per_task": average bytes held by a pending task
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_task_memory(num_of_tasks=100000, num_of_objects=32):
+    tasks = DBTaskList(max_tasks=num_of_tasks, limit_mode=HARD_LIMIT_MODE)
+    for i in range(num_of_tasks):
+        tasks.push(DBTask("insert", "benchmark{0}".format(i % num_of_objects), insert_data={
+            "user_name": "user{0}".format(i),
+            "page": "/dashboard",
+            "duration": i % 600,
+            "is_mobile": i % 2 == 0
+        }))
+
+    seen = set()
+    total_bytes = 0
+    for lane in tasks.lanes.itervalues():
+        for shard_tasks in lane["shards"].itervalues():
+            for task in shard_tasks:
+                total_bytes += __get_deep_size__(task, seen)
+
+    return {
+        "tasks": tasks.get_size(),
+        "bytes_per_task": total_bytes / float(tasks.get_size())
+    }
+
+
+"""
+NAME
+    __get_deep_size__ - adds up the size of an object and everything it references
+SYNOPSIS
+    __get_deep_size__(obj, seen)
+        obj     -> object to measure
+        seen    -> set of ids of objects already counted
+DESCRIPTION
+    Follows dictionaries, lists, tuples, instance dictionaries and slots
+        an object is only counted the first time it is found
+RETURNS
+    size in bytes
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __get_deep_size__(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.iteritems():
+            size += __get_deep_size__(key, seen) + __get_deep_size__(value, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += __get_deep_size__(item, seen)
+
+    if hasattr(obj, "__dict__"):
+        size += __get_deep_size__(obj.__dict__, seen)
+    for slot in getattr(type(obj), "__slots__", []):
+        size += __get_deep_size__(getattr(obj, slot, None), seen)
+    return size
+
+
+"""
+NAME
+    benchmark_bulk_insert - measures how many rows per second an insert task writes
+SYNOPSIS
+    benchmark_bulk_insert(num_of_rows, conn_url=BENCHMARK_CONN_URL)
+        num_of_rows     -> number of rows in the insert task
+        conn_url        -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+DESCRIPTION
+    Creates a BENCHMARK_OBJECT_NAME table and inserts num_of_rows rows in one action twice:
+        1. "orm" - an ORM instance per row (see DBAction.__insert_orm_rows__)
+        2. "bulk" - SQLAlchemy Core, no ORM instances (see DBAction.__insert_bulk_rows__)
+    each action is committed before its time is taken - the table is dropped at the end
+RETURNS
+    {
+        "rows": num_of_rows,
+        "orm_rows_per_sec": rows per second inserted through the ORM,
+        "bulk_rows_per_sec": rows per second inserted through the bulk path
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_bulk_insert(num_of_rows, conn_url=BENCHMARK_CONN_URL):
+    utils = DatabaseBenchmarkUtils(conn_url)
+    action = DBAction(utils, load_objects=False)
+    properties = [{"name": "name", "type": "String"}, {"name": "value", "type": "Integer"}]
+    object_class, object_table = __create_benchmark_object__(action, properties)
+
+    results = {"rows": num_of_rows}
+    try:
+        for path_name, insert_rows in [("orm", lambda rows: action.__insert_orm_rows__(object_class, rows)),
+                                       ("bulk", lambda rows: action.__insert_bulk_rows__(BENCHMARK_OBJECT_NAME,
+                                                                                         object_table, rows))]:
+            rows = [{"name": "row{0}".format(i), "value": i, "_timestamp_created": datetime.now(),
+                     "_timestamp_modified": datetime.now()} for i in range(num_of_rows)]
+
+            start = time()
+            action.__begin_dynamic_action__("insert")
+            insert_rows(rows)
+            action.__end_dynamic_action__()
+            results["{0}_rows_per_sec".format(path_name)] = num_of_rows / max(time() - start, 1e-9)
+    finally:
+        action.close()
+        object_table.drop(bind=utils.engine, checkfirst=True)
+
+    return results
+
+
+"""
+NAME
+    benchmark_select_rows - measures how many rows per second a select turns into dictionaries
+SYNOPSIS
+    benchmark_select_rows(num_of_columns, num_of_rows=10000, num_of_selected=3, conn_url=BENCHMARK_CONN_URL)
+        num_of_columns  -> number of columns of the tracker (narrow - few, wide - many)
+        num_of_rows     -> number of rows to select (default is 10000)
+        num_of_selected -> number of columns to select (default is 3)
+        conn_url        -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+DESCRIPTION
+    Creates a BENCHMARK_OBJECT_NAME table with num_of_columns integer columns and num_of_rows rows
+    Selects num_of_selected columns of all rows twice:
+        1. "orm" - query the whole mapped entity, then getattr the selected columns of every instance
+            (how selects worked before they were projected)
+        2. "projected" - DBAction.__select_record__ - only the selected columns, straight to dictionaries
+    the table is dropped at the end
+RETURNS
+    {
+        "columns": num_of_columns,
+        "rows": num_of_rows,
+        "orm_rows_per_sec": rows per second selected through the ORM,
+        "projected_rows_per_sec": rows per second selected through __select_record__
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_select_rows(num_of_columns, num_of_rows=10000, num_of_selected=3, conn_url=BENCHMARK_CONN_URL):
+    utils = DatabaseBenchmarkUtils(conn_url)
+    action = DBAction(utils, load_objects=False)
+    column_names = ["column{0}".format(i) for i in range(num_of_columns)]
+    object_class, object_table = __create_benchmark_object__(action, [{"name": name, "type": "Integer"}
+                                                                     for name in column_names])
+    select_data = column_names[:num_of_selected]
+
+    def select_orm():
+        rows = []
+        for instance in action.session.query(object_class).order_by(object_class._id).all():
+            rows.append(dict((name, getattr(instance, name)) for name in select_data))
+        return rows
+
+    def select_projected():
+        return action.__select_record__(BENCHMARK_OBJECT_NAME, object_table, {}, select_data, 0, 0, "_id", True)
+
+    results = {"columns": num_of_columns, "rows": num_of_rows}
+    try:
+        action.__begin_dynamic_action__("insert")
+        now = datetime.now()
+        action.__insert_bulk_rows__(BENCHMARK_OBJECT_NAME, object_table,
+                                    [dict([(name, i) for name in column_names] +
+                                          [("_timestamp_created", now), ("_timestamp_modified", now)])
+                                     for i in range(num_of_rows)])
+        action.__end_dynamic_action__()
+
+        for path_name, select_rows in [("orm", select_orm), ("projected", select_projected)]:
+            start = time()
+            action.__begin_dynamic_action__("select")
+            select_rows()
+            action.__end_dynamic_action__()
+            results["{0}_rows_per_sec".format(path_name)] = num_of_rows / max(time() - start, 1e-9)
+    finally:
+        action.close()
+        object_table.drop(bind=utils.engine, checkfirst=True)
+
+    return results
+
+
+"""
+NAME
+    benchmark_alert_overhead - measures the time alert checks add to an insert task
+SYNOPSIS
+    benchmark_alert_overhead(num_of_rows, num_of_rules=100, conn_url=BENCHMARK_CONN_URL)
+        num_of_rows     -> number of rows in the insert task
+        num_of_rules    -> number of alert rules on the inserted object (default is 100)
+        conn_url        -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+DESCRIPTION
+    Creates a BENCHMARK_OBJECT_NAME table with num_of_rules alert rules on its "value" column
+        rule i matches the row with value i * 100
+    Inserts num_of_rows rows in one action (see DBAction.__insert_bulk_rows__), then checks them against the rules:
+        1. "per_row" - one check (and one alert finds task) per row - how inserts were checked before
+        2. "batched" - one check of all rows, one alert finds task (see DBAction.__check_if_to_create_alerts__)
+    the alert finds tasks are pushed once the checks are committed (see DBAction.__end_dynamic_action__)
+    the alert finds tasks are only pushed to the DBTaskList - the table is dropped at the end
+RETURNS
+    {
+        "rows": num_of_rows,
+        "rules": num_of_rules,
+        "per_row_overhead": time of the per-row checks / time of the insert,
+        "batched_overhead": time of the batched check / time of the insert,
+        "batched_tasks": number of alert finds tasks the batched check pushed
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_alert_overhead(num_of_rows, num_of_rules=100, conn_url=BENCHMARK_CONN_URL):
+    utils = DatabaseBenchmarkUtils(conn_url)
+    action = DBAction(utils, load_objects=False)
+    properties = [{"name": "name", "type": "String"}, {"name": "value", "type": "Integer"}]
+    object_class, object_table = __create_benchmark_object__(action, properties)
+    alert_rules = utils.alert_rules.set_rules([("rule{0}".format(i), BENCHMARK_OBJECT_NAME, "value", i * 100)
+                                               for i in range(num_of_rules)], 0)
+
+    results = {"rows": num_of_rows, "rules": num_of_rules}
+    try:
+        now = datetime.now()
+        rows = [{"name": "row{0}".format(i), "value": i, "_timestamp_created": now, "_timestamp_modified": now}
+                for i in range(num_of_rows)]
+
+        start = time()
+        action.__begin_dynamic_action__("insert")
+        new_ids = action.__insert_bulk_rows__(BENCHMARK_OBJECT_NAME, object_table, rows)
+        action.__end_dynamic_action__()
+        insert_time = max(time() - start, 1e-9)
+
+        start = time()
+        for new_record, new_id in zip(rows, new_ids):
+            action.__check_if_to_create_alerts__(BENCHMARK_OBJECT_NAME, [new_record], [new_id], alert_rules)
+            action.__end_dynamic_action__()
+        results["per_row_overhead"] = (time() - start) / insert_time
+
+        tasks_before = utils.tasks.get_size()
+        start = time()
+        action.__check_if_to_create_alerts__(BENCHMARK_OBJECT_NAME, rows, new_ids, alert_rules)
+        action.__end_dynamic_action__()
+        results["batched_overhead"] = (time() - start) / insert_time
+        results["batched_tasks"] = utils.tasks.get_size() - tasks_before
+    finally:
+        action.close()
+        object_table.drop(bind=utils.engine, checkfirst=True)
+
+    return results
+
+
+"""
+NAME
+    benchmark_statement_cache - measures how many select actions per second run with and without cached statements
+SYNOPSIS
+    benchmark_statement_cache(num_of_selects=2000, num_of_rows=1000, conn_url=BENCHMARK_CONN_URL)
+        num_of_selects  -> number of select actions to run each time (default is 2000)
+        num_of_rows     -> number of rows in the table (default is 1000)
+        conn_url        -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+DESCRIPTION
+    Creates a BENCHMARK_OBJECT_NAME table with num_of_rows rows
+    Runs num_of_selects selects of the same shape (filtered by "value", 1 row) twice:
+        1. "cold" - the statement cache is emptied before every select - built and compiled every time
+        2. "warm" - the statement is built and compiled once (see DBStatementCache)
+    the table is dropped at the end
+RETURNS
+    {
+        "selects": num_of_selects,
+        "cold_selects_per_sec": selects per second with an empty cache,
+        "warm_selects_per_sec": selects per second with cached statements
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_statement_cache(num_of_selects=2000, num_of_rows=1000, conn_url=BENCHMARK_CONN_URL):
+    utils = DatabaseBenchmarkUtils(conn_url)
+    action = DBAction(utils, load_objects=False)
+    properties = [{"name": "name", "type": "String"}, {"name": "value", "type": "Integer"}]
+    object_class, object_table = __create_benchmark_object__(action, properties)
+
+    results = {"selects": num_of_selects}
+    try:
+        now = datetime.now()
+        action.__begin_dynamic_action__("insert")
+        action.__insert_bulk_rows__(BENCHMARK_OBJECT_NAME, object_table,
+                                    [{"name": "row{0}".format(i), "value": i, "_timestamp_created": now,
+                                      "_timestamp_modified": now} for i in range(num_of_rows)])
+        action.__end_dynamic_action__()
+
+        for cache_name in ["cold", "warm"]:
+            start = time()
+            for i in range(num_of_selects):
+                if cache_name == "cold":
+                    utils.statements = DBStatementCache()
+                action.create_new_action(DBTask("select", BENCHMARK_OBJECT_NAME, select_data=["_id", "name"],
+                                                where_data={"value": i % num_of_rows}, limit=1))
+            results["{0}_selects_per_sec".format(cache_name)] = num_of_selects / max(time() - start, 1e-9)
+    finally:
+        action.close()
+        object_table.drop(bind=utils.engine, checkfirst=True)
+
+    return results
+
+
+"""
+NAME
+    benchmark_index - measures filtered selects with and without an index of the filtered column
+SYNOPSIS
+    benchmark_index(num_of_rows=100000, num_of_selects=200, conn_url=BENCHMARK_CONN_URL)
+        num_of_rows     -> number of rows in the table (default is 100000)
+        num_of_selects  -> number of select actions to run each time (default is 200)
+        conn_url        -> URL of the benchmark database (default is BENCHMARK_CONN_URL)
+DESCRIPTION
+    Creates a BENCHMARK_OBJECT_NAME table with num_of_rows rows
+    Runs num_of_selects selects filtered by "value" (1 matching row each) twice:
+        1. "scan" - "value" is not indexed - every select scans the table
+        2. "index" - after indexing "value" (see DBAction.__create_index__)
+    the table is dropped at the end
+RETURNS
+    {
+        "rows": num_of_rows,
+        "selects": num_of_selects,
+        "index_build_ms": milliseconds to build the index,
+        "scan_select_ms": average milliseconds per select without the index,
+        "index_select_ms": average milliseconds per select with the index
+    }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def benchmark_index(num_of_rows=100000, num_of_selects=200, conn_url=BENCHMARK_CONN_URL):
+    utils = DatabaseBenchmarkUtils(conn_url)
+    action = DBAction(utils, load_objects=False)
+    properties = [{"name": "name", "type": "String"}, {"name": "value", "type": "Integer"}]
+    object_class, object_table = __create_benchmark_object__(action, properties)
+
+    results = {"rows": num_of_rows, "selects": num_of_selects}
+    try:
+        now = datetime.now()
+        action.__begin_dynamic_action__("insert")
+        action.__insert_bulk_rows__(BENCHMARK_OBJECT_NAME, object_table,
+                                    [{"name": "row{0}".format(i), "value": i, "_timestamp_created": now,
+                                      "_timestamp_modified": now} for i in range(num_of_rows)])
+        action.__end_dynamic_action__()
+
+        for index_name in ["scan", "index"]:
+            if index_name == "index":
+                start = time()
+                action.create_new_action(DBTask("create_index", BENCHMARK_OBJECT_NAME, columns="value"))
+                results["index_build_ms"] = (time() - start) * 1000
+
+            start = time()
+            for i in range(num_of_selects):
+                action.create_new_action(DBTask("select", BENCHMARK_OBJECT_NAME, select_data=["_id", "name"],
+                                                where_data={"value": (i * 7919) % num_of_rows}))
+            results["{0}_select_ms".format(index_name)] = (time() - start) * 1000 / num_of_selects
+    finally:
+        action.close()
+        object_table.drop(bind=utils.engine, checkfirst=True)
+
+    return results
+
+
+"""
+NAME
+    __create_benchmark_object__ - creates the BENCHMARK_OBJECT_NAME dynamic object
+SYNOPSIS
+    __create_benchmark_object__(action, properties)
+        action          -> DBAction instance of a DatabaseBenchmarkUtils
+        properties      -> list of column specifications (see DBAction.__create_dynamic_table__)
+DESCRIPTION
+    Creates the table and the class of BENCHMARK_OBJECT_NAME and records them as a new dynamic object
+        in one action of action, like a "create" task
+        the table of row counts is created first (see DBAction.__verify_row_counts_table__)
+RETURNS
+    class of the dynamic object, SQLAlchemy Table of the dynamic object
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __create_benchmark_object__(action, properties):
+    action.__verify_row_counts_table__()
+    action.__begin_dynamic_action__("create")
+    object_table = action.__create_dynamic_table__(BENCHMARK_OBJECT_NAME.lower(), properties)
+    object_class = action.__create_dynamic_class__(BENCHMARK_OBJECT_NAME)
+    action.__record_dynamic_object__(BENCHMARK_OBJECT_NAME, object_class, object_table, True)
+    action.__end_dynamic_action__()
+    return object_class, object_table
+
+
+"""
+NAME
+    __attach_schema__ - attaches an in-memory database named DB_SCHEMA to a new SQLite connection
+SYNOPSIS
+    __attach_schema__(dbapi_connection, connection_record)
+        dbapi_connection    -> the new DBAPI connection
+        connection_record   -> the pool's record of the connection (sqlalchemy)
+DESCRIPTION
+    Listener of the "connect" event of a SQLite engine - lets tables of schema DB_SCHEMA be created
+RETURNS
+    None
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __attach_schema__(dbapi_connection, connection_record):
+    dbapi_connection.execute("ATTACH DATABASE ':memory:' AS {0}".format(DB_SCHEMA))
+
+
+"""
+NAME
+    __start_workers__ - starts DBWorker instances for a benchmark
+SYNOPSIS
+    __start_workers__(num_of_workers, exit_event, utils, actioner)
+        num_of_workers  -> number of workers to start
+        exit_event      -> Event that tells the workers to exit
+        utils           -> BenchmarkUtils instance
+        actioner        -> object with a create_new_action(db_task) function
+DESCRIPTION
+    Starts num_of_workers DBWorker instances
+RETURNS
+    list of the started DBWorker instances
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __start_workers__(num_of_workers, exit_event, utils, actioner):
+    workers = []
+    for i in range(num_of_workers):
+        worker = DBWorker("BenchmarkWorker{0}".format(i), exit_event, utils, actioner)
+        worker.daemon = True
+        worker.start()
+        workers.append(worker)
+    return workers
+
+
+"""
+NAME
+    __stop_workers__ - stops DBWorker instances started by __start_workers__
+SYNOPSIS
+    __stop_workers__(workers, exit_event, utils)
+        workers         -> list of DBWorker instances
+        exit_event      -> Event that tells the workers to exit
+        utils           -> BenchmarkUtils instance
+DESCRIPTION
+    Sets exit_event, wakes the workers up and waits for them to exit
+RETURNS
+    None
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __stop_workers__(workers, exit_event, utils):
+    exit_event.set()
+    utils.tasks.wake_all()
+    for worker in workers:
+        worker.join(1)
+
+
+if __name__ == "__main__":
+    print "Dispatch latency: {0}".format(benchmark_dispatch_latency())
+    print "Idle CPU: {0:.2f}%".format(benchmark_idle_cpu())
+    print "Task memory: {0}".format(benchmark_task_memory())
+    for workers in [1, 2, 4, 8]:
+        print "Throughput ({0} workers, 1 tracker): {1}".format(workers, benchmark_throughput(workers, 1))
+        print "Throughput ({0} workers, 32 trackers): {1}".format(workers, benchmark_throughput(workers, 32))
+    for rows in [1000, 10000, 100000]:
+        print "Bulk insert ({0} rows): {1}".format(rows, benchmark_bulk_insert(rows))
+    for columns in [3, 50]:
+        print "Select rows ({0} columns): {1}".format(columns, benchmark_select_rows(columns))
+    for rows in [1000, 10000]:
+        print "Alert overhead ({0} rows): {1}".format(rows, benchmark_alert_overhead(rows))
+    print "Statement cache: {0}".format(benchmark_statement_cache())
+    print "Index: {0}".format(benchmark_index())
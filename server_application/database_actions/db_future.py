@@ -0,0 +1,442 @@
+from Queue import Queue, Full, Empty
+from datetime import datetime
+from threading import Event
+from time import time
+
+# max chunks of rows waiting for the reader of a DBStream - the memory of a stream is bounded by this many chunks
+STREAM_MAX_CHUNKS = 4
+
+# max seconds a DBWorker waits for the reader of a DBStream to take a chunk before it gives up
+STREAM_PUT_SECONDS = 10
+
+# max seconds the reader of a DBStream waits for the next chunk once the first chunk arrived
+STREAM_STALL_SECONDS = 60
+
+# seconds between checks of the reader of a DBStream for a stream that ended without room for its end mark
+STREAM_POLL_SECONDS = 0.5
+
+
+class DBTaskTimeout(Exception):
+    """
+    NAME
+        DBTaskTimeout - raised when the result of a DBTask was not ready by its deadline
+    VARIABLES
+        action          -> type of DB action of the task
+        object_name     -> name of dynamic object of the task
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, action, object_name)
+            self            -> the instance of the class
+            action          -> type of DB action of the task
+            object_name     -> name of dynamic object of the task
+    DESCRIPTION
+        The constructor sets up the exception message and variables
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, action, object_name):
+        Exception.__init__(self, "Task '{0}' on '{1}' did not finish in time".format(action, object_name))
+        self.action = action
+        self.object_name = object_name
+
+
+class DBFuture:
+    """
+    NAME
+        DBFuture - a handle to the result of a DBTask performed by a DBWorker
+    VARIABLES
+        action          -> type of DB action of the task
+        object_name     -> name of dynamic object of the task
+        deadline        -> time (in seconds since epoch) after which nobody waits for the result (None - no deadline)
+        done_event      -> Event instance set once the task is done
+        result          -> what the task returned (ex: rows of a select)
+        exception       -> exception the task raised (None if it did not)
+        progress_at     -> datetime the task last made progress while running (None - no progress reported)
+            DBPool does not consider a task stuck while it keeps making progress (ex: a DBStream)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, action, object_name, timeout=None)
+            self            -> the instance of the class
+            action          -> type of DB action of the task
+            object_name     -> name of dynamic object of the task
+            timeout         -> seconds from now until the deadline (default is None - no deadline)
+    DESCRIPTION
+        The constructor sets up a future that is not done yet
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, action, object_name, timeout=None):
+        self.action = action
+        self.object_name = object_name
+        self.deadline = time() + timeout if timeout is not None else None
+        self.done_event = Event()
+        self.result = None
+        self.exception = None
+        self.progress_at = None
+
+    """
+    NAME
+        set_result - marks the task as done
+    SYNOPSIS
+        set_result(self, result)
+            self    -> the instance of the class
+            result  -> what the task returned
+    DESCRIPTION
+        Wakes up every thread waiting for the result
+
+        Does nothing if the future is already done (the first result or exception is kept)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_result(self, result):
+        if self.is_done():
+            return
+        self.result = result
+        self.done_event.set()
+
+    """
+    NAME
+        set_exception - marks the task as failed
+    SYNOPSIS
+        set_exception(self, exception)
+            self        -> the instance of the class
+            exception   -> exception the task raised
+    DESCRIPTION
+        Wakes up every thread waiting for the result - they get the exception instead
+
+        Does nothing if the future is already done (the first result or exception is kept)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_exception(self, exception):
+        if self.is_done():
+            return
+        self.exception = exception
+        self.done_event.set()
+
+    """
+    NAME
+        is_done - checks if the task is done
+    SYNOPSIS
+        is_done(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        A failed task is done too
+    RETURNS
+        True if the task is done
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def is_done(self):
+        return self.done_event.isSet()
+
+    """
+    NAME
+        is_expired - checks if the deadline passed
+    SYNOPSIS
+        is_expired(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        A DBWorker skips a select whose deadline passed - nobody is waiting for its result anymore
+    RETURNS
+        True if there is a deadline and it passed
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def is_expired(self):
+        return self.deadline is not None and time() > self.deadline
+
+    """
+    NAME
+        wait - waits for the task to be done
+    SYNOPSIS
+        wait(self, timeout=None)
+            self    -> the instance of the class
+            timeout -> max seconds to wait (default is None - wait until the deadline, or forever without one)
+    DESCRIPTION
+        Blocks the calling thread until the task is done or the time is up
+
+        For a write (insert, update, delete...), the task is done once its session is committed
+    RETURNS
+        what the task returned
+
+        raises DBTaskTimeout if the task was not done in time (a write is still performed later)
+        raises the exception of the task if it failed
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def wait(self, timeout=None):
+        if timeout is None and self.deadline is not None:
+            timeout = max(self.deadline - time(), 0)
+
+        if timeout is None:
+            self.done_event.wait()
+        elif not self.done_event.wait(timeout):
+            raise DBTaskTimeout(self.action, self.object_name)
+
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+
+class DBStreamCancelled(Exception):
+    """
+    NAME
+        DBStreamCancelled - raised in the DBWorker of a DBStream whose reader went away
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+
+class DBStream(DBFuture):
+    """
+    NAME
+        DBStream - a DBFuture that hands the rows of a "stream" task to the reader chunk by chunk
+    VARIABLES
+        chunks          -> Queue instance of lists of rows (None marks the end) - at most STREAM_MAX_CHUNKS wait
+            a stream that is done once its chunks are read has ended too (the end mark may not have had room)
+        cancelled       -> boolean indicating the reader stopped reading (the DBWorker stops streaming)
+        result          -> number of rows streamed once the task is done
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, action, object_name, timeout=None)
+            self            -> the instance of the class
+            action          -> type of DB action of the task
+            object_name     -> name of dynamic object of the task
+            timeout         -> seconds from now until the deadline of the first chunk (default is None - no deadline)
+    DESCRIPTION
+        The constructor sets up a stream with no chunks yet
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, action, object_name, timeout=None):
+        DBFuture.__init__(self, action, object_name, timeout)
+        self.chunks = Queue(STREAM_MAX_CHUNKS)
+        self.cancelled = False
+
+    """
+    NAME
+        put_chunk - hands a chunk of rows to the reader
+    SYNOPSIS
+        put_chunk(self, rows)
+            self    -> the instance of the class
+            rows    -> list of rows (dictionaries)
+    DESCRIPTION
+        Called by the DBWorker performing the task - blocks while STREAM_MAX_CHUNKS chunks wait for the reader
+            so a slow reader slows the query down instead of piling rows up in memory
+
+        Records progress (see DBFuture.progress_at) before and after waiting
+    RETURNS
+        None
+
+        raises DBStreamCancelled if the reader stopped reading
+        raises DBTaskTimeout if the reader did not take a chunk for STREAM_PUT_SECONDS seconds
+            the stream fails with it (see set_exception) - the reader gets it after the chunks it did not read yet
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def put_chunk(self, rows):
+        self.progress_at = datetime.now()
+        waited = 0.0
+        while not self.cancelled:
+            try:
+                self.chunks.put(rows, True, 1)
+                self.progress_at = datetime.now()
+                return
+            except Full:
+                waited += 1
+                if waited >= STREAM_PUT_SECONDS:
+                    raise DBTaskTimeout(self.action, self.object_name)
+
+        raise DBStreamCancelled("Reader of '{0}' on '{1}' stopped reading".format(self.action, self.object_name))
+
+    """
+    NAME
+        set_result - marks the stream as done
+    SYNOPSIS
+        set_result(self, result)
+            self    -> the instance of the class
+            result  -> number of rows streamed
+    DESCRIPTION
+        Same as DBFuture.set_result - also marks the end of the chunks for the reader
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_result(self, result):
+        if self.is_done():
+            return
+        DBFuture.set_result(self, result)
+        self.__end_chunks__()
+
+    """
+    NAME
+        set_exception - marks the stream as failed
+    SYNOPSIS
+        set_exception(self, exception)
+            self        -> the instance of the class
+            exception   -> exception the task raised
+    DESCRIPTION
+        Same as DBFuture.set_exception - also marks the end of the chunks, the reader gets the exception after them
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_exception(self, exception):
+        if self.is_done():
+            return
+        DBFuture.set_exception(self, exception)
+        self.__end_chunks__()
+
+    """
+    NAME
+        __end_chunks__ - puts the end mark after the last chunk
+    SYNOPSIS
+        __end_chunks__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Never waits - if STREAM_MAX_CHUNKS chunks wait for the reader, the reader finds the end once it read them
+            (see iter_rows) - skipped if the reader stopped reading
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __end_chunks__(self):
+        if self.cancelled:
+            return
+        try:
+            self.chunks.put_nowait(None)
+        except Full:
+            pass
+
+    """
+    NAME
+        cancel - stops the stream from the reader's side
+    SYNOPSIS
+        cancel(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        The DBWorker stops at its next chunk (see put_chunk) - ex: the HTTP client disconnected
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def cancel(self):
+        self.cancelled = True
+
+    """
+    NAME
+        iter_rows - reads the rows of the stream
+    SYNOPSIS
+        iter_rows(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Generator - yields every row as soon as its chunk arrives
+
+        Waits for the first chunk until the deadline, then up to STREAM_STALL_SECONDS seconds for every next chunk
+            checks every STREAM_POLL_SECONDS seconds if the stream ended without its end mark (see __end_chunks__)
+        Closing the generator early cancels the stream (see cancel)
+
+        Never ends quietly before the last row - a stream that failed (ex: the reader was too slow for the DBWorker,
+            see put_chunk) raises its exception once its chunks are read
+    RETURNS
+        rows (dictionaries) one by one
+
+        raises DBTaskTimeout if a chunk did not arrive in time
+        raises the exception of the task if it failed
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def iter_rows(self):
+        wait_until = self.deadline if self.deadline is not None else time() + STREAM_STALL_SECONDS
+        try:
+            while True:
+                try:
+                    rows = self.chunks.get(True, min(max(wait_until - time(), 0), STREAM_POLL_SECONDS))
+                except Empty:
+                    if self.is_done():
+                        break
+                    if time() >= wait_until:
+                        raise DBTaskTimeout(self.action, self.object_name)
+                    continue
+
+                if rows is None:
+                    break
+                wait_until = time() + STREAM_STALL_SECONDS
+                for row in rows:
+                    yield row
+
+            if self.exception is not None:
+                raise self.exception
+        finally:
+            self.cancel()
@@ -0,0 +1,636 @@
+import os
+import json
+from collections import OrderedDict
+from threading import Thread, RLock, Event
+
+from ActMonitor.server_application.database_actions import JOURNAL_PATH, JOURNAL_DURABILITY_WINDOW
+from db_task import get_python_value
+
+# a new segment file is started once the current one is larger than this (in bytes)
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+
+SEGMENT_PREFIX = "segment-"
+
+SEGMENT_SUFFIX = ".log"
+
+CHECKPOINT_FILE_NAME = "checkpoint"
+
+
+class DBJournal(Thread):
+    """
+    NAME
+        DBJournal - a thread class that keeps a durable append-only journal of pushed DBTasks
+    VARIABLES
+        path                -> directory of the journal's segment files and checkpoint file
+        durability_window   -> max seconds between appending a record and fsync-ing it
+        segment_max_bytes   -> size (in bytes) after which a new segment file is started
+        journal_lock        -> RLock instance to make sure the sequence numbers and checkpoint are thread-safe
+            held only briefly - never while writing to or fsync-ing a file
+        io_lock             -> RLock instance to make sure the segment and checkpoint files are written by one thread
+            at a time (taken before journal_lock, never while holding it)
+        exit_event          -> Event instance indicating when the journal should stop flushing
+        segment             -> file object of the segment currently appended to (None until open is called)
+        segment_bytes       -> size (in bytes) of the current segment
+        next_seq            -> sequence number of the next reserved record
+        reserved_records    -> list of the JSON lines of reserved records not written to the segment yet (in order)
+        written_seq         -> sequence number of the last record written to the segment
+        checkpoint_seq      -> every record with a sequence number up to this one is done
+        replayed_seq        -> sequence number of the last record written before open was called
+        saved_checkpoint    -> checkpoint_seq last written to the checkpoint file
+        pending_seqs        -> OrderedDict of the sequence numbers of appended records that are not done yet (in order)
+            bounded by the tasks pending in the DBTaskList and in flight - not by how many records were done since
+            the oldest of them
+        dirty               -> boolean indicating records were written since the last fsync
+        daemon              -> thread variable (default is True) to make sure this thread shuts down with main thread
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    daemon = True
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, path=JOURNAL_PATH, durability_window=JOURNAL_DURABILITY_WINDOW,
+                 segment_max_bytes=SEGMENT_MAX_BYTES)
+            self                -> the instance of the class
+            path                -> directory of the journal (default is JOURNAL_PATH)
+            durability_window   -> max seconds between appending and fsync-ing a record
+                (default is JOURNAL_DURABILITY_WINDOW)
+            segment_max_bytes   -> max size of a segment file (default is SEGMENT_MAX_BYTES)
+    DESCRIPTION
+        The constructor sets up the variables and makes sure the journal directory exists
+
+        Reads the checkpoint and the last segment to know where the journal left off
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, path=JOURNAL_PATH, durability_window=JOURNAL_DURABILITY_WINDOW,
+                 segment_max_bytes=SEGMENT_MAX_BYTES):
+        Thread.__init__(self, name="DBJournal")
+        self.path = path
+        self.durability_window = durability_window
+        self.segment_max_bytes = segment_max_bytes
+        self.journal_lock = RLock()
+        self.io_lock = RLock()
+        self.exit_event = Event()
+        self.segment = None
+        self.segment_bytes = 0
+        self.pending_seqs = OrderedDict()
+        self.reserved_records = []
+        self.dirty = False
+        self.replayed_seq = 0
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        self.saved_checkpoint = self.__read_checkpoint__()
+        self.next_seq = max(self.__find_last_seq__(), self.saved_checkpoint) + 1
+        self.written_seq = self.next_seq - 1
+        self.checkpoint_seq = self.saved_checkpoint
+
+    """
+    NAME
+        run - fsyncs, checkpoints and compacts the journal every durability_window seconds
+    SYNOPSIS
+        run(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        default function called after thread is started
+
+        While exit_event is not set:
+            1. wait durability_window seconds
+            2. call self.flush()
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def run(self):
+        while not self.exit_event.isSet():
+            self.exit_event.wait(max(self.durability_window, 0.001))
+            self.flush()
+
+    """
+    NAME
+        replay - reads the records that were not done by the time the journal was last used
+    SYNOPSIS
+        replay(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Generator - reads the segment files one line at a time so the journal is never loaded to memory at once
+
+        Skips records up to the checkpoint and a partially written last record (crash in the middle of a write)
+
+        Must be called before open - the caller is expected to push the replayed tasks again
+            (they are appended as new records) and then call end_replay
+    RETURNS
+        yields dictionaries of the following format:
+            {
+                "seq": sequence number,
+                "action": action type of the task,
+                "object_name": name of dynamic object of the task,
+                "lane": lane of the task,
+                "args": additional arguments of the task (datetimes, dates and Decimals decoded - see get_python_value)
+            }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def replay(self):
+        return self.__read_records__(self.__list_segments__(), self.saved_checkpoint, self.next_seq)
+
+    """
+    NAME
+        __read_records__ - reads records from segment files
+    SYNOPSIS
+        __read_records__(self, segments, after_seq, before_seq)
+            self        -> the instance of the class
+            segments    -> list of segment file names to read
+            after_seq   -> only records with a higher sequence number are read
+            before_seq  -> only records with a lower sequence number are read
+    DESCRIPTION
+        Generator - reads the segment files one line at a time
+
+        Records appended after replay was called are never read (before_seq) even if they share a segment file
+    RETURNS
+        yields record dictionaries - check replay for the format
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __read_records__(self, segments, after_seq, before_seq):
+        for segment_name in segments:
+            with open(os.path.join(self.path, segment_name), "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line, object_hook=get_python_value)
+                    except ValueError:
+                        continue
+                    if after_seq < record.get("seq") < before_seq:
+                        yield record
+
+    """
+    NAME
+        open - starts a new segment file to append records to
+    SYNOPSIS
+        open(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe
+
+        Records written before open are replayed by the caller and appended again as new records
+            the old records are considered done once end_replay is called
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def open(self):
+        with self.io_lock:
+            with self.journal_lock:
+                self.replayed_seq = self.next_seq - 1
+            self.__start_segment__()
+
+    """
+    NAME
+        end_replay - marks every record written before open as done
+    SYNOPSIS
+        end_replay(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe
+
+        Must be called after the records from replay were pushed again
+            until then the checkpoint does not move so the old segments are not removed while they are read
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def end_replay(self):
+        with self.journal_lock:
+            self.checkpoint_seq = max(self.checkpoint_seq, self.replayed_seq)
+            self.__advance_checkpoint__()
+
+    """
+    NAME
+        append - appends a DBTask to the journal
+    SYNOPSIS
+        append(self, task)
+            self    -> the instance of the class
+            task    -> DBTask instance to append
+    DESCRIPTION
+        This function is thread safe
+
+        Reserves the record of the task (see reserve), then writes it (see write)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def append(self, task):
+        self.reserve(task)
+        self.write()
+
+    """
+    NAME
+        reserve - reserves the record of a DBTask in the journal without writing it
+    SYNOPSIS
+        reserve(self, task)
+            self    -> the instance of the class
+            task    -> DBTask instance to append
+    DESCRIPTION
+        This function is thread safe - cheap enough to call while holding the lock of the DBTaskList
+            (records are reserved in the order tasks are enqueued, and replayed in that order)
+
+        1. encodes the task as one JSON line
+            the task's payload (see DBTask.compact) is used as is - the arguments are not encoded again
+        2. sets task.journal_id to the record's sequence number - the record is pending until complete is called
+        3. keeps the line in reserved_records until it is written - by write, or by the journal thread (see flush)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def reserve(self, task):
+        task.compact()
+        with self.journal_lock:
+            record = "{{\"seq\": {0}, \"action\": {1}, \"object_name\": {2}, \"lane\": {3}, \"args\": {4}}}".format(
+                self.next_seq, json.dumps(task.action), json.dumps(task.object_name), json.dumps(task.lane),
+                task.payload or "{}")
+
+            self.reserved_records.append(record)
+            task.journal_id = self.next_seq
+            self.pending_seqs[self.next_seq] = True
+            self.next_seq += 1
+
+    """
+    NAME
+        write - writes the reserved records to the current segment
+    SYNOPSIS
+        write(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe - must not be called while holding the lock of the DBTaskList
+            only io_lock is held while writing, so pushes and completed tasks never wait for the disk
+
+        1. writes every reserved record, in order of sequence numbers (see __write_reserved__)
+        2. if durability_window is 0, fsync right away - else the journal thread fsyncs within durability_window
+        3. starts a new segment if the current one is larger than segment_max_bytes
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def write(self):
+        with self.io_lock:
+            self.__write_reserved__()
+
+            if self.durability_window <= 0:
+                self.flush()
+
+            if self.segment_bytes > self.segment_max_bytes:
+                self.__start_segment__()
+
+    """
+    NAME
+        __write_reserved__ - writes the reserved records to the current segment
+    SYNOPSIS
+        __write_reserved__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Must be called with io_lock - records are written by one thread at a time, so in order of sequence numbers
+
+        journal_lock is only held to copy the reserved records and to remove them once written
+            if the write fails, the records stay reserved and are written by the next call
+        Does nothing until open is called
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __write_reserved__(self):
+        if self.segment is None:
+            return
+
+        with self.journal_lock:
+            records = list(self.reserved_records)
+        if len(records) == 0:
+            return
+
+        lines = "".join(record + "\n" for record in records)
+        self.segment.write(lines)
+        self.segment_bytes += len(lines)
+        self.written_seq += len(records)
+        self.dirty = True
+
+        with self.journal_lock:
+            del self.reserved_records[:len(records)]
+
+    """
+    NAME
+        complete - marks a journal record as done
+    SYNOPSIS
+        complete(self, seq)
+            self    -> the instance of the class
+            seq     -> sequence number of the record (DBTask.journal_id)
+    DESCRIPTION
+        This function is thread safe
+
+        Records can be done out of order (lanes, shards) - checkpoint_seq only moves up to the highest sequence
+            number such that every record up to it is done (see __advance_checkpoint__)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def complete(self, seq):
+        with self.journal_lock:
+            if seq <= self.checkpoint_seq:
+                return
+
+            self.pending_seqs.pop(seq, None)
+            self.__advance_checkpoint__()
+
+    """
+    NAME
+        __advance_checkpoint__ - moves checkpoint_seq up to the record before the oldest pending record
+    SYNOPSIS
+        __advance_checkpoint__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Must be called with journal_lock
+
+        Records written before open are not pending - checkpoint_seq does not move until end_replay passes them
+        Otherwise, every record before the oldest pending record is done (every record if none is pending)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __advance_checkpoint__(self):
+        if self.checkpoint_seq < self.replayed_seq:
+            return
+
+        if len(self.pending_seqs) > 0:
+            self.checkpoint_seq = max(self.checkpoint_seq, next(iter(self.pending_seqs)) - 1)
+        else:
+            self.checkpoint_seq = max(self.checkpoint_seq, self.next_seq - 1)
+
+    """
+    NAME
+        flush - fsyncs appended records, saves the checkpoint and removes old segments
+    SYNOPSIS
+        flush(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe - holds io_lock, and journal_lock only to read checkpoint_seq
+
+        1. writes the reserved records (see __write_reserved__)
+        2. if records were written since the last fsync, flush and fsync the current segment
+        3. if checkpoint_seq moved, save it to the checkpoint file (write to a temporary file, then rename)
+        4. remove every segment whose records are all up to the checkpoint (except the current segment)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def flush(self):
+        with self.io_lock:
+            if self.segment is None:
+                return
+
+            self.__write_reserved__()
+            if self.dirty:
+                self.segment.flush()
+                os.fsync(self.segment.fileno())
+                self.dirty = False
+
+            with self.journal_lock:
+                checkpoint_seq = self.checkpoint_seq
+            if checkpoint_seq != self.saved_checkpoint:
+                self.__write_checkpoint__(checkpoint_seq)
+                self.saved_checkpoint = checkpoint_seq
+                self.__compact__()
+
+    """
+    NAME
+        close - flushes the journal and stops the journal thread
+    SYNOPSIS
+        close(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe
+
+        Pending records stay in the journal and are replayed next time the journal is used
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def close(self):
+        self.exit_event.set()
+        with self.io_lock:
+            self.flush()
+            if self.segment is not None:
+                self.segment.close()
+                self.segment = None
+
+    """
+    NAME
+        __start_segment__ - closes the current segment and starts a new one
+    SYNOPSIS
+        __start_segment__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Must be called with io_lock
+
+        The new segment file is named after the sequence number of its first record (the record after written_seq)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __start_segment__(self):
+        if self.segment is not None:
+            self.dirty = True
+            self.flush()
+            self.segment.close()
+
+        segment_name = "{0}{1:020d}{2}".format(SEGMENT_PREFIX, self.written_seq + 1, SEGMENT_SUFFIX)
+        self.segment = open(os.path.join(self.path, segment_name), "ab")
+        self.segment_bytes = 0
+
+    """
+    NAME
+        __compact__ - removes segments that only have done records
+    SYNOPSIS
+        __compact__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Must be called with io_lock
+
+        The last record of a segment is the record right before the first record of the next segment
+        The last segment is never removed
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __compact__(self):
+        segments = self.__list_segments__()
+        for segment_name, next_segment_name in zip(segments, segments[1:]):
+            if __segment_first_seq__(next_segment_name) - 1 <= self.saved_checkpoint:
+                os.remove(os.path.join(self.path, segment_name))
+
+    """
+    NAME
+        __list_segments__ - lists the segment files of the journal
+    SYNOPSIS
+        __list_segments__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Lists the segment files in path ordered by the sequence number of their first record
+    RETURNS
+        list of segment file names
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __list_segments__(self):
+        segments = [name for name in os.listdir(self.path)
+                    if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+        return sorted(segments, key=__segment_first_seq__)
+
+    """
+    NAME
+        __find_last_seq__ - finds the sequence number of the last record in the journal
+    SYNOPSIS
+        __find_last_seq__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Only the last segment is read (at most segment_max_bytes)
+    RETURNS
+        sequence number of the last record (0 if the journal is empty)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __find_last_seq__(self):
+        segments = self.__list_segments__()
+        if len(segments) == 0:
+            return 0
+
+        last_seq = __segment_first_seq__(segments[-1]) - 1
+        with open(os.path.join(self.path, segments[-1]), "rb") as f:
+            for line in f:
+                try:
+                    last_seq = max(last_seq, json.loads(line).get("seq"))
+                except ValueError:
+                    continue
+        return last_seq
+
+    """
+    NAME
+        __read_checkpoint__ - reads the checkpoint file
+    SYNOPSIS
+        __read_checkpoint__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Reads the sequence number saved in the checkpoint file
+    RETURNS
+        saved sequence number (0 if there is no checkpoint file)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __read_checkpoint__(self):
+        checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE_NAME)
+        if not os.path.isfile(checkpoint_path):
+            return 0
+
+        with open(checkpoint_path, "r") as f:
+            return int(f.read().strip() or 0)
+
+    """
+    NAME
+        __write_checkpoint__ - saves a checkpoint to the checkpoint file
+    SYNOPSIS
+        __write_checkpoint__(self, seq)
+            self    -> the instance of the class
+            seq     -> sequence number to save
+    DESCRIPTION
+        Writes and fsyncs a temporary file, then renames it over the checkpoint file
+            a crash never leaves a half written checkpoint
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __write_checkpoint__(self, seq):
+        checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE_NAME)
+        temp_path = checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(str(seq))
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(temp_path, checkpoint_path)
+
+
+"""
+NAME
+    __segment_first_seq__ - gets the sequence number of the first record of a segment
+SYNOPSIS
+    __segment_first_seq__(segment_name)
+        segment_name    -> file name of the segment
+DESCRIPTION
+    Segment files are named SEGMENT_PREFIX + first sequence number + SEGMENT_SUFFIX
+RETURNS
+    sequence number
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def __segment_first_seq__(segment_name):
+    return int(segment_name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
@@ -1,19 +1,26 @@
 from datetime import datetime
-from threading import Event
-from time import sleep
+from threading import Event, Thread
+from time import sleep, time
 
+from sqlalchemy import inspect, text, select, union_all, literal, desc, DateTime, String
+from sqlalchemy.sql import table, column
 from sqlalchemy.engine import create_engine
 from sqlalchemy.schema import CreateSchema
 
 from ActMonitor.server_application.database_actions import CONN_URL, DB_SCHEMA, DEFAULT_OBJECT_NAMES, \
     USER_MANAGEMENT_OBJECT_NAME, USER_MANAGEMENT_PROPERTIES, DYNAMIC_API_OBJECT_NAME, DYNAMIC_API_PROPERTIES, \
     ALERT_RULES_OBJECT_NAME, ALERT_RULES_PROPERTIES, ALERT_FINDS_OBJECT_NAME, ALERT_FINDS_PROPERTIES
+from db_action import get_engine_options
 from db_pool import DBPool
 from db_task import DBTask
+from db_future import DBFuture, DBStream
 from db_utils import DBUtils
 
 CACHE_SIZE = 15
 
+# max seconds the query of the recent events cache may run (see DBManager.__create_recent_cache)
+RECENT_CACHE_TIMEOUT = 30
+
 
 class DBManager:
     """
@@ -34,7 +41,7 @@ class DBManager:
         4/25/2016
     """
 
-    utils = DBUtils(create_engine(CONN_URL, echo=False))
+    utils = DBUtils(create_engine(CONN_URL, echo=False, **get_engine_options(CONN_URL)))
     pool_event = Event()
     pool = DBPool(pool_event, utils)
     pool.start()
@@ -49,6 +56,7 @@ class DBManager:
         The constructor verifies all required tables exist along with predefined data (such as master user)
 
         Makes sure recent_cache and object counts are set up and prepared for quick access
+            recent_cache is filled in the background (see __fill_recent_cache) - no dynamic object is loaded
     RETURNS
         None
     AUTHOR
@@ -61,7 +69,8 @@ class DBManager:
         self.__verify_dynamic_api_table_exists()
         self.__verify_users_table_exists()
         self.__verify_alert_tables_exists()
-        self.recent_cache = self.__create_recent_cache()
+        self.recent_cache = []
+        Thread(target=self.__fill_recent_cache, name="RecentCache").start()
         self.__verify_object_counts()
 
     """
@@ -204,6 +213,11 @@ class DBManager:
                 }
         Crop the list to get the latest N events
             N = CACHE_SIZE (global variable)
+
+        One query selects the latest N events of every table (UNION ALL of each table's latest N rows, served by
+            its page index) - the tables are named directly, so stubs are not loaded
+            dynamic objects whose table does not exist are left out, so they cannot fail the query
+            on PostgreSQL, the query may run up to RECENT_CACHE_TIMEOUT seconds
     RETURNS
         List of latest N events
     AUTHOR
@@ -213,26 +227,67 @@ class DBManager:
     """
     def __create_recent_cache(self):
         sleep(3)
-        all_events = []
-        for object_name, object_details in self.utils.dynamic_objects.iteritems():
-            if object_name in DEFAULT_OBJECT_NAMES:
+        existing_tables = set(inspect(self.utils.engine).get_table_names(schema=DB_SCHEMA))
+        latest_selects = []
+        for object_name, object_details in self.utils.dynamic_objects.items():
+            if object_name in DEFAULT_OBJECT_NAMES or object_details.get("table_name") not in existing_tables:
                 continue
 
-            events = self.pool.action.create_new_action((DBTask(action_type="select",
-                                                                object_name=object_name,
-                                                                select_data=["_timestamp_created"],
-                                                                limit=15,
-                                                                sort_by="_timestamp_created",
-                                                                sort_order=False)))
-            for e in events:
-                all_events.append({
-                    "object_name": object_name,
-                    "timestamp": e.get("_timestamp_created")
-                })
+            object_table = table(object_details["table_name"], column("_timestamp_created", DateTime),
+                                 schema=DB_SCHEMA)
+            latest_rows = select([object_table.c._timestamp_created]) \
+                .order_by(desc(object_table.c._timestamp_created)).limit(CACHE_SIZE).alias()
+            latest_selects.append(select([literal(object_name, String).label("object_name"),
+                                          latest_rows.c._timestamp_created]))
+
+        if not latest_selects:
+            return []
 
-        latest_events = sorted(all_events, key=lambda k: k['timestamp'])
-        latest_events.reverse()
-        return latest_events[:CACHE_SIZE]
+        all_events = union_all(*latest_selects).alias()
+        query = select([all_events]).order_by(desc(all_events.c._timestamp_created)).limit(CACHE_SIZE)
+
+        is_postgresql = self.utils.engine.dialect.name == "postgresql"
+        connection = self.utils.engine.connect()
+        try:
+            if is_postgresql:
+                connection.execute(text("SET statement_timeout = {0}".format(RECENT_CACHE_TIMEOUT * 1000)))
+            try:
+                rows = connection.execute(query).fetchall()
+            finally:
+                if is_postgresql:
+                    connection.execute(text("RESET statement_timeout"))
+        finally:
+            connection.close()
+
+        return [{"object_name": str(object_name), "timestamp": timestamp} for object_name, timestamp in rows]
+
+    """
+    NAME
+        __fill_recent_cache - fills recent_cache without holding up start up
+    SYNOPSIS
+        __fill_recent_cache(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Runs in a thread of its own - creates the recent events cache (see __create_recent_cache) and merges it with
+            the events recorded since start up (see create_task)
+        If it fails, print the error - recent_cache keeps only the events recorded since start up
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __fill_recent_cache(self):
+        try:
+            latest_events = self.__create_recent_cache()
+        except Exception as e:
+            self.utils.printer.push("Could not create recent events cache: {0}".format(e))
+            return
+
+        all_events = sorted(self.recent_cache + latest_events, key=lambda k: k['timestamp'])
+        all_events.reverse()
+        self.recent_cache = all_events[:CACHE_SIZE]
 
     """
     NAME
@@ -283,7 +338,8 @@ class DBManager:
             self    -> the instance of the class
             table   -> string name of a table
     DESCRIPTION
-        uses SQLAlchemy inspector to extract table columns
+        uses SQLAlchemy inspector to extract table columns - only the first time (or after the table is created again)
+            they are kept in memory - from a valid snapshot of the table, no query is made (see DBSchemaCache)
     RETURNS
         list of table columns
     AUTHOR
@@ -292,7 +348,11 @@ class DBManager:
         4/25/2016
     """
     def get_columns_in_table(self, table):
-        return self.utils.insp.get_columns(table_name=table, schema=DB_SCHEMA)
+        columns = self.utils.schema.get_columns(table)
+        if columns is None:
+            columns = inspect(self.utils.engine).get_columns(table_name=table, schema=DB_SCHEMA)
+            self.utils.schema.set_columns(table, columns)
+        return columns
 
     """
     NAME
@@ -313,41 +373,124 @@ class DBManager:
         self.utils.printer.push(self.utils.dynamic_objects.keys())
         return self.utils.dynamic_objects.keys()
 
+    """
+    NAME
+        get_queue_stats - gets the depth and wait times of the DBTaskList lanes
+    SYNOPSIS
+        get_queue_stats(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        gets the depth and wait times of every lane in the DBTaskList
+    RETURNS
+        list of lane stats - check DBTaskList.get_lane_stats for the format
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_queue_stats(self):
+        return self.utils.tasks.get_lane_stats()
+
+    """
+    NAME
+        get_pool_stats - gets the size and scaling metrics of the DBPool
+    SYNOPSIS
+        get_pool_stats(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        gets how many workers there are, how busy they are and how the pool scaled so far
+    RETURNS
+        dictionary of pool stats - check DBPool.get_stats for the format
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_pool_stats(self):
+        return self.pool.get_stats()
+
+    """
+    NAME
+        get_count_estimates - gets the estimated row counts of the tables in the DB schema
+    SYNOPSIS
+        get_count_estimates(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Reads the statistics PostgreSQL keeps of every table (pg_class.reltuples, updated by ANALYZE/autovacuum)
+            one cheap query - no table is scanned
+        Meant for dynamic objects whose row count is not known yet (see DBAction.__update_count__)
+        Tables never analyzed are left out - so is every table on other databases
+    RETURNS
+        { table name: estimated number of rows }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_count_estimates(self):
+        if self.utils.engine.dialect.name != "postgresql":
+            return {}
+
+        rows = self.utils.engine.execute(text(
+            "SELECT c.relname, c.reltuples FROM pg_catalog.pg_class c "
+            "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relkind = 'r' AND c.reltuples >= 0"), schema=DB_SCHEMA)
+        return {table_name: int(reltuples) for table_name, reltuples in rows}
+
     """
     NAME
         create_task - creates a new DBTask to execute
     SYNOPSIS
-        create_task(self, action_type, object_name, **kwargs)
+        create_task(self, action_type, object_name, timeout=None, **kwargs)
             self            -> the instance of the class
             action_type     -> type of action to perform on the database
             object_name     -> name of dynamic_object to perform this action on
+            timeout         -> seconds until the deadline of the task (default is None - no deadline)
+                a select still waiting in the DBTaskList by its deadline is skipped
+                for a "stream", the deadline of its first chunk
             **kwargs        -> additional named arguments needed to perform the requested type of action
     DESCRIPTION
         Creates and enqueues a new DBTask instance to the DBTaskList
+            selects (and streams) go to the read lane and are performed by the readers of DBPool
+            an insert is stamped with the time it was created at ("created_at" - seconds since epoch)
+                the timestamps of its rows, even if it waits to be merged with other inserts (see get_insert_times)
 
-        If action_type == "insert":
+        If action_type == "insert" and the DBTaskList accepted the task:
             add action as an event to self.recent_cache
+            if the DBTaskList is full, DBTaskListFull is raised and no event is recorded
     RETURNS
-        None
+        DBFuture instance of the task
+            wait() returns what the task returned (ex: rows of a select) - for a write, once it is committed
+            wait() raises DBTaskTimeout if the deadline passes first
+            an idempotent task (ex: "update_count") already pending for the object is reused with its future
+        for a "stream" - DBStream instance of the task
+            iter_rows() yields the selected rows chunk by chunk as the reader performs it
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    def create_task(self, action_type, object_name, **kwargs):
+    def create_task(self, action_type, object_name, timeout=None, **kwargs):
         # action_type
-        #   create, drop, insert, delete, update, or select
+        #   create, drop, insert, delete, update, select or stream
+        if action_type == "insert":
+            kwargs["created_at"] = time()
+        new_task = DBTask(action_type, object_name, **kwargs)
+        if action_type == "stream":
+            new_task.future = DBStream(new_task.action, new_task.object_name, timeout)
+        else:
+            new_task.future = DBFuture(new_task.action, new_task.object_name, timeout)
+        self.utils.printer.push("Creating new task: {0}".format(new_task))
+        future = self.utils.tasks.push(new_task).future
+
         if action_type == "insert":
             if object_name[0] != "_":
                 self.recent_cache.insert(0, {
-                    "timestamp": datetime.now(),
+                    "timestamp": datetime.fromtimestamp(kwargs["created_at"]),
                     "object_name": object_name
                 })
                 self.recent_cache = self.recent_cache[:CACHE_SIZE]
-
-        new_task = DBTask(action_type, object_name, **kwargs)
-        self.utils.printer.push("Creating new task: {0}".format(new_task))
-        self.utils.tasks.push(new_task)
+        return future
 
     """
     NAME
@@ -1,25 +1,105 @@
 from threading import Thread, Event
-from time import sleep
 from datetime import datetime
+from math import ceil
+from time import time
 
 from db_worker import DBWorker
-from db_action import DBAction
+from db_action import DBAction, get_action_timeout
+from db_task import WRITE_LANES, READ_LANE, STREAM_LANE
 
+# number of DBWorkers performing writes when DBPool starts - DBPool grows and shrinks it (see __scale_workers)
 NUMBER_OF_WORKERS = 3
 
+# fewest DBWorkers performing writes
+MIN_WORKERS = 2
+
+# most DBWorkers performing writes - None means as many as the engine has connections for (see get_max_workers)
+MAX_WORKERS = None
+
+# number of DBWorkers that only perform selects (READ_LANE) - max number of selects running at once
+NUMBER_OF_READERS = 2
+
+# number of DBWorkers that only perform streamed selects (STREAM_LANE) - max number of streams running at once
+#   a stream holds its worker while the client reads, so streams never take the DBWorkers of selects
+NUMBER_OF_STREAM_READERS = 1
+
+# database connections kept for actions performed outside of the DBWorkers (ex: start up)
+RESERVED_CONNECTIONS = 1
+
+# seconds between scaling decisions - busy workers are sampled every STUCK_CHECK_INTERVAL in between
+SCALE_CHECK_INTERVAL = 2
+
+# grow when over this many write tasks are pending per worker, or the oldest waited over SCALE_UP_WAIT_SECONDS,
+#   while at least SCALE_UP_UTILIZATION of the workers are busy
+SCALE_UP_DEPTH_PER_WORKER = 50
+
+SCALE_UP_WAIT_SECONDS = 1
+
+SCALE_UP_UTILIZATION = 0.75
+
+# shrink when no write tasks are pending and less than SCALE_DOWN_UTILIZATION of the workers are busy
+SCALE_DOWN_UTILIZATION = 0.25
+
+# hysteresis - number of scaling decisions in a row that must agree before the pool grows / shrinks
+SCALE_UP_CHECKS = 2
+
+SCALE_DOWN_CHECKS = 15
+
+# seconds after growing or shrinking during which the pool does not scale again
+SCALE_COOLDOWN_SECONDS = 10
+
+STUCK_CHECK_INTERVAL = 0.5
+
+# a worker is stuck once its task ran this many seconds past the statement timeout of the action (see ACTION_TIMEOUTS)
+#   the database should have cancelled the statement by then - DBPool cancels it itself
+STUCK_GRACE_SECONDS = 2
+
+# seconds a stuck worker has to give up its task after its statement was cancelled before DBPool replaces it
+CANCEL_GRACE_SECONDS = 5
+
+# actions that are safe to perform again on a new worker while the stuck worker may still perform them
+#   writes are never retried - they could be performed twice (a retried write is left to the stuck worker)
+SAFE_TO_RETRY_ACTIONS = ["select", "page", "update_count"]
+
 
 class DBPool(Thread):
     """
     NAME
-        DBPool - a thread class that assigns DBWorker instances with tasks from the DBTaskList
+        DBPool - a thread class that manages the DBWorker instances popping tasks from the DBTaskList
     VARIABLES
-        workers         -> list of dictionaries containing DBWorker instances and time last task was assigned
-        workers_stuck   -> list of stuck DBWorkers
+        workers         -> list of DBWorker instances (writers and readers)
+        workers_stuck   -> list of stuck DBWorkers (removed once their thread exits)
+        cancelled       -> dictionary of DBWorker to the datetime its statement was cancelled
+        workers_created -> number of DBWorker instances created so far (used to name them)
         workers_event   -> Event instance that allows the worker to know it's time to exit
         exit_event      -> Event instance indicating when DBPool should exit
         utils           -> DBUtils instance with the general 'global' tools
         daemon          -> thread variable (default is False) indicating this thread does not shut down with main thread
-        action          -> DBAction instance to perform all actions on the database
+        action          -> DBAction instance that loads the dynamic objects
+            every DBWorker gets a DBAction of its own (with its own session) - see __set_up_workers
+        min_workers     -> fewest DBWorkers performing writes
+        max_workers     -> most DBWorkers performing writes
+        scale_stats     -> dictionary of scaling metrics of the following format:
+            {
+                "scale_ups": number of times the pool grew,
+                "scale_downs": number of times the pool shrank,
+                "up_checks": scaling decisions in a row that asked to grow,
+                "down_checks": scaling decisions in a row that asked to shrink,
+                "busy_samples": busy writers sampled since the last scaling decision,
+                "worker_samples": writers sampled since the last scaling decision,
+                "utilization": fraction of busy writers at the last scaling decision,
+                "depth": pending write tasks at the last scaling decision,
+                "oldest_wait_ms": wait of the oldest pending write task at the last scaling decision,
+                "last_check": time (seconds since epoch) of the last scaling decision,
+                "last_scale": time (seconds since epoch) the pool last grew or shrank,
+                "last_scale_reason": description of the last time the pool grew or shrank
+            }
+        stuck_stats     -> dictionary of stuck task metrics of the following format:
+            {
+                "cancelled": number of statements DBPool cancelled,
+                "replaced": number of stuck DBWorkers replaced,
+                "retried": number of stuck tasks handed to a new DBWorker
+            }
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -28,18 +108,23 @@ class DBPool(Thread):
 
     workers = []
     workers_stuck = []
+    workers_created = 0
     workers_event = Event()
 
     """
     NAME
         __init__ - constructor to set the variables for this instance
     SYNOPSIS
-        __init__(self, exit_event, utils)
+        __init__(self, exit_event, utils, min_workers=MIN_WORKERS, max_workers=MAX_WORKERS)
             self            -> the instance of the class
             exit_event      -> Event that indicates when it's time to shut off the thread safely
             utils           -> DBUtils to be used for reaching 'global' tools
+            min_workers     -> fewest DBWorkers performing writes (default is MIN_WORKERS)
+            max_workers     -> most DBWorkers performing writes (default is MAX_WORKERS - see get_max_workers)
     DESCRIPTION
         The constructor sets up the class variables
+
+        max_workers is never more than the engine has connections for, so workers never wait on a connection
     RETURNS
         None
     AUTHOR
@@ -47,7 +132,7 @@ class DBPool(Thread):
     DATE
         4/25/2016
     """
-    def __init__(self, exit_event, utils):
+    def __init__(self, exit_event, utils, min_workers=MIN_WORKERS, max_workers=MAX_WORKERS):
         Thread.__init__(self)
 
         self.daemon = False
@@ -55,37 +140,57 @@ class DBPool(Thread):
         self.exit_event = exit_event
         self.utils = utils
         self.action = DBAction(utils)
+        self.max_workers = get_max_workers(utils.engine, max_workers)
+        self.min_workers = min(min_workers, self.max_workers)
+        self.scale_stats = {
+            "scale_ups": 0,
+            "scale_downs": 0,
+            "up_checks": 0,
+            "down_checks": 0,
+            "busy_samples": 0,
+            "worker_samples": 0,
+            "utilization": 0.0,
+            "depth": 0,
+            "oldest_wait_ms": 0.0,
+            "last_check": time(),
+            "last_scale": 0,
+            "last_scale_reason": None
+        }
+        self.cancelled = {}
+        self.stuck_stats = {
+            "cancelled": 0,
+            "replaced": 0,
+            "retried": 0
+        }
 
     """
     NAME
-        run - waits and dequeues DBTasks from DBTaskList later to assign to a DBWorker
+        run - sets up the DBWorkers and watches them until it's time to exit
     SYNOPSIS
         run(self)
             self -> the instance of the class
     DESCRIPTION
         default function called after thread is started
 
-        sets up N DBWorker instances
-            N = NUMBER_OF_WORKERS (global variable)
-
+        sets up N DBWorker instances that pop from WRITE_LANES
+            N = NUMBER_OF_WORKERS (global variable) - kept between min_workers and max_workers
+        sets up M DBWorker instances that pop from READ_LANE only - selects never wait behind writes
+            M = NUMBER_OF_READERS (global variable)
+        sets up S DBWorker instances that pop from STREAM_LANE only - selects never wait behind slow stream readers
+            S = NUMBER_OF_STREAM_READERS (global variable)
+            each worker pops its own tasks from the DBTaskList (blocking) - a pushed task reaches an idle worker
+                right away without going through this thread
 
         While exit_event is not set:
-            if tasks queue is empty:
-                1. sleep 150 milliseconds
-                2. verify no workers are stuck
-            else:
-                1. dequeue the first task in the list (FIFO algorithm)
-                2. attempt to assign the task to a worker
-                    if found an available worker:
-                        1. assign task to worker
-                        2. record the tme task was assigned
-                    else:
-                        1. sleep 50 milliseconds
-                        2. verify no workers are stuck
+            1. wait on exit_event for up to STUCK_CHECK_INTERVAL seconds
+            2. verify no busy workers are stuck - forget stuck workers that exited
+            3. replace stuck writers that were not replaced (see __replace_missing_writers)
+            4. grow or shrink the writers (see __scale_workers)
 
         Once exit_event is set:
             1. set workers_event - tell DBWorkers to exit safely
-            2. stop thread
+            2. wake up all DBWorkers waiting for a task so they notice workers_event
+            3. stop thread
     RETURNS
         None
     AUTHOR
@@ -94,58 +199,43 @@ class DBPool(Thread):
         4/25/2016
     """
     def run(self):
-        self.__set_up_workers(NUMBER_OF_WORKERS)
-
-        while True:
-            if self.exit_event.isSet():
-                self.utils.printer.push("DBPool is exiting now.")
-                self.workers_event.set()
-                break
-
-            if self.utils.tasks.get_size() == 0:
-                sleep(0.15)
-                for worker in self.workers:
-                    if not worker.get("thread").__is_available__():
-                        self.__is_worker_stuck(worker)
-            else:
-                task_to_assign = self.utils.tasks.pop()
-
-                if task_to_assign is None:
-                    continue
-
-                task_assigned = False
-                while not task_assigned:
-                    for worker in self.workers:
-                        if worker.get("thread").add_task(task_to_assign):
-                            task_assigned = True
-                            worker["time_assigned"] = datetime.now()
-                            break
-                        else:
-                            if not worker.get("thread").__is_available__():
-                                self.__is_worker_stuck(worker)
-                    if not task_assigned:
-                        sleep(0.05)
+        self.__set_up_workers(min(max(NUMBER_OF_WORKERS, self.min_workers), self.max_workers), WRITE_LANES)
+        self.__set_up_workers(NUMBER_OF_READERS, [READ_LANE])
+        self.__set_up_workers(NUMBER_OF_STREAM_READERS, [STREAM_LANE])
+
+        while not self.exit_event.isSet():
+            self.exit_event.wait(STUCK_CHECK_INTERVAL)
+            for worker in list(self.workers):
+                if not worker.__is_available__():
+                    self.__is_worker_stuck(worker)
+            self.workers_stuck = [worker for worker in self.workers_stuck if worker.is_alive()]
+            self.__replace_missing_writers()
+            self.__scale_workers()
+
+        self.utils.printer.push("DBPool is exiting now.")
+        self.workers_event.set()
+        self.utils.tasks.wake_all()
 
     """
     NAME
         __set_up_workers - creates DBWorker instances for this class to manage
     SYNOPSIS
-        __set_up_workers(self, num_of_workers)
+        __set_up_workers(self, num_of_workers, lane_names, first_task=None)
             self            -> the instance of the class
             num_of_workers  -> the number of workers to create
+            lane_names      -> list of names of DBTaskList lanes the workers pop from
+            first_task      -> DBTask to hand to the first new worker before it starts (default is None)
     DESCRIPTION
         creates N additional workers for this class to manage
             N = num_of_workers
             * additional - does not overwrite or interfere with any existing workers
 
         for i in num_of_workers:
-            1. set up DBWorker instance
-            2. create dictionary with the following format:
-                {
-                    "thread": DBWorker Instance,
-                    "time_assigned": None
-                }
-            3. add dictionary to self.workers (list of managed workers)
+            1. set up DBWorker instance with a DBAction of its own
+                workers never share a session, so one worker never commits (or rolls back) the work of another
+                if first_task is given, the first worker is assigned first_task before it starts popping tasks
+            2. start the DBWorker
+            3. add DBWorker to self.workers (list of managed workers)
     RETURNS
         None
     AUTHOR
@@ -153,16 +243,17 @@ class DBPool(Thread):
     DATE
         4/25/2016
     """
-    def __set_up_workers(self, num_of_workers):
+    def __set_up_workers(self, num_of_workers, lane_names, first_task=None):
         for i in range(num_of_workers):
-            worker_name = "DBWorker{0}".format(len(self.workers))
-            worker = DBWorker(worker_name, self.workers_event, self.utils, self.action)
+            worker_name = "DBWorker{0}".format(self.workers_created)
+            self.workers_created += 1
+            worker = DBWorker(worker_name, self.workers_event, self.utils, DBAction(self.utils, load_objects=False),
+                              lane_names)
+            if first_task is not None and i == 0:
+                worker.add_task(first_task)
             worker.start()
 
-            self.workers.append({
-                "thread": worker,
-                "time_assigned": None
-            })
+            self.workers.append(worker)
 
     """
     NAME
@@ -172,11 +263,20 @@ class DBPool(Thread):
             self            -> the instance of the class
             stuck_worker    -> a potentially stuck worker
     DESCRIPTION
-        if stuck_worker has worked on the assigned task for over 3 seconds:
-            1. add stuck_worker to the list of stuck_workers
-            2. remove stuck_worker from the list of manage workers
-            3. create a new worker (I'll refer to it as new_worker)
-            4. assign the task from stuck_worker to new_worker
+        A worker is stuck once it has worked on the assigned task for over the statement timeout of the action
+            (see get_action_timeout) + STUCK_GRACE_SECONDS seconds
+            counted from the last progress of the task if it reports any (ex: a chunk of a DBStream)
+
+        1. cancel the statement of stuck_worker on the database (see DBAction.cancel_backend of its actioner)
+            the task fails in stuck_worker, which rolls back and moves on - no thread is left behind
+        2. if stuck_worker is still on the same task CANCEL_GRACE_SECONDS seconds later:
+            1. remove stuck_worker from the list of managed workers and add it to the list of stuck workers
+            2. retire stuck_worker - it exits once the stuck task is done instead of popping more tasks
+                it keeps the lease of the shard of the task, so no later task of the same object overtakes it
+            3. create a new worker of the same lanes (I'll refer to it as new_worker)
+                only if the managed and stuck writers are fewer than max_workers - stuck threads hold connections too
+            4. assign the task from stuck_worker to new_worker only if it is safe to retry (SAFE_TO_RETRY_ACTIONS)
+                and, for a select, somebody is still waiting for the result
     RETURNS
         None
     AUTHOR
@@ -185,13 +285,323 @@ class DBPool(Thread):
         4/25/2016
     """
     def __is_worker_stuck(self, stuck_worker):
-        if (datetime.now() - stuck_worker.get("time_assigned")).total_seconds() > 3:
-            self.workers_stuck.append(stuck_worker)
-            self.workers.remove(stuck_worker)
-            self.__set_up_workers(1)
+        with stuck_worker.current_task_lock:
+            stuck_task = stuck_worker.current_task
+            time_assigned = stuck_worker.time_assigned
+            if stuck_task is None:
+                return
+            if stuck_task.future is not None and stuck_task.future.progress_at is not None:
+                time_assigned = max(time_assigned, stuck_task.future.progress_at)
+            stuck_seconds = (datetime.now() - time_assigned).total_seconds()
+            if stuck_seconds <= get_action_timeout(stuck_task.action) + STUCK_GRACE_SECONDS:
+                return
+
+            cancelled_at = self.cancelled.get(stuck_worker)
+            if cancelled_at is None or cancelled_at < time_assigned:
+                self.cancelled[stuck_worker] = datetime.now()
+                self.__cancel_task(stuck_worker, stuck_task, stuck_seconds)
+                return
+            if (datetime.now() - cancelled_at).total_seconds() <= CANCEL_GRACE_SECONDS:
+                return
+            stuck_worker.retire()
+
+        self.cancelled.pop(stuck_worker, None)
+        self.workers_stuck.append(stuck_worker)
+        self.workers.remove(stuck_worker)
+        self.stuck_stats["replaced"] += 1
+        self.utils.printer.push("Removed Stuck Worker - {0}".format(stuck_worker.name))
+
+        if stuck_worker.lane_names == WRITE_LANES:
+            stuck_writers = [worker for worker in self.workers_stuck if worker.lane_names == WRITE_LANES]
+            if len(self.__get_writers()) + len(stuck_writers) >= self.max_workers:
+                self.utils.printer.push("Not replacing {0} - stuck workers hold the connections"
+                                        .format(stuck_worker.name))
+                return
+
+        first_task = None
+        if stuck_task.action in SAFE_TO_RETRY_ACTIONS and \
+                not (stuck_task.future is not None and stuck_task.future.is_expired()):
+            first_task = stuck_task
+            self.stuck_stats["retried"] += 1
+        else:
+            self.utils.printer.push("Not retrying '{0}' on '{1}' - left to {2}"
+                                    .format(stuck_task.action, stuck_task.object_name, stuck_worker.name))
+        self.__set_up_workers(1, stuck_worker.lane_names, first_task=first_task)
+
+    """
+    NAME
+        __cancel_task - cancels the statement a stuck worker is running
+    SYNOPSIS
+        __cancel_task(self, stuck_worker, stuck_task, stuck_seconds)
+            self            -> the instance of the class
+            stuck_worker    -> the stuck worker
+            stuck_task      -> the task stuck_worker is performing
+            stuck_seconds   -> seconds stuck_worker has worked on stuck_task
+    DESCRIPTION
+        Asks the database to cancel the statement of stuck_worker and prints the outcome
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __cancel_task(self, stuck_worker, stuck_task, stuck_seconds):
+        try:
+            cancelled = stuck_worker.actioner.cancel_backend()
+        except Exception as e:
+            self.utils.printer.push("Failed to cancel '{0}' on '{1}' of {2} - {3}"
+                                    .format(stuck_task.action, stuck_task.object_name, stuck_worker.name, e))
+            return
+
+        if cancelled:
+            self.stuck_stats["cancelled"] += 1
+        self.utils.printer.push("{0} '{1}' on '{2}' of {3} after {4:.1f} seconds"
+                                .format("Cancelled" if cancelled else "Could not cancel", stuck_task.action,
+                                        stuck_task.object_name, stuck_worker.name, stuck_seconds))
+
+    """
+    NAME
+        __replace_missing_writers - brings the writers back up to min_workers
+    SYNOPSIS
+        __replace_missing_writers(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        A stuck writer is not replaced while stuck workers hold the connections (see __is_worker_stuck)
+            once they exit, new writers take their place - never more than max_workers with the stuck writers
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __replace_missing_writers(self):
+        writers = len(self.__get_writers())
+        stuck_writers = len([worker for worker in self.workers_stuck if worker.lane_names == WRITE_LANES])
+        missing_writers = min(self.min_workers - writers, self.max_workers - writers - stuck_writers)
+        if missing_writers > 0:
+            self.__set_up_workers(missing_writers, WRITE_LANES)
+
+    """
+    NAME
+        __get_writers - gets the DBWorkers performing writes
+    SYNOPSIS
+        __get_writers(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Writers are the managed workers popping from WRITE_LANES (readers are not scaled)
+    RETURNS
+        list of DBWorker instances
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_writers(self):
+        return [worker for worker in self.workers if worker.lane_names == WRITE_LANES]
+
+    """
+    NAME
+        __scale_workers - grows or shrinks the writers based on the load of the DBTaskList
+    SYNOPSIS
+        __scale_workers(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Called every STUCK_CHECK_INTERVAL seconds - samples how many writers are busy
+
+        Every SCALE_CHECK_INTERVAL seconds, makes a scaling decision:
+            1. utilization = busy writers / writers (average of the samples)
+            2. depth, oldest wait = pending tasks of WRITE_LANES, wait of the oldest of them
+            3. asks to grow if (depth > SCALE_UP_DEPTH_PER_WORKER per writer OR oldest wait > SCALE_UP_WAIT_SECONDS)
+                AND utilization >= SCALE_UP_UTILIZATION
+            4. asks to shrink if depth == 0 AND utilization < SCALE_DOWN_UTILIZATION
+            5. hysteresis - grows once SCALE_UP_CHECKS decisions in a row asked to grow, shrinks once
+                SCALE_DOWN_CHECKS decisions in a row asked to shrink, and never within SCALE_COOLDOWN_SECONDS
+                of the last time it grew or shrank
+
+        Grows by enough writers to bring the depth under SCALE_UP_DEPTH_PER_WORKER per writer (up to max_workers)
+        Shrinks by retiring 1 idle writer (down to min_workers)
+
+        Every change is printed and counted in scale_stats (see get_stats)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __scale_workers(self):
+        writers = self.__get_writers()
+        stats = self.scale_stats
+        stats["busy_samples"] += len([worker for worker in writers if not worker.__is_available__()])
+        stats["worker_samples"] += len(writers)
+
+        now = time()
+        if now - stats["last_check"] < SCALE_CHECK_INTERVAL:
+            return
+
+        depth = 0
+        oldest_wait_ms = 0.0
+        for lane_stats in self.utils.tasks.get_lane_stats():
+            if lane_stats.get("name") in WRITE_LANES:
+                depth += lane_stats.get("depth")
+                oldest_wait_ms = max(oldest_wait_ms, lane_stats.get("oldest_wait_ms"))
+
+        utilization = 0.0
+        if stats["worker_samples"] > 0:
+            utilization = float(stats["busy_samples"]) / stats["worker_samples"]
+
+        stats["utilization"] = utilization
+        stats["depth"] = depth
+        stats["oldest_wait_ms"] = oldest_wait_ms
+        stats["last_check"] = now
+        stats["busy_samples"] = 0
+        stats["worker_samples"] = 0
+
+        backlogged = depth > SCALE_UP_DEPTH_PER_WORKER * len(writers) or oldest_wait_ms > SCALE_UP_WAIT_SECONDS * 1000
+        if backlogged and utilization >= SCALE_UP_UTILIZATION and len(writers) < self.max_workers:
+            stats["up_checks"] += 1
+            stats["down_checks"] = 0
+        elif depth == 0 and utilization < SCALE_DOWN_UTILIZATION and len(writers) > self.min_workers:
+            stats["down_checks"] += 1
+            stats["up_checks"] = 0
+        else:
+            stats["up_checks"] = 0
+            stats["down_checks"] = 0
+            return
+
+        if now - stats["last_scale"] < SCALE_COOLDOWN_SECONDS:
+            return
+
+        reason = "depth={0}, oldest_wait_ms={1:.1f}, utilization={2:.2f}".format(depth, oldest_wait_ms, utilization)
+        if stats["up_checks"] >= SCALE_UP_CHECKS:
+            wanted = int(ceil(depth / float(SCALE_UP_DEPTH_PER_WORKER)))
+            new_workers = min(max(wanted - len(writers), 1), self.max_workers - len(writers))
+            self.__set_up_workers(new_workers, WRITE_LANES)
+            stats["scale_ups"] += 1
+            self.__record_scale("DBPool grew from {0} to {1} writers ({2})"
+                                .format(len(writers), len(writers) + new_workers, reason), now)
+
+        elif stats["down_checks"] >= SCALE_DOWN_CHECKS:
+            idle_writers = [worker for worker in writers if worker.__is_available__()]
+            if len(idle_writers) == 0:
+                return
+
+            retired_worker = idle_writers[-1]
+            retired_worker.retire()
+            self.workers.remove(retired_worker)
+            self.cancelled.pop(retired_worker, None)
+            self.utils.tasks.wake_all()
+            stats["scale_downs"] += 1
+            self.__record_scale("DBPool shrank from {0} to {1} writers ({2})"
+                                .format(len(writers), len(writers) - 1, reason), now)
+
+    """
+    NAME
+        __record_scale - records that the pool grew or shrank
+    SYNOPSIS
+        __record_scale(self, reason, now)
+            self    -> the instance of the class
+            reason  -> string describing the change
+            now     -> time (in seconds since epoch) of the change
+    DESCRIPTION
+        Prints reason and restarts the hysteresis and cooldown
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __record_scale(self, reason, now):
+        self.scale_stats["last_scale"] = now
+        self.scale_stats["last_scale_reason"] = reason
+        self.scale_stats["up_checks"] = 0
+        self.scale_stats["down_checks"] = 0
+        self.utils.printer.push(reason)
+
+    """
+    NAME
+        get_stats - gets the size and scaling metrics of the pool
+    SYNOPSIS
+        get_stats(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Gathers how many workers there are, how many are busy and how the pool scaled so far
+    RETURNS
+        {
+            "writers": number of DBWorkers performing writes,
+            "busy_writers": number of writers currently performing a task,
+            "readers": number of DBWorkers performing selects and pages,
+            "stream_readers": number of DBWorkers performing streamed selects,
+            "stuck": number of stuck DBWorkers,
+            "cancelled": number of statements DBPool cancelled,
+            "replaced": number of stuck DBWorkers replaced,
+            "retried": number of stuck tasks handed to a new DBWorker,
+            "min_workers": fewest writers,
+            "max_workers": most writers,
+            "utilization": fraction of busy writers at the last scaling decision,
+            "depth": pending write tasks at the last scaling decision,
+            "oldest_wait_ms": wait of the oldest pending write task at the last scaling decision,
+            "scale_ups": number of times the pool grew,
+            "scale_downs": number of times the pool shrank,
+            "last_scale_reason": description of the last time the pool grew or shrank
+        }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_stats(self):
+        writers = self.__get_writers()
+        return {
+            "writers": len(writers),
+            "busy_writers": len([worker for worker in writers if not worker.__is_available__()]),
+            "readers": len([worker for worker in self.workers if worker.lane_names == [READ_LANE]]),
+            "stream_readers": len([worker for worker in self.workers if worker.lane_names == [STREAM_LANE]]),
+            "stuck": len(self.workers_stuck),
+            "cancelled": self.stuck_stats["cancelled"],
+            "replaced": self.stuck_stats["replaced"],
+            "retried": self.stuck_stats["retried"],
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "utilization": self.scale_stats["utilization"],
+            "depth": self.scale_stats["depth"],
+            "oldest_wait_ms": self.scale_stats["oldest_wait_ms"],
+            "scale_ups": self.scale_stats["scale_ups"],
+            "scale_downs": self.scale_stats["scale_downs"],
+            "last_scale_reason": self.scale_stats["last_scale_reason"]
+        }
+
+
+"""
+NAME
+    get_max_workers - gets the most DBWorkers performing writes the engine has connections for
+SYNOPSIS
+    get_max_workers(engine, max_workers=None)
+        engine          -> Engine instance (sqlalchemy)
+        max_workers     -> configured max (default is None - no configured max)
+DESCRIPTION
+    Every DBWorker holds a connection while it performs a task
+        connections = pool size + max overflow of the engine's pool (QueuePool)
+        writers = connections - NUMBER_OF_READERS - NUMBER_OF_STREAM_READERS - RESERVED_CONNECTIONS
 
-            stuck_task = stuck_worker["thread"].current_task
-            self.workers[-1]["thread"].add_task(stuck_task)
-            self.workers[-1]["time_assigned"] = datetime.now()
+    If the engine's pool has no size (ex: NullPool), max_workers is used as is
+RETURNS
+    max number of writers (at least 1)
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_max_workers(engine, max_workers=None):
+    pool = engine.pool
+    if not hasattr(pool, "size"):
+        return max(max_workers or NUMBER_OF_WORKERS, 1)
 
-            self.utils.printer.push("Removed Stuck Worker - {0}".format(stuck_worker["thread"].name))
\ No newline at end of file
+    connections = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    connection_workers = connections - NUMBER_OF_READERS - NUMBER_OF_STREAM_READERS - RESERVED_CONNECTIONS
+    if max_workers is not None:
+        connection_workers = min(connection_workers, max_workers)
+    return max(connection_workers, 1)
@@ -0,0 +1,378 @@
+import os
+import cPickle
+from hashlib import md5
+from threading import RLock
+
+import sqlalchemy
+from sqlalchemy import MetaData, text
+
+from ActMonitor.server_application.database_actions import DATA_PATH
+
+# directory of the snapshots of reflected tables (see DBSchemaCache)
+SCHEMA_CACHE_PATH = os.path.join(DATA_PATH, "schema_cache")
+
+# version of the format of the snapshot files - snapshots of another version are not used (and are replaced)
+SCHEMA_CACHE_VERSION = 1
+
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# fingerprint of every table in a schema of PostgreSQL - its columns (types, defaults), indexes and constraints
+#   one query of the catalog, no table is read
+POSTGRESQL_FINGERPRINT_QUERY = """
+SELECT c.relname, md5(c.oid::text
+    || ':' || string_agg(a.attname || ' ' || format_type(a.atttypid, a.atttypmod) || ' ' || a.attnotnull::text
+                         || ' ' || coalesce(pg_get_expr(d.adbin, d.adrelid), ''), ',' ORDER BY a.attnum)
+    || ':' || (SELECT coalesce(string_agg(pg_get_indexdef(x.indexrelid), ',' ORDER BY x.indexrelid), '')
+               FROM pg_catalog.pg_index x WHERE x.indrelid = c.oid)
+    || ':' || (SELECT coalesce(string_agg(pg_get_constraintdef(con.oid), ',' ORDER BY con.conname), '')
+               FROM pg_catalog.pg_constraint con WHERE con.conrelid = c.oid))
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+WHERE n.nspname = :schema AND c.relkind = 'r' AND (:table_name IS NULL OR c.relname = :table_name)
+GROUP BY c.oid, c.relname
+"""
+
+
+class DBSchemaCache:
+    """
+    NAME
+        DBSchemaCache - snapshots of reflected tables on disk and columns of tables in memory
+    VARIABLES
+        path            -> directory of the snapshot files - one file per table
+            a snapshot is the reflected SQLAlchemy Table with the fingerprint it was reflected at
+        fingerprints    -> dictionary of the current fingerprint of every table in the schema (None until loaded)
+            a snapshot is used only if its fingerprint is the current one - else, the table is reflected again
+        columns         -> dictionary of the columns of tables (same format as Inspector.get_columns)
+        lock            -> RLock instance guarding fingerprints, columns and the snapshot files
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, path=SCHEMA_CACHE_PATH)
+            self    -> the instance of the class
+            path    -> directory of the snapshot files (default is SCHEMA_CACHE_PATH)
+    DESCRIPTION
+        The constructor sets up an empty cache - no snapshot is used until load_fingerprints
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, path=SCHEMA_CACHE_PATH):
+        self.path = path
+        self.fingerprints = None
+        self.columns = {}
+        self.lock = RLock()
+
+    """
+    NAME
+        load_fingerprints - gets the current fingerprint of every table in a schema
+    SYNOPSIS
+        load_fingerprints(self, engine, schema)
+            self    -> the instance of the class
+            engine  -> SQLAlchemy Engine of the database
+            schema  -> string name of the schema
+    DESCRIPTION
+        Called on start up, before any table is loaded (see get_schema_fingerprints)
+        If the database has no fingerprints (see get_schema_fingerprints), snapshots are not used
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def load_fingerprints(self, engine, schema):
+        fingerprints = get_schema_fingerprints(engine, schema)
+        with self.lock:
+            self.fingerprints = fingerprints
+
+    """
+    NAME
+        get_table - gets a table from its snapshot
+    SYNOPSIS
+        get_table(self, table_name, metadata)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+            metadata    -> SQLAlchemy MetaData to add the table to
+    DESCRIPTION
+        Uses the snapshot only if it is of SCHEMA_CACHE_VERSION, of the installed SQLAlchemy version and of the
+            current fingerprint of the table - the table did not change since it was reflected
+        The caller holds the lock of metadata (adds the table to it)
+    RETURNS
+        SQLAlchemy Table (in metadata) - None if there is no snapshot to use
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_table(self, table_name, metadata):
+        snapshot = self.__read_snapshot__(table_name)
+        if snapshot is None:
+            return None
+
+        snapshot_table = snapshot["metadata"].tables[snapshot["table_key"]]
+        existing_table = metadata.tables.get(snapshot["table_key"])
+        if existing_table is not None:
+            return existing_table
+        return snapshot_table.tometadata(metadata)
+
+    """
+    NAME
+        put_table - saves the snapshot of a reflected table
+    SYNOPSIS
+        put_table(self, engine, table)
+            self    -> the instance of the class
+            engine  -> SQLAlchemy Engine of the database
+            table   -> reflected SQLAlchemy Table (ex: just reflected on its first use)
+    DESCRIPTION
+        Gets the current fingerprint of the table (one query of the catalog) and saves it with the table
+            the file is written to a temporary file and renamed, so a crash never leaves a half written snapshot
+
+        Does nothing if the database has no fingerprints
+        If saving fails (ex: the directory is not writable), the next start up reflects the table again
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def put_table(self, engine, table):
+        fingerprint = get_schema_fingerprints(engine, table.schema, table.name)
+        if fingerprint is None or table.name not in fingerprint:
+            return
+
+        snapshot_metadata = MetaData()
+        table.tometadata(snapshot_metadata)
+        snapshot = {
+            "version": SCHEMA_CACHE_VERSION,
+            "sqlalchemy": sqlalchemy.__version__,
+            "fingerprint": fingerprint[table.name],
+            "table_key": table.key,
+            "metadata": snapshot_metadata
+        }
+
+        with self.lock:
+            if self.fingerprints is not None:
+                self.fingerprints[table.name] = fingerprint[table.name]
+            try:
+                if not os.path.isdir(self.path):
+                    os.makedirs(self.path)
+                snapshot_path = self.__get_snapshot_path__(table.name)
+                temp_path = snapshot_path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    cPickle.dump(snapshot, f, cPickle.HIGHEST_PROTOCOL)
+                os.rename(temp_path, snapshot_path)
+            except (IOError, OSError, cPickle.PicklingError):
+                pass
+
+    """
+    NAME
+        get_columns - gets the columns of a table without a query
+    SYNOPSIS
+        get_columns(self, table_name)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+    DESCRIPTION
+        Columns set by set_columns - else, the columns of the snapshot of the table (if it can be used)
+    RETURNS
+        list of columns (same format as Inspector.get_columns) - None if they are not known
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_columns(self, table_name):
+        with self.lock:
+            columns = self.columns.get(table_name)
+        if columns is not None:
+            return columns
+
+        snapshot = self.__read_snapshot__(table_name)
+        if snapshot is None:
+            return None
+
+        columns = [get_column_info(column) for column in snapshot["metadata"].tables[snapshot["table_key"]].c]
+        self.set_columns(table_name, columns)
+        return columns
+
+    """
+    NAME
+        set_columns - keeps the columns of a table in memory
+    SYNOPSIS
+        set_columns(self, table_name, columns)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+            columns     -> list of columns (same format as Inspector.get_columns)
+    DESCRIPTION
+        Kept until the table is dropped or created (see forget)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def set_columns(self, table_name, columns):
+        with self.lock:
+            self.columns[table_name] = columns
+
+    """
+    NAME
+        forget - drops everything known of a table
+    SYNOPSIS
+        forget(self, table_name)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+    DESCRIPTION
+        Called when the table is dropped or created - its columns, fingerprint and snapshot file are removed
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def forget(self, table_name):
+        with self.lock:
+            self.columns.pop(table_name, None)
+            if self.fingerprints is not None:
+                self.fingerprints.pop(table_name, None)
+            try:
+                os.remove(self.__get_snapshot_path__(table_name))
+            except OSError:
+                pass
+
+    """
+    NAME
+        __read_snapshot__ - reads the snapshot of a table if it can be used
+    SYNOPSIS
+        __read_snapshot__(self, table_name)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+    DESCRIPTION
+        A snapshot can be used if it is of SCHEMA_CACHE_VERSION, of the installed SQLAlchemy version and its
+            fingerprint is the current fingerprint of the table (see load_fingerprints)
+        A missing or unreadable snapshot file cannot be used
+    RETURNS
+        dictionary of the snapshot - None if it cannot be used
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __read_snapshot__(self, table_name):
+        with self.lock:
+            if self.fingerprints is None or table_name not in self.fingerprints:
+                return None
+            fingerprint = self.fingerprints[table_name]
+
+        try:
+            with open(self.__get_snapshot_path__(table_name), "rb") as f:
+                snapshot = cPickle.load(f)
+        except Exception:
+            return None
+
+        if snapshot.get("version") != SCHEMA_CACHE_VERSION or snapshot.get("sqlalchemy") != sqlalchemy.__version__ \
+                or snapshot.get("fingerprint") != fingerprint:
+            return None
+        return snapshot
+
+    """
+    NAME
+        __get_snapshot_path__ - gets the path of the snapshot file of a table
+    SYNOPSIS
+        __get_snapshot_path__(self, table_name)
+            self        -> the instance of the class
+            table_name  -> string name of the table
+    DESCRIPTION
+        The file is named by the MD5 of the table name - any table name makes a valid file name
+    RETURNS
+        string path of the snapshot file
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_snapshot_path__(self, table_name):
+        return os.path.join(self.path, md5(table_name.encode("utf-8")).hexdigest() + SNAPSHOT_SUFFIX)
+
+
+"""
+NAME
+    get_schema_fingerprints - gets the fingerprints of the tables in a schema
+SYNOPSIS
+    get_schema_fingerprints(engine, schema, table_name=None)
+        engine      -> SQLAlchemy Engine of the database
+        schema      -> string name of the schema
+        table_name  -> string name of the only table to get the fingerprint of (default is None - all tables)
+DESCRIPTION
+    A fingerprint changes whenever the table changes - its columns, indexes or constraints (or it is dropped and
+        created again)
+
+    PostgreSQL - one query of the catalog (see POSTGRESQL_FINGERPRINT_QUERY)
+    SQLite - the MD5 of the CREATE statements of the table and its indexes (sqlite_master of the schema)
+    Other databases have no fingerprints
+RETURNS
+    { table name: fingerprint } - None if the database has no fingerprints
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_schema_fingerprints(engine, schema, table_name=None):
+    if engine.dialect.name == "postgresql":
+        rows = engine.execute(text(POSTGRESQL_FINGERPRINT_QUERY), schema=schema, table_name=table_name)
+        return {str(row[0]): str(row[1]) for row in rows}
+
+    if engine.dialect.name == "sqlite":
+        rows = engine.execute(text("SELECT tbl_name, sql FROM {0}.sqlite_master WHERE sql IS NOT NULL "
+                                   "AND (:table_name IS NULL OR tbl_name = :table_name) ORDER BY tbl_name, name"
+                                   .format(schema)), table_name=table_name)
+        fingerprints = {}
+        for row_table_name, sql in rows:
+            fingerprints.setdefault(str(row_table_name), md5()).update(sql.encode("utf-8"))
+        return {row_table_name: digest.hexdigest() for row_table_name, digest in fingerprints.iteritems()}
+
+    return None
+
+
+"""
+NAME
+    get_column_info - describes a column like Inspector.get_columns
+SYNOPSIS
+    get_column_info(column)
+        column  -> SQLAlchemy Column of a reflected table
+DESCRIPTION
+    The server default is given as SQL text (as reflected)
+RETURNS
+    { "name": column name, "type": column type, "nullable": bool, "default": SQL text of default (or None),
+        "autoincrement": autoincrement of the column }
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_column_info(column):
+    default = None
+    if column.server_default is not None:
+        default = getattr(column.server_default.arg, "text", column.server_default.arg)
+
+    return {
+        "name": column.name,
+        "type": column.type,
+        "nullable": column.nullable,
+        "default": default,
+        "autoincrement": column.autoincrement
+    }
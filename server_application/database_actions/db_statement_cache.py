@@ -0,0 +1,254 @@
+from collections import OrderedDict
+from threading import RLock
+
+# max statements kept by a DBStatementCache - the least recently used statement is dropped first
+STATEMENT_CACHE_SIZE = 1000
+
+# max compiled statements kept by a DBStatementCache (a statement is compiled once per dialect and parameter set)
+COMPILED_CACHE_SIZE = 2000
+
+
+class LRUCache:
+    """
+    NAME
+        LRUCache - thread-safe dictionary that keeps only the most recently used items
+    VARIABLES
+        max_size        -> max number of items - the least recently used item is dropped first
+        items           -> OrderedDict of the items, least recently used first
+        lock            -> RLock instance guarding items
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, max_size)
+            self        -> the instance of the class
+            max_size    -> max number of items
+    DESCRIPTION
+        The constructor sets up an empty cache
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.lock = RLock()
+
+    """
+    NAME
+        get - gets an item and marks it as the most recently used
+    SYNOPSIS
+        get(self, key, default=None)
+            self    -> the instance of the class
+            key     -> key of the item
+            default -> returned if there is no such item (default is None)
+    DESCRIPTION
+        Same as dict.get - SQLAlchemy calls it on a compiled_cache
+    RETURNS
+        the item, or default
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.items:
+                return default
+            value = self.items.pop(key)
+            self.items[key] = value
+            return value
+
+    """
+    NAME
+        __setitem__ - adds an item as the most recently used
+    SYNOPSIS
+        __setitem__(self, key, value)
+            self    -> the instance of the class
+            key     -> key of the item
+            value   -> the item
+    DESCRIPTION
+        Drops the least recently used items beyond max_size
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __setitem__(self, key, value):
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    """
+    NAME
+        remove_if - drops every item whose key matches
+    SYNOPSIS
+        remove_if(self, should_remove)
+            self            -> the instance of the class
+            should_remove   -> function of a key - True if the item should be dropped
+    DESCRIPTION
+        Goes over all keys - meant for rare events (ex: a dynamic object was dropped)
+    RETURNS
+        number of items dropped
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def remove_if(self, should_remove):
+        with self.lock:
+            keys = [key for key in self.items if should_remove(key)]
+            for key in keys:
+                del self.items[key]
+        return len(keys)
+
+    """
+    NAME
+        __len__ - gets the number of items
+    SYNOPSIS
+        __len__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Same as dict.__len__
+    RETURNS
+        number of items
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+
+class DBStatementCache:
+    """
+    NAME
+        DBStatementCache - statements of the DB actions, built once per shape and compiled once
+    VARIABLES
+        statements      -> LRUCache of SQLAlchemy statements by (object name, shape of the action)
+            a shape is everything a statement is built from except the values (ex: filtered column names, sort)
+            values are bind parameters - they are given when the statement is executed
+        compiled        -> LRUCache of compiled statements - the compiled_cache of every connection executing them
+        hits            -> number of statements found in the cache
+        misses          -> number of statements built
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, max_statements=STATEMENT_CACHE_SIZE, max_compiled=COMPILED_CACHE_SIZE)
+            self            -> the instance of the class
+            max_statements  -> max number of statements (default is STATEMENT_CACHE_SIZE)
+            max_compiled    -> max number of compiled statements (default is COMPILED_CACHE_SIZE)
+    DESCRIPTION
+        The constructor sets up an empty cache
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, max_statements=STATEMENT_CACHE_SIZE, max_compiled=COMPILED_CACHE_SIZE):
+        self.statements = LRUCache(max_statements)
+        self.compiled = LRUCache(max_compiled)
+        self.hits = 0
+        self.misses = 0
+
+    """
+    NAME
+        get_statement - gets the statement of a shape, building it on the first use
+    SYNOPSIS
+        get_statement(self, object_name, shape, build_statement)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+            shape           -> hashable tuple describing the statement (starts with the action type)
+            build_statement -> function with no arguments that builds the statement
+    DESCRIPTION
+        If build_statement raises (ex: an unknown column), nothing is cached
+    RETURNS
+        SQLAlchemy statement
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_statement(self, object_name, shape, build_statement):
+        key = (object_name, shape)
+        statement = self.statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        statement = build_statement()
+        self.statements[key] = statement
+        return statement
+
+    """
+    NAME
+        invalidate - drops the statements of a dynamic object
+    SYNOPSIS
+        invalidate(self, object_name)
+            self            -> the instance of the class
+            object_name     -> string name of the dynamic object
+    DESCRIPTION
+        Called when the table of the object is dropped or created (statements hold the table they were built for)
+            their compiled statements are no longer used and age out of compiled
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def invalidate(self, object_name):
+        self.statements.remove_if(lambda key: key[0] == object_name)
+
+    """
+    NAME
+        get_stats - gets statistics of the cache
+    SYNOPSIS
+        get_stats(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Allows to tell how often actions skip building their statements
+    RETURNS
+        {
+            "statements": number of cached statements,
+            "compiled": number of cached compiled statements,
+            "hits": number of statements found in the cache,
+            "misses": number of statements built
+        }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_stats(self):
+        return {
+            "statements": len(self.statements),
+            "compiled": len(self.compiled),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -1,30 +1,220 @@
-from threading import RLock
+from collections import deque, OrderedDict
+from datetime import datetime, date
+from decimal import Decimal
+from itertools import chain
+from math import ceil
+from threading import RLock, Condition
+from time import time
 import json
 
-class DBTask:
+from ActMonitor.server_application.database_actions import ALERT_FINDS_OBJECT_NAME
+
+READ_LANE = "read"
+
+STREAM_LANE = "stream"
+
+INTERACTIVE_LANE = "interactive"
+
+INGEST_LANE = "ingest"
+
+MAINTENANCE_LANE = "maintenance"
+
+INDEX_LANE = "index"
+
+# key naming the type of a value JSON does not support, encoded as a tagged dictionary (see get_json_value)
+JSON_TYPE_KEY = "__type__"
+
+# types encoded as tagged dictionaries, and the format of the string of their value
+JSON_TYPES = {
+    "datetime": "%Y-%m-%dT%H:%M:%S.%f",
+    "date": "%Y-%m-%d",
+    "decimal": None
+}
+
+# lanes of the DBTaskList, from highest priority to lowest
+#   weight      -> a lane with a higher weight gets popped more often
+#   shed_ratio  -> in SOFT_LIMIT_MODE, pushes to the lane are refused once the queue is this full (fraction of limits)
+#   exclusive   -> if True, a popped task leases its shard (default is True) - see DBTaskList
+#   sheds       -> if True, pushes to the lane may drop pending sheddable tasks (see SHEDDABLE_ACTIONS) of lower
+#                   priority lanes to make room (default is True) - reads never evict writes
+#   journaled   -> if True, pushed tasks are appended to the journal (default is True)
+TASK_LANES = [
+    {
+        "name": READ_LANE,
+        "weight": 1,
+        "shed_ratio": 1.0,
+        "exclusive": False,
+        "journaled": False,
+        "sheds": False
+    },
+    {
+        "name": STREAM_LANE,
+        "weight": 1,
+        "shed_ratio": 1.0,
+        "exclusive": False,
+        "journaled": False,
+        "sheds": False
+    },
+    {
+        "name": INTERACTIVE_LANE,
+        "weight": 6,
+        "shed_ratio": 1.0
+    },
+    {
+        "name": INGEST_LANE,
+        "weight": 3,
+        "shed_ratio": 0.9
+    },
+    {
+        "name": MAINTENANCE_LANE,
+        "weight": 1,
+        "shed_ratio": 0.75
+    },
+    {
+        "name": INDEX_LANE,
+        "weight": 1,
+        "shed_ratio": 0.75,
+        "exclusive": False
+    }
+]
+
+# lanes popped by the DBWorkers that perform writes - READ_LANE and STREAM_LANE have their own DBWorkers (see DBPool)
+WRITE_LANES = [INTERACTIVE_LANE, INGEST_LANE, MAINTENANCE_LANE, INDEX_LANE]
+
+# action types supported by DBTask - every task of the same type shares the same string
+ACTION_TYPES = dict((action_type, intern(action_type)) for action_type in
+                    ["create", "drop", "select", "stream", "page", "insert", "delete", "update", "update_count",
+                     "create_index"])
+
+# action types that only read - performed on READ_LANE (streams on STREAM_LANE)
+READ_ACTIONS = ["select", "stream", "page"]
+
+# action types that give the same result no matter how many times they run - at most 1 task per object of these
+#   types is pending or in flight, pushing another one joins it (see DBTaskList.push)
+IDEMPOTENT_ACTIONS = ["update_count"]
+
+# action types that can be dropped from the queue to make room for other tasks (see DBTaskList.push)
+#   only maintenance work that is scheduled again when it is needed - tasks the client was told were accepted
+#   (ex: inserts) are never dropped
+SHEDDABLE_ACTIONS = ["update_count"]
+
+# max number of object names kept by get_object_name
+MAX_INTERNED_OBJECT_NAMES = 4096
+
+# object name passed to DBTask -> interned title-cased object name
+object_names = {}
+
+# a lane whose oldest task waited longer than this (in seconds) is popped before any other lane
+STARVATION_SECONDS = 2
+
+# number of tasks in a row a DBWorker may keep popping from the same shard before it has to move on
+SHARD_AFFINITY_TASKS = 8
+
+# max number of adjacent inserts of the same object merged into one task when popped (1 - inserts are not merged)
+#   each insert task is usually 1 row (1 event posted to a tracker)
+COALESCE_MAX_TASKS = 500
+
+# an insert is held in the DBTaskList for up to this many seconds so more inserts of its object can join it
+#   only while fewer than COALESCE_MAX_TASKS tasks are pending in its shard (0 - inserts are never held)
+COALESCE_WAIT_SECONDS = 0.005
+
+# max number of pending tasks in the DBTaskList
+MAX_QUEUED_TASKS = 100000
+
+# max size (in bytes) of the arguments of all pending tasks in the DBTaskList
+MAX_QUEUED_BYTES = 256 * 1024 * 1024
+
+HARD_LIMIT_MODE = "hard"
+
+SOFT_LIMIT_MODE = "soft"
+
+# hard - refuse any task past the limits
+# soft - refuse low priority lanes first (see "shed_ratio" in TASK_LANES) and drop pending sheddable low priority
+#           tasks to make room for higher priority ones (see "sheds" in TASK_LANES and SHEDDABLE_ACTIONS)
+QUEUE_LIMIT_MODE = SOFT_LIMIT_MODE
+
+# longest Retry-After (in seconds) suggested to a client whose task was refused
+MAX_RETRY_AFTER = 60
+
+
+class DBTaskListFull(Exception):
+    """
+    NAME
+        DBTaskListFull - raised when a task is refused because the DBTaskList is full
+    VARIABLES
+        lane            -> name of the lane the refused task was pushed to
+        retry_after     -> suggested number of seconds to wait before pushing again
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    """
+    NAME
+        __init__ - constructor to set the variables for this instance
+    SYNOPSIS
+        __init__(self, lane, retry_after)
+            self            -> the instance of the class
+            lane            -> name of the lane the refused task was pushed to
+            retry_after     -> suggested number of seconds to wait before pushing again
+    DESCRIPTION
+        The constructor sets up the exception message and variables
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, lane, retry_after):
+        Exception.__init__(self, "Task queue is full - refused a task of lane '{0}'".format(lane))
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class DBTask(object):
     """
     NAME
         DBTask - a single SQL task to be performed - ex: SELECT name FROM users WHERE age=20
+            slotted - a pending task holds no __dict__, and once pushed to the DBTaskList its additional arguments
+            are kept as JSON bytes (payload) until a worker needs them
     VARIABLES
-        action              -> type of DB action to perform
-        object_name         -> name of dynamic object to handle
-        additional_args     -> additional arguments needed to perform the action
+        action              -> type of DB action to perform (interned - see ACTION_TYPES)
+        object_name         -> name of dynamic object to handle (interned - see get_object_name)
+        additional_args     -> additional arguments needed to perform the action (property - see get_additional_args)
             each action has different requirements
+        args                -> dictionary of additional arguments (None while they are only kept in payload)
+        payload             -> additional arguments as JSON bytes (None until compact is called)
+        lane                -> name of the DBTaskList lane this task waits in
+        shard               -> DBTaskList shard this task belongs to (see get_task_shard)
+        size                -> estimated size (in bytes) of additional_args - set when pushed to the DBTaskList
+        enqueued_at         -> time (in seconds since epoch) this task was pushed to the DBTaskList
+        journal_id          -> sequence number of the task's DBJournal record (None if not journaled)
+        merged              -> list of the insert DBTasks this task was merged from (None if not merged)
+            see merge_insert_tasks
+        future              -> DBFuture instance resolved once the task is done (None if nobody waits for it)
     AUTHOR
         Yoav Nathaniel
     DATE
         4/24/2016
     """
+    __slots__ = ("action", "object_name", "args", "payload", "lane", "shard", "size", "enqueued_at", "journal_id",
+                 "merged", "future")
 
     """
     NAME
         __init__ - constructor to set the description of task
     SYNOPSIS
-        __init__(self, action_type, object_name, **kwargs)
+        __init__(self, action_type, object_name, lane=None, payload=None, **kwargs)
             self            -> the instance of the class
             action_type     -> type of action to execute
-                supports "create", "drop", "select", "insert", "delete", "update", "update_count"
+                supports "create", "drop", "select", "stream", "page", "insert", "delete", "update", "update_count",
+                    "create_index"
             object_name     -> name of object to deal with
+            lane            -> name of the DBTaskList lane to wait in (default is None - see get_task_lane)
+            payload         -> additional arguments already encoded as a JSON object (default is None)
+                ex: a replayed DBJournal record - kwargs are ignored if given
             **kwargs        -> additional arguments - action type specific
     DESCRIPTION
         The class constructor sets up the details of the database action to execute
@@ -35,10 +225,99 @@ class DBTask:
     DATE
         4/24/2016
     """
-    def __init__(self, action_type, object_name, **kwargs):
-        self.action = action_type
-        self.object_name = str(object_name).title()
-        self.additional_args = kwargs
+    def __init__(self, action_type, object_name, lane=None, payload=None, **kwargs):
+        self.action = get_action_type(action_type)
+        self.object_name = get_object_name(object_name)
+        self.args = kwargs if payload is None else None
+        self.payload = payload
+        self.lane = lane if lane is not None else get_task_lane(self.action, self.object_name)
+        self.shard = get_task_shard(self.object_name)
+        self.size = 0
+        self.enqueued_at = None
+        self.journal_id = None
+        self.merged = None
+        self.future = None
+
+    """
+    NAME
+        get_additional_args - gets the additional arguments of the task
+    SYNOPSIS
+        get_additional_args(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Decodes payload the first time the arguments are needed (usually by the DBWorker performing the task)
+            the decoded dictionary is kept for the rest of the task's life
+
+        A merged task has a single argument - "insert_data", the list of rows of all the tasks it was merged from
+    RETURNS
+        dictionary of additional arguments
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_additional_args(self):
+        if self.args is None:
+            if self.merged is not None:
+                self.args = {"insert_data": get_insert_rows(self.merged)}
+            else:
+                self.args = json.loads(self.payload, object_hook=get_python_value) if self.payload else {}
+        return self.args
+
+    additional_args = property(get_additional_args)
+
+    """
+    NAME
+        compact - encodes the additional arguments of the task to JSON bytes
+    SYNOPSIS
+        compact(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Called when a write task is pushed to the DBTaskList - a pending task only keeps payload
+            SQLAlchemy column types (ex: in "create" properties) are encoded by name - see get_sql_column
+            datetimes, dates and Decimals are encoded so they decode back to themselves - see get_json_value
+            any other value JSON does not support raises TypeError
+
+        Does nothing if the task is already compact
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def compact(self):
+        if self.payload is None:
+            self.payload = json.dumps(self.args, default=get_json_value) if self.args else ""
+            self.args = None
+
+    """
+    NAME
+        to_json - get the task as a dictionary
+    SYNOPSIS
+        to_json(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Creates a dictionary with the details of the task
+    RETURNS
+        {
+            "action": type of action,
+            "object_name": name of object,
+            "lane": name of lane,
+            "additional_args": additional arguments
+        }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def to_json(self):
+        return {
+            "action": self.action,
+            "object_name": self.object_name,
+            "lane": self.lane,
+            "additional_args": self.additional_args
+        }
 
     """
     NAME
@@ -49,55 +328,358 @@ class DBTask:
     DESCRIPTION
         Override the function to print the instance of the object
 
-        returns the dictionary of the instance as a string
+        returns the details of the task as a string
     RETURNS
-        str(self.__dict__)      -> the __dict__ of the instance converted to string
+        str(self.to_json())     -> the details of the instance converted to string
     AUTHOR
         Yoav Nathaniel
     DATE
         4/24/2016
     """
     def __repr__(self):
-        return str(self.__dict__)
+        return str(self.to_json())
 
 
 class DBTaskList:
     """
     NAME
         DBTask - a queue of DBTasks that allows synchronous FIFO performance
+            tasks are split into lanes (see TASK_LANES) - lanes are popped by weight
+            tasks of a lane are split into shards - one shard per object, each shard is FIFO
+            a popped task leases its shard until task_done is called - no other task of the shard is popped
+                meanwhile, so the tasks of an object run one at a time and in order
+                while tasks of other objects never wait for it
+                (except lanes that are not exclusive - ex: READ_LANE, selects can run side by side, and INDEX_LANE,
+                an index is built while writes to its object go on)
+            the queue is bounded by number of tasks and by bytes (see push)
+            adjacent inserts of the same object are merged into one task when popped (see pop)
+            idempotent tasks (see IDEMPOTENT_ACTIONS) are pushed once per object until they are done (see push)
     VARIABLES
-        tasks           -> list of DBTask instances
+        lanes           -> OrderedDict of lane name to a dictionary of the following format:
+            {
+                "weight": how often the lane gets popped compared to the other lanes,
+                "current_weight": running weight used by the weighted round robin,
+                "shards": dictionary of shard (object name) to a deque of pending DBTask instances,
+                "ready": deque of shards with pending tasks (in the order they should be served),
+                "size": number of pending tasks in the lane,
+                "bytes": estimated size (in bytes) of the pending tasks in the lane,
+                "shed_ratio": fraction of the limits past which pushes to the lane are refused (soft limit mode),
+                "exclusive": boolean indicating if a popped task leases its shard,
+                "sheds": boolean indicating if pushes to the lane may drop tasks of lower priority lanes,
+                "sheddable": number of pending tasks in the lane that can be dropped (see SHEDDABLE_ACTIONS),
+                "journaled": boolean indicating if pushed tasks are appended to the journal,
+                "refused": number of tasks refused by push,
+                "shed": number of pending tasks dropped to make room for higher priority tasks,
+                "popped": number of tasks popped from the lane,
+                "total_wait": seconds all popped tasks waited in the lane,
+                "max_wait": longest time (in seconds) a popped task waited in the lane,
+                "coalesced": number of popped tasks that were merged into another task,
+                "deduped": number of pushed tasks that joined an identical pending or in flight task
+            }
+        leased_shards   -> dictionary of shard (object name) to the popped DBTask currently leasing the shard
+            shared by all exclusive lanes - a task of an object never overtakes one in flight in another lane
+        idempotent_tasks    -> dictionary of (action, object name) to the idempotent DBTask pending or in flight
+        size            -> number of tasks in all lanes
+        bytes           -> estimated size (in bytes) of the tasks in all lanes
+        max_tasks       -> max number of pending tasks
+        max_bytes       -> max estimated size (in bytes) of the pending tasks
+        limit_mode      -> HARD_LIMIT_MODE or SOFT_LIMIT_MODE
+        coalesce_max_tasks  -> max number of inserts merged into one task
+        coalesce_wait   -> max seconds an insert is held so more inserts can join it
+        journal         -> DBJournal instance every pushed task is appended to (None - tasks are not journaled)
         list_lock       -> RLock instance used to make queue thread-safe
+        not_empty       -> Condition instance (uses list_lock) that wakes up threads waiting for a task of any lane
+        pop_conditions  -> dictionary of lane names (tuple, None - any lane) to the Condition instance (uses
+                            list_lock) that wakes up threads waiting for a task of these lanes
         can_pop         -> boolean indicating if popping tasks is allowed
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    tasks = []
-    list_lock = RLock()
-    can_pop = True
+
+    """
+    NAME
+        __init__ - constructor to set up an empty queue
+    SYNOPSIS
+        __init__(self, max_tasks=MAX_QUEUED_TASKS, max_bytes=MAX_QUEUED_BYTES, limit_mode=QUEUE_LIMIT_MODE,
+                 coalesce_max_tasks=COALESCE_MAX_TASKS, coalesce_wait=COALESCE_WAIT_SECONDS, journal=None)
+            self        -> the instance of the class
+            max_tasks   -> max number of pending tasks (default is MAX_QUEUED_TASKS)
+            max_bytes   -> max estimated size (in bytes) of the pending tasks (default is MAX_QUEUED_BYTES)
+            limit_mode  -> HARD_LIMIT_MODE or SOFT_LIMIT_MODE (default is QUEUE_LIMIT_MODE)
+            coalesce_max_tasks  -> max number of inserts merged into one task (default is COALESCE_MAX_TASKS)
+            coalesce_wait   -> max seconds an insert is held so more inserts can join it
+                (default is COALESCE_WAIT_SECONDS)
+            journal     -> DBJournal instance to append pushed tasks to (default is None - no journal)
+    DESCRIPTION
+        The constructor sets up an empty lane for every item in TASK_LANES, the queue lock and the condition used to
+            hand tasks to waiting workers
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __init__(self, max_tasks=MAX_QUEUED_TASKS, max_bytes=MAX_QUEUED_BYTES, limit_mode=QUEUE_LIMIT_MODE,
+                 coalesce_max_tasks=COALESCE_MAX_TASKS, coalesce_wait=COALESCE_WAIT_SECONDS, journal=None):
+        self.lanes = OrderedDict()
+        for lane in TASK_LANES:
+            self.lanes[lane.get("name")] = {
+                "weight": lane.get("weight"),
+                "current_weight": 0,
+                "shards": {},
+                "ready": deque(),
+                "size": 0,
+                "bytes": 0,
+                "shed_ratio": lane.get("shed_ratio", 1.0),
+                "exclusive": lane.get("exclusive", True),
+                "sheds": lane.get("sheds", True),
+                "sheddable": 0,
+                "journaled": lane.get("journaled", True),
+                "refused": 0,
+                "shed": 0,
+                "popped": 0,
+                "total_wait": 0.0,
+                "max_wait": 0.0,
+                "coalesced": 0,
+                "deduped": 0
+            }
+        self.leased_shards = {}
+        self.idempotent_tasks = {}
+        self.size = 0
+        self.bytes = 0
+        self.max_tasks = max_tasks
+        self.max_bytes = max_bytes
+        self.limit_mode = limit_mode
+        self.coalesce_max_tasks = max(coalesce_max_tasks, 1)
+        self.coalesce_wait = coalesce_wait
+        self.journal = journal
+        self.list_lock = RLock()
+        self.not_empty = Condition(self.list_lock)
+        self.pop_conditions = {None: self.not_empty}
+        self.can_pop = True
 
     """
     NAME
         push - enqueue a DBTask to the tasks queue
     SYNOPSIS
-        push(self, task_to_push)
+        push(self, task_to_push, force=False)
             self            -> the instance of the class
             task_to_push    -> DBTask to append to the tasks list
+            force           -> if True, skip the queue limits (default is False)
+                only used to recover tasks that were already accepted once (ex: replaying the journal)
     DESCRIPTION
-        Verifies task_to_push is an instance of DBTask, then enqueues task_to_push with list_lock
+        Verifies task_to_push is an instance of DBTask, then enqueues task_to_push to its lane and shard with list_lock
+            if the lane of task_to_push is not recognized, raise ValueError
+
+        A write task is compacted first (see DBTask.compact) - a read keeps its arguments, it is popped soon and
+            would only pay for encoding and decoding them
+
+        If task_to_push is idempotent (see IDEMPOTENT_ACTIONS) and a task of the same action and object is pending or
+            in flight, task_to_push is not enqueued - it joins that task instead
+            the caller gets that task, and its future if task_to_push had one (see DBTask.future)
+
+        Makes sure the queue stays within max_tasks and max_bytes (see __make_room__)
+            if there is no room for task_to_push, raise DBTaskListFull
+
+        If there is a journal and the lane is journaled, appends task_to_push to the journal (once it is accepted)
+            its record is reserved with list_lock (in the order of the queue) but written and fsync-ed only after
+            list_lock is released (see DBJournal.reserve and DBJournal.write) - pops never wait for the disk
+
+        Wakes up one thread waiting in pop for the lane (if any) so the task is handed over right away
     RETURNS
-        None
+        the DBTask that will be performed - task_to_push, or the pending task it joined
     AUTHOR
         Yoav Nathaniel
     DATE
         4/25/2016
     """
-    def push(self, task_to_push):
+    def push(self, task_to_push, force=False):
         self.__verify_task_is_dbtask__(task_to_push)
+        if task_to_push.lane not in self.lanes:
+            raise ValueError("Unrecognized task lane: {0}".format(task_to_push.lane))
+
+        if task_to_push.action not in READ_ACTIONS:
+            task_to_push.compact()
+        task_to_push.size = get_task_size(task_to_push)
+
         with self.list_lock:
-            self.tasks.append(task_to_push)
+            lane = self.lanes[task_to_push.lane]
+            idempotent_key = None
+            if task_to_push.action in IDEMPOTENT_ACTIONS:
+                idempotent_key = (task_to_push.action, task_to_push.object_name)
+                pending_task = self.idempotent_tasks.get(idempotent_key)
+                if pending_task is not None:
+                    if pending_task.future is None:
+                        pending_task.future = task_to_push.future
+                    lane["deduped"] += 1
+                    return pending_task
+
+            if not force:
+                self.__make_room__(task_to_push, lane)
+            if idempotent_key is not None:
+                self.idempotent_tasks[idempotent_key] = task_to_push
+
+            journaled = self.journal is not None and lane["journaled"]
+            if journaled:
+                self.journal.reserve(task_to_push)
+
+            task_to_push.enqueued_at = time()
+            if task_to_push.shard not in lane["shards"]:
+                lane["shards"][task_to_push.shard] = deque()
+                lane["ready"].append(task_to_push.shard)
+            lane["shards"][task_to_push.shard].append(task_to_push)
+            lane["size"] += 1
+            lane["bytes"] += task_to_push.size
+            if task_to_push.action in SHEDDABLE_ACTIONS:
+                lane["sheddable"] += 1
+            self.size += 1
+            self.bytes += task_to_push.size
+            self.__notify__(task_to_push.lane)
+
+        if journaled:
+            self.journal.write()
+        return task_to_push
+
+    """
+    NAME
+        __make_room__ - makes sure there is room in the queue for a new task
+    SYNOPSIS
+        __make_room__(self, new_task, lane)
+            self        -> the instance of the class
+            new_task    -> DBTask about to be pushed
+            lane        -> dictionary of the lane new_task is pushed to (an item of self.lanes)
+    DESCRIPTION
+        Must be called with list_lock
+
+        In HARD_LIMIT_MODE the limits are max_tasks and max_bytes
+        In SOFT_LIMIT_MODE the limits are max_tasks and max_bytes multiplied by the lane's shed_ratio
+            so low priority lanes are refused before the queue is completely full
+
+        If new_task does not fit within the limits:
+            in SOFT_LIMIT_MODE, drop the newest pending sheddable tasks of lower priority lanes until new_task fits
+                (only if the lane sheds - a read at the limits is refused rather than evicting writes)
+            if it still does not fit, raise DBTaskListFull with a Retry-After suggestion
+                the suggestion is how long the oldest pending task of the lane has been waiting
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __make_room__(self, new_task, lane):
+        ratio = 1.0
+        if self.limit_mode == SOFT_LIMIT_MODE:
+            ratio = lane["shed_ratio"]
+
+        while self.size + 1 > self.max_tasks * ratio or self.bytes + new_task.size > self.max_bytes * ratio:
+            if self.limit_mode != SOFT_LIMIT_MODE or not lane["sheds"] or not self.__shed_task__(new_task.lane):
+                lane["refused"] += 1
+                raise DBTaskListFull(new_task.lane, self.__get_retry_after__(lane))
+
+    """
+    NAME
+        __shed_task__ - drops the newest pending sheddable task of the lowest priority lane
+    SYNOPSIS
+        __shed_task__(self, lane_name)
+            self        -> the instance of the class
+            lane_name   -> only lanes of lower priority than this lane can be shed
+    DESCRIPTION
+        Must be called with list_lock
+
+        Lanes are ordered by priority in TASK_LANES (first is highest)
+        Removes the newest sheddable task (see SHEDDABLE_ACTIONS) of the lowest priority lane that has one
+            shards are searched from the last one in the lane's ready deque
+            the dropped task is marked as done in the journal
+            whoever waits for the dropped task (see DBTask.future) gets DBTaskListFull
+    RETURNS
+        True if a task was dropped
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __shed_task__(self, lane_name):
+        for shed_lane_name in reversed(self.lanes.keys()):
+            if shed_lane_name == lane_name:
+                return False
+
+            shed_lane = self.lanes[shed_lane_name]
+            if shed_lane["sheddable"] == 0:
+                continue
+
+            shard, shed_task = self.__find_sheddable_task__(shed_lane)
+            shard_tasks = shed_lane["shards"][shard]
+            shard_tasks.remove(shed_task)
+            if len(shard_tasks) == 0:
+                shed_lane["ready"].remove(shard)
+                del shed_lane["shards"][shard]
+
+            shed_lane["size"] -= 1
+            shed_lane["sheddable"] -= 1
+            shed_lane["bytes"] -= shed_task.size
+            shed_lane["shed"] += 1
+            self.size -= 1
+            self.bytes -= shed_task.size
+            self.__complete_in_journal__(shed_task)
+            self.__forget_idempotent_task__(shed_task)
+            if shed_task.future is not None:
+                shed_task.future.set_exception(DBTaskListFull(shed_lane_name, self.__get_retry_after__(shed_lane)))
+            return True
+
+        return False
+
+    """
+    NAME
+        __find_sheddable_task__ - finds the newest pending sheddable task of a lane
+    SYNOPSIS
+        __find_sheddable_task__(self, lane)
+            self    -> the instance of the class
+            lane    -> dictionary of the lane (an item of self.lanes) - must have a sheddable task
+    DESCRIPTION
+        Must be called with list_lock
+    RETURNS
+        shard of the task, DBTask instance
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __find_sheddable_task__(self, lane):
+        for shard in reversed(lane["ready"]):
+            for shard_task in reversed(lane["shards"][shard]):
+                if shard_task.action in SHEDDABLE_ACTIONS:
+                    return shard, shard_task
+
+    """
+    NAME
+        __get_retry_after__ - suggests how long to wait before pushing to a lane again
+    SYNOPSIS
+        __get_retry_after__(self, lane)
+            self    -> the instance of the class
+            lane    -> dictionary of the lane (an item of self.lanes)
+    DESCRIPTION
+        Must be called with list_lock
+
+        The oldest pending task of the lane has been waiting about as long as it takes the lane to turn over
+    RETURNS
+        number of seconds between 1 and MAX_RETRY_AFTER
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_retry_after__(self, lane):
+        now = time()
+        oldest_wait = 0.0
+        for shard_tasks in lane["shards"].itervalues():
+            oldest_wait = max(oldest_wait, now - shard_tasks[0].enqueued_at)
+
+        return int(min(MAX_RETRY_AFTER, max(1, ceil(oldest_wait))))
 
     """
     NAME
@@ -124,20 +706,36 @@ class DBTaskList:
     NAME
         pop - attempts to dequeue a DBTask
     SYNOPSIS
-        pop(self)
-            self    -> the instance of the class
+        pop(self, block=False, should_stop=None, preferred_shard=None, lane_names=None)
+            self            -> the instance of the class
+            block           -> if True, wait until a task can be popped (default is False)
+            should_stop     -> function with no arguments that returns True when a blocked caller should give up
+                                (default is None - never give up)
+            preferred_shard -> shard the caller would like to keep working on (default is None)
+            lane_names      -> list of names of lanes to pop from (default is None - all lanes)
     DESCRIPTION
         This function is thread safe
 
+        A task can be popped if its shard is not leased by another popped task
+
+        If block is True:
+            sleep on the Condition of lane_names until a task can be popped (woken up by push, task_done or wake_all)
+                no polling is involved
+            stop waiting and return None once should_stop() returns True
+
         If
-            there are more than 0 tasks left to execute
+            there is a task that can be popped
             AND
             popping tasks is still allowed
         then
-                dequeue the first in the list
+                1. choose a lane and a shard (see __choose_lane__)
+                2. dequeue the first task of the shard and lease the shard to the task (if the lane is exclusive)
+                3. record how long the task waited in the lane
+
+        The caller MUST call task_done with the popped task once it's done with it
     RETURNS
-        if size of queue > 0 AND can_pop:
-            return oldest task on the queue
+        if a task can be popped AND can_pop:
+            return oldest task of the chosen shard
         else:
             None
     AUTHOR
@@ -145,13 +743,313 @@ class DBTaskList:
     DATE
         4/25/2016
     """
-    def pop(self):
+    def pop(self, block=False, should_stop=None, preferred_shard=None, lane_names=None):
         with self.list_lock:
-            if self.can_pop:
-                task_to_pop = self.tasks.pop(0)
-                return task_to_pop
+            pop_condition = self.__get_pop_condition__(lane_names)
+            while True:
+                held_until = None
+                if self.can_pop and self.size > 0:
+                    now = time()
+                    lane, shard, held_until = self.__choose_lane__(now, preferred_shard, lane_names)
+                    if lane is not None:
+                        break
+
+                if not block or (should_stop is not None and should_stop()):
+                    return None
+                if held_until is not None:
+                    pop_condition.wait(max(held_until - now, 0.001))
+                else:
+                    pop_condition.wait()
+
+            shard_tasks = lane["shards"][shard]
+            popped_tasks = [shard_tasks.popleft()]
+            if popped_tasks[0].action == "insert":
+                while len(shard_tasks) > 0 and len(popped_tasks) < self.coalesce_max_tasks and \
+                        shard_tasks[0].action == "insert" and shard_tasks[0].object_name == popped_tasks[0].object_name:
+                    popped_tasks.append(shard_tasks.popleft())
+
+            lane["ready"].remove(shard)
+            if len(shard_tasks) > 0:
+                lane["ready"].append(shard)
             else:
-                return None
+                del lane["shards"][shard]
+
+            for popped_task in popped_tasks:
+                lane["size"] -= 1
+                if popped_task.action in SHEDDABLE_ACTIONS:
+                    lane["sheddable"] -= 1
+                lane["bytes"] -= popped_task.size
+                self.size -= 1
+                self.bytes -= popped_task.size
+
+                waited = now - popped_task.enqueued_at
+                lane["popped"] += 1
+                lane["total_wait"] += waited
+                lane["max_wait"] = max(lane["max_wait"], waited)
+
+            if len(popped_tasks) > 1:
+                task_to_pop = merge_insert_tasks(popped_tasks)
+                lane["coalesced"] += len(popped_tasks) - 1
+            else:
+                task_to_pop = popped_tasks[0]
+
+            if lane["exclusive"]:
+                self.leased_shards[shard] = task_to_pop
+            return task_to_pop
+
+    """
+    NAME
+        task_done - releases the shard leased by a popped task
+    SYNOPSIS
+        task_done(self, done_task)
+            self        -> the instance of the class
+            done_task   -> DBTask instance returned by pop
+    DESCRIPTION
+        This function is thread safe
+
+        1. mark done_task as done in the journal - it will not be replayed
+            if done_task is idempotent, the next task of its action and object is pushed again
+        2. if done_task still leases its shard:
+            1. release the shard so the next task of the shard can be popped
+            2. wake up one thread waiting in pop (for every group of lanes)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def task_done(self, done_task):
+        self.__complete_in_journal__(done_task)
+        with self.list_lock:
+            self.__forget_idempotent_task__(done_task)
+            if self.leased_shards.get(done_task.shard) is done_task:
+                del self.leased_shards[done_task.shard]
+                if self.size > 0:
+                    self.__notify__(None)
+
+    """
+    NAME
+        __complete_in_journal__ - marks a task as done in the journal
+    SYNOPSIS
+        __complete_in_journal__(self, done_task)
+            self        -> the instance of the class
+            done_task   -> DBTask instance that is done (or dropped)
+    DESCRIPTION
+        Only applies if there is a journal and done_task was appended to it
+            a merged task completes every task it was merged from
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __complete_in_journal__(self, done_task):
+        if self.journal is None:
+            return
+
+        if done_task.merged is not None:
+            for merged_task in done_task.merged:
+                self.__complete_in_journal__(merged_task)
+        elif done_task.journal_id is not None:
+            self.journal.complete(done_task.journal_id)
+
+    """
+    NAME
+        __forget_idempotent_task__ - stops joining new tasks to an idempotent task
+    SYNOPSIS
+        __forget_idempotent_task__(self, task)
+            self    -> the instance of the class
+            task    -> DBTask instance that is done (or dropped)
+    DESCRIPTION
+        Must be called with list_lock
+
+        Only applies if task is the idempotent task recorded for its action and object
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __forget_idempotent_task__(self, task):
+        idempotent_key = (task.action, task.object_name)
+        if self.idempotent_tasks.get(idempotent_key) is task:
+            del self.idempotent_tasks[idempotent_key]
+
+    """
+    NAME
+        __choose_lane__ - chooses the lane and shard to pop the next task from
+    SYNOPSIS
+        __choose_lane__(self, now, preferred_shard, lane_names)
+            self            -> the instance of the class
+            now             -> current time in seconds since epoch
+            preferred_shard -> shard to choose in a lane if it has pending tasks there (can be None)
+            lane_names      -> list of names of lanes to choose from (None - all lanes)
+    DESCRIPTION
+        Must be called with list_lock
+
+        1. for every lane in lane_names, find a shard that has pending tasks and is not leased (if the lane is
+            exclusive) or held (see __get_hold_release__)
+            preferred_shard if possible, else the first one in the lane's ready deque
+            lanes without such a shard are skipped
+        2. starvation protection - if the oldest task of any of these shards waited over STARVATION_SECONDS:
+            choose the lane with the oldest waiting task
+        3. else, smooth weighted round robin over these lanes:
+            1. add its weight to the current_weight of every such lane
+            2. choose the lane with the highest current_weight
+            3. subtract the total weight of those lanes from the current_weight of the chosen lane
+    RETURNS
+        dictionary of the chosen lane (an item of self.lanes), shard to pop from, None
+        None, None, time the first held shard is released (None if no shard is held) - if no task can be popped
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __choose_lane__(self, now, preferred_shard, lane_names):
+        candidates = []
+        held_until = None
+        for lane_name, lane in self.lanes.iteritems():
+            if lane["size"] == 0 or (lane_names is not None and lane_name not in lane_names):
+                continue
+
+            shards = lane["ready"]
+            if preferred_shard in lane["shards"]:
+                shards = chain([preferred_shard], shards)
+
+            for shard in shards:
+                if lane["exclusive"] and shard in self.leased_shards:
+                    continue
+
+                release_at = self.__get_hold_release__(lane["shards"][shard])
+                if release_at > now:
+                    if held_until is None or release_at < held_until:
+                        held_until = release_at
+                    continue
+
+                candidates.append((lane, shard))
+                break
+
+        if len(candidates) == 0:
+            return None, None, held_until
+
+        starved = None
+        starved_since = None
+        for lane, shard in candidates:
+            enqueued_at = lane["shards"][shard][0].enqueued_at
+            if now - enqueued_at > STARVATION_SECONDS and (starved is None or enqueued_at < starved_since):
+                starved = (lane, shard)
+                starved_since = enqueued_at
+
+        if starved is not None:
+            return starved[0], starved[1], None
+
+        total_weight = 0
+        chosen = None
+        for lane, shard in candidates:
+            lane["current_weight"] += lane["weight"]
+            total_weight += lane["weight"]
+            if chosen is None or lane["current_weight"] > chosen[0]["current_weight"]:
+                chosen = (lane, shard)
+
+        chosen[0]["current_weight"] -= total_weight
+        return chosen[0], chosen[1], None
+
+    """
+    NAME
+        __get_pop_condition__ - gets the Condition threads popping from some lanes wait on
+    SYNOPSIS
+        __get_pop_condition__(self, lane_names)
+            self        -> the instance of the class
+            lane_names  -> list of names of lanes (None - all lanes)
+    DESCRIPTION
+        Must be called with list_lock
+
+        Threads popping from different lanes wait on different Conditions, so a push to a lane never wakes up
+            (only) a thread that cannot pop from it
+    RETURNS
+        Condition instance (uses list_lock)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_pop_condition__(self, lane_names):
+        key = tuple(lane_names) if lane_names is not None else None
+        if key not in self.pop_conditions:
+            self.pop_conditions[key] = Condition(self.list_lock)
+        return self.pop_conditions[key]
+
+    """
+    NAME
+        __notify__ - wakes up threads waiting to pop from a lane
+    SYNOPSIS
+        __notify__(self, lane_name)
+            self        -> the instance of the class
+            lane_name   -> name of the lane that has a task to pop (None - any lane)
+    DESCRIPTION
+        Must be called with list_lock
+
+        Wakes up one thread of every group of lanes that includes lane_name
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __notify__(self, lane_name):
+        for lane_names, pop_condition in self.pop_conditions.iteritems():
+            if lane_name is None or lane_names is None or lane_name in lane_names:
+                pop_condition.notify()
+
+    """
+    NAME
+        __get_hold_release__ - gets the time a shard stops being held for coalescing
+    SYNOPSIS
+        __get_hold_release__(self, shard_tasks)
+            self            -> the instance of the class
+            shard_tasks     -> deque of pending DBTask instances of a shard
+    DESCRIPTION
+        A shard is held while its first task is an insert that waited less than coalesce_wait seconds
+            and fewer than coalesce_max_tasks tasks are pending in the shard
+        Holding lets a burst of inserts to the same object build up, so pop merges them into one task
+    RETURNS
+        time (in seconds since epoch) the shard is released - 0 if it is not held
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __get_hold_release__(self, shard_tasks):
+        first_task = shard_tasks[0]
+        if first_task.action != "insert" or self.coalesce_wait <= 0 or len(shard_tasks) >= self.coalesce_max_tasks:
+            return 0
+        return first_task.enqueued_at + self.coalesce_wait
+
+    """
+    NAME
+        wake_all - wakes up every thread waiting in pop
+    SYNOPSIS
+        wake_all(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe
+
+        Used when the waiting threads should re-check their should_stop function (ex: shutting down)
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def wake_all(self):
+        with self.list_lock:
+            for pop_condition in self.pop_conditions.itervalues():
+                pop_condition.notify_all()
 
     """
     NAME
@@ -162,9 +1060,9 @@ class DBTaskList:
     DESCRIPTION
         This function is thread safe
 
-        returns the number of pending tasks
+        returns the number of pending tasks in all lanes
     RETURNS
-        len(self.tasks)     -> size of task queue
+        self.size       -> size of task queue
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -172,9 +1070,70 @@ class DBTaskList:
     """
     def get_size(self):
         with self.list_lock:
-            num_of_tasks = len(self.tasks)
+            num_of_tasks = self.size
         return num_of_tasks
 
+    """
+    NAME
+        get_lane_stats - returns the depth and wait times of every lane
+    SYNOPSIS
+        get_lane_stats(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        This function is thread safe
+
+        Collects the current depth and the wait times of every lane
+    RETURNS
+        [
+            {
+                "name": lane name,
+                "weight": lane weight,
+                "depth": number of pending tasks in the lane,
+                "bytes": estimated size (in bytes) of the pending tasks in the lane,
+                "shards": number of shards with pending tasks in the lane,
+                "oldest_wait_ms": how long the oldest pending task has been waiting (milliseconds),
+                "popped": number of tasks popped from the lane,
+                "avg_wait_ms": average time popped tasks waited in the lane (milliseconds),
+                "max_wait_ms": longest time a popped task waited in the lane (milliseconds),
+                "refused": number of tasks refused because the queue was full,
+                "shed": number of pending tasks dropped to make room for higher priority tasks
+            }
+        ]
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def get_lane_stats(self):
+        stats = []
+        with self.list_lock:
+            now = time()
+            for lane_name, lane in self.lanes.iteritems():
+                oldest_wait = 0.0
+                for shard_tasks in lane["shards"].itervalues():
+                    oldest_wait = max(oldest_wait, now - shard_tasks[0].enqueued_at)
+
+                avg_wait = 0.0
+                if lane["popped"] > 0:
+                    avg_wait = lane["total_wait"] / lane["popped"]
+
+                stats.append({
+                    "name": lane_name,
+                    "weight": lane["weight"],
+                    "depth": lane["size"],
+                    "bytes": lane["bytes"],
+                    "shards": len(lane["shards"]),
+                    "oldest_wait_ms": oldest_wait * 1000,
+                    "popped": lane["popped"],
+                    "avg_wait_ms": avg_wait * 1000,
+                    "max_wait_ms": lane["max_wait"] * 1000,
+                    "refused": lane["refused"],
+                    "shed": lane["shed"],
+                    "coalesced": lane["coalesced"],
+                    "deduped": lane["deduped"]
+                })
+        return stats
+
     """
     NAME
         no_more_popping - locks the queue so it cannot pop tasks anymore
@@ -195,6 +1154,7 @@ class DBTaskList:
     def no_more_popping(self):
         with self.list_lock:
             self.can_pop = False
+            self.wake_all()
 
     """
     NAME
@@ -203,7 +1163,7 @@ class DBTaskList:
         to_json(self)
             self    -> the instance of the class
     DESCRIPTION
-        Creates a dictionary with a list of pending tasks
+        Creates a dictionary with a list of pending tasks from all lanes
     RETURNS
         {
             "remaining_tasks": [ dict of task1, dict of task2 ]
@@ -215,12 +1175,280 @@ class DBTaskList:
     """
     def to_json(self):
         data = []
-        for t in self.tasks:
-            data.append(t.__dict__)
+        with self.list_lock:
+            for lane in self.lanes.itervalues():
+                for shard_tasks in lane["shards"].itervalues():
+                    for t in shard_tasks:
+                        data.append(t.to_json())
 
         return {"remaining_tasks": data}
 
 
+
+"""
+NAME
+    get_task_lane - chooses the default DBTaskList lane of a task
+SYNOPSIS
+    get_task_lane(action_type, object_name)
+        action_type     -> type of action to execute
+        object_name     -> name of object to deal with
+DESCRIPTION
+    maintenance lane - background work nobody waits for:
+        "update_count" tasks and inserts of alert findings
+    index lane - "create_index" tasks - not exclusive, so a long index build never holds the lease of its object
+    stream lane - streamed selects - a stream holds its DBWorker as long as its reader reads, so streams have
+        DBWorkers of their own (see DBPool) and never take the DBWorkers of selects
+    read lane - selects and pages - the rest of READ_ACTIONS (performed by their own DBWorkers, see DBPool)
+    ingest lane - events inserted to trackers (non-default objects)
+    interactive lane - everything else (admin actions, user management, alert rules, creating/dropping trackers)
+RETURNS
+    name of the lane
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_task_lane(action_type, object_name):
+    if action_type == "stream":
+        return STREAM_LANE
+    if action_type in READ_ACTIONS:
+        return READ_LANE
+    if action_type == "create_index":
+        return INDEX_LANE
+    if action_type == "update_count":
+        return MAINTENANCE_LANE
+    if action_type == "insert":
+        if object_name == ALERT_FINDS_OBJECT_NAME:
+            return MAINTENANCE_LANE
+        if object_name[0] != "_":
+            return INGEST_LANE
+    return INTERACTIVE_LANE
+
+
+
+"""
+NAME
+    get_task_size - estimates the size of a task
+SYNOPSIS
+    get_task_size(task)
+        task    -> DBTask instance
+DESCRIPTION
+    Estimates the memory a pending task holds by the length of its additional arguments as JSON
+RETURNS
+    estimated size in bytes
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_task_size(task):
+    if task.payload is not None:
+        return len(task.payload)
+    return len(json.dumps(task.additional_args, default=get_json_value))
+
+
+"""
+NAME
+    get_action_type - gets the interned action type
+SYNOPSIS
+    get_action_type(action_type)
+        action_type     -> type of action to execute
+DESCRIPTION
+    Every task of the same action type shares the same string (see ACTION_TYPES)
+RETURNS
+    interned action type
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_action_type(action_type):
+    return ACTION_TYPES.get(action_type) or intern(str(action_type))
+
+
+"""
+NAME
+    get_object_name - gets the interned, title-cased object name
+SYNOPSIS
+    get_object_name(object_name)
+        object_name     -> name of object to deal with
+DESCRIPTION
+    Object names are title-cased once and kept in object_names (up to MAX_INTERNED_OBJECT_NAMES names)
+        every task of the same object shares the same string
+RETURNS
+    title-cased object name
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_object_name(object_name):
+    name = object_names.get(object_name)
+    if name is None:
+        name = str(object_name).title()
+        if len(object_names) < MAX_INTERNED_OBJECT_NAMES:
+            name = intern(name)
+            object_names[object_name] = name
+    return name
+
+
+"""
+NAME
+    get_json_value - converts values JSON does not support
+SYNOPSIS
+    get_json_value(value)
+        value   -> value to convert
+DESCRIPTION
+    Classes (ex: SQLAlchemy column types) are converted to their name (see get_sql_column)
+    datetimes, dates and Decimals are converted to a tagged dictionary - decoded back by get_python_value
+        { JSON_TYPE_KEY: name of the type (one of JSON_TYPES), "value": string of the value }
+    Anything else (ex: a datetime with a timezone) raises TypeError - it is never silently turned into a string
+RETURNS
+    string or tagged dictionary representing value
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_json_value(value):
+    if isinstance(value, type):
+        return value.__name__
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return {JSON_TYPE_KEY: "datetime", "value": value.strftime(JSON_TYPES["datetime"])}
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return {JSON_TYPE_KEY: "date", "value": value.strftime(JSON_TYPES["date"])}
+    if isinstance(value, Decimal):
+        return {JSON_TYPE_KEY: "decimal", "value": str(value)}
+    raise TypeError("{0!r} is not JSON serializable".format(value))
+
+
+"""
+NAME
+    get_python_value - converts tagged dictionaries of get_json_value back to their values
+SYNOPSIS
+    get_python_value(json_object)
+        json_object     -> dictionary decoded from JSON (object_hook of json.loads)
+DESCRIPTION
+    A dictionary of exactly JSON_TYPE_KEY and "value" is converted back to the value of its type
+        any other dictionary is returned as is
+RETURNS
+    datetime, date, Decimal or json_object
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_python_value(json_object):
+    if len(json_object) != 2 or "value" not in json_object:
+        return json_object
+    json_type = json_object.get(JSON_TYPE_KEY)
+    if json_type == "datetime":
+        return datetime.strptime(json_object["value"], JSON_TYPES["datetime"])
+    if json_type == "date":
+        return datetime.strptime(json_object["value"], JSON_TYPES["date"]).date()
+    if json_type == "decimal":
+        return Decimal(json_object["value"])
+    return json_object
+
+
+"""
+NAME
+    merge_insert_tasks - merges insert tasks of the same object into one task
+SYNOPSIS
+    merge_insert_tasks(tasks)
+        tasks   -> list of insert DBTask instances of the same object (in the order they were pushed)
+DESCRIPTION
+    The merged task inserts the rows of all tasks in one action (one session commit)
+        its arguments are only decoded when a worker performs it (see DBTask.get_additional_args)
+RETURNS
+    merged DBTask instance
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def merge_insert_tasks(tasks):
+    merged_task = DBTask("insert", tasks[0].object_name, lane=tasks[0].lane)
+    merged_task.args = None
+    merged_task.merged = tasks
+    merged_task.size = sum(task.size for task in tasks)
+    merged_task.enqueued_at = tasks[0].enqueued_at
+    return merged_task
+
+
+"""
+NAME
+    get_insert_rows - gets the rows inserted by insert tasks
+SYNOPSIS
+    get_insert_rows(tasks)
+        tasks   -> list of insert DBTask instances
+DESCRIPTION
+    "insert_data" of a task is either one row (dictionary) or a list of rows
+RETURNS
+    list of rows (dictionaries) in the order of tasks
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_insert_rows(tasks):
+    rows = []
+    for task in tasks:
+        insert_data = task.additional_args.get("insert_data", {})
+        if type(insert_data) is dict:
+            rows.append(insert_data)
+        else:
+            rows.extend(insert_data)
+    return rows
+
+
+"""
+NAME
+    get_insert_times - gets the datetimes the rows of insert tasks were created at
+SYNOPSIS
+    get_insert_times(tasks)
+        tasks   -> list of insert DBTask instances
+DESCRIPTION
+    "created_at" of a task is the time (in seconds since epoch) it was created at (see DBManager.create_task)
+        every row of the task was created at that time - rows of a task without one are created now
+RETURNS
+    list of datetimes - one per row of get_insert_rows(tasks), in the same order
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_insert_times(tasks):
+    now = datetime.now()
+    times = []
+    for task in tasks:
+        created_at = task.additional_args.get("created_at")
+        timestamp = datetime.fromtimestamp(created_at) if created_at is not None else now
+        insert_data = task.additional_args.get("insert_data", {})
+        times.extend([timestamp] * (1 if type(insert_data) is dict else len(insert_data)))
+    return times
+
+
+"""
+NAME
+    get_task_shard - gets the DBTaskList shard of an object
+SYNOPSIS
+    get_task_shard(object_name)
+        object_name     -> name of object to deal with (interned - see get_object_name)
+DESCRIPTION
+    Every object has a shard of its own - all tasks of an object belong to the same shard, and tasks of different
+        objects never share one (so they never wait for each other's lease)
+RETURNS
+    shard of the object (the object name)
+AUTHOR
+    Yoav Nathaniel
+DATE
+    10/18/2026
+"""
+def get_task_shard(object_name):
+    return object_name
+
+
 if __name__ == "__main__":
     task1 = DBTask("create", "yoav", holiday="christmas")
     task2 = DBTask("drop", "noam", holiday="yom kippur")
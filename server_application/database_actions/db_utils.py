@@ -6,6 +6,10 @@ from sqlalchemy.orm import sessionmaker, scoped_session
 
 from db_task import DBTaskList, DBTask
 from db_printer import DBPrinter
+from db_alert_rules import AlertRules
+from db_statement_cache import DBStatementCache
+from db_schema_cache import DBSchemaCache, SCHEMA_CACHE_PATH
+from db_journal import DBJournal, JOURNAL_PATH, JOURNAL_DURABILITY_WINDOW
 
 REM_TASKS_PATH = "/Users/yoavnathaniel/PycharmProjects/ActivityTrackr/remaining_tasks.json"
 
@@ -21,8 +25,13 @@ class DBUtils:
         session_maker   -> instance of sessionmaker to set defaults for new database sessions (sqlalchemy)
         session_class   -> the class used to generate new scoped session instances (sqlalchmey)
             scoped sessions are required for threads
+        journal         -> DBJournal instance - durable record of the tasks pushed to the DBTaskList
         tasks           -> DBTaskList instance - basically a queue of DBTask instances
         dynamic_objects -> dictionary containing all dynamic_objects in the system
+        alert_rules     -> AlertRules instance - in-memory index of the alert rules shared by all DBActions
+        statements      -> DBStatementCache instance - statements of the DB actions shared by all DBActions
+        row_counts      -> SQLAlchemy Table of the row counts of the dynamic objects (None until DBAction loads it)
+        schema          -> DBSchemaCache instance - snapshots of reflected tables and columns of tables
         printer         -> DBPrinter instance - allows thread-safe printing
     AUTHOR
         Yoav Nathaniel
@@ -34,10 +43,15 @@ class DBUtils:
     NAME
         __init__ - constructor to set up the variables
     SYNOPSIS
-        __init__(self, engine)
-            self        -> the instance of the class
-            engine      -> instance of Engine (sqlalchmey)
+        __init__(self, engine, journal_path=JOURNAL_PATH, journal_durability_window=JOURNAL_DURABILITY_WINDOW,
+                 schema_cache_path=SCHEMA_CACHE_PATH)
+            self                -> the instance of the class
+            engine              -> instance of Engine (sqlalchmey)
                 a database connection that allows direct execution of queries
+            journal_path        -> directory of the task journal (default is JOURNAL_PATH)
+            journal_durability_window   -> max seconds between pushing a task and fsync-ing its journal record
+                (default is JOURNAL_DURABILITY_WINDOW)
+            schema_cache_path   -> directory of the snapshots of reflected tables (default is SCHEMA_CACHE_PATH)
     DESCRIPTION
         The class constructor sets up the class variables and recovers any remaining tasks from the last time this ran
     RETURNS
@@ -47,34 +61,47 @@ class DBUtils:
     DATE
         4/25/2016
     """
-    def __init__(self, engine):
+    def __init__(self, engine, journal_path=JOURNAL_PATH, journal_durability_window=JOURNAL_DURABILITY_WINDOW,
+                 schema_cache_path=SCHEMA_CACHE_PATH):
         self.engine = engine
         self.metadata = MetaData(bind=engine)
         self.insp = inspect(engine)
         self.session_maker = sessionmaker(bind=engine)
         self.session_class = scoped_session(self.session_maker)
-        self.tasks = DBTaskList()
+        self.journal = DBJournal(journal_path, journal_durability_window)
+        self.tasks = DBTaskList(journal=self.journal)
         self.dynamic_objects = {}
+        self.alert_rules = AlertRules()
+        self.statements = DBStatementCache()
+        self.row_counts = None
+        self.schema = DBSchemaCache(schema_cache_path)
 
         self.printer = DBPrinter()
         self.printer.daemon = True
         self.printer.start()
 
         self.__load_remaining_tasks()
+        self.journal.start()
 
     """
     NAME
-        __load_remaining_tasks - loads and pushes pending tasks from a file
+        __load_remaining_tasks - loads and pushes pending tasks from the journal
     SYNOPSIS
         __load_remaining_tasks(self)
             self    -> the instance of the class
     DESCRIPTION
         Allows the recovery of any uncompleted database tasks from the last time this program ran
+            including tasks that were pending when the program crashed
 
-        Loads uncompleted tasks from REM_TASKS_PATH
-        For each uncompleted task, create a new DBTask instance and push it to the DBTaskList
+        1. open the journal - new records go to a new segment
+        2. replay the journal from the last checkpoint one record at a time
+            for each uncompleted task, create a new DBTask instance and push it to the DBTaskList
+            pushing appends the task to the new segment
+            once all are pushed, the old records are done and removed once the checkpoint moves
+        3. loads uncompleted tasks from REM_TASKS_PATH (written by versions without a journal)
+            removes the file REM_TASKS_PATH so next time this loads, it doesn't RELOAD the same tasks
 
-        Removes the file REM_TASKS_PATH so next time this loads, it doesn't RELOAD the same tasks
+        Recovered tasks skip the DBTaskList limits - they were already accepted once
     RETURNS
         None
     AUTHOR
@@ -83,18 +110,27 @@ class DBUtils:
         4/25/2016
     """
     def __load_remaining_tasks(self):
+        replayed = self.journal.replay()
+        self.journal.open()
+
+        for record in replayed:
+            new_task = DBTask(record.get("action"), record.get("object_name"), lane=record.get("lane"),
+                              **record.get("args"))
+            self.tasks.push(new_task, force=True)
+        self.journal.end_replay()
+
         if os.path.isfile(REM_TASKS_PATH):
             with open(REM_TASKS_PATH, "r") as f:
                 rem_tasks = json.loads(f.read()).get('remaining_tasks', [])
                 for rem_t in rem_tasks:
                     new_task = DBTask(rem_t.get("action"), rem_t.get("object_name"), **rem_t.get("additional_args"))
-                    self.tasks.push(new_task)
+                    self.tasks.push(new_task, force=True)
 
             os.remove(REM_TASKS_PATH)
 
     """
     NAME
-        record_remaining_tasks - saves pending tasks to a file
+        record_remaining_tasks - makes sure pending tasks are saved to disk
     SYNOPSIS
         record_remaining_tasks(self)
             self    -> the instance of the class
@@ -102,13 +138,9 @@ class DBUtils:
         Allows saving any uncompleted database tasks from the current process
             so they can be recovered and executed next time this loads
 
-        This only goes into effect IF there are more than 0 uncompleted tasks
-
-        Saves uncompleted tasks to REM_TASKS_PATH
-
-        1. Lock the DBTaskList so it cannot be popped anymore
-        2. convert the DBTaskList to a dictionary
-        3. write the dictionary as a JSON in the file
+        Every task is already in the journal from the moment it was pushed, so this only:
+            1. Locks the DBTaskList so it cannot be popped anymore
+            2. flushes and closes the journal
     RETURNS
         None
     AUTHOR
@@ -117,7 +149,5 @@ class DBUtils:
         4/25/2016
     """
     def record_remaining_tasks(self):
-        if self.tasks.get_size() > 0:
-            with open(REM_TASKS_PATH, "w") as f:
-                self.tasks.no_more_popping()
-                f.write(json.dumps(self.tasks.to_json(), indent=4))
\ No newline at end of file
+        self.tasks.no_more_popping()
+        self.journal.close()
\ No newline at end of file
@@ -1,5 +1,8 @@
 from threading import Thread, RLock
-from time import sleep
+from datetime import datetime
+
+from db_task import SHARD_AFFINITY_TASKS, READ_ACTIONS
+from db_future import DBTaskTimeout
 
 
 class DBWorker(Thread):
@@ -11,9 +14,14 @@ class DBWorker(Thread):
         daemon              -> indicated if this thread is shut down when the main thread shuts down (default is False)
         current_task        -> DBTask instance currently assigned for this worker to execute
         current_task_lock   -> RLock instance to make sure all actions on current_task are thread safe
+        time_assigned       -> datetime current_task was assigned (None if no task is assigned)
+        retired             -> boolean indicating the worker should exit once its current task is done
+        last_shard          -> shard of the last task this worker performed (None if no task was performed)
+        shard_streak        -> number of tasks in a row this worker performed from last_shard
         exit_event          -> Event instance to tell the worker it's time to shut down safely
         utils               -> DBUtils instance containing variables and objects needed through the system
         actioner            -> DBAction instance that actually performs all database actions
+        lane_names          -> list of names of DBTaskList lanes this worker pops from (None - all lanes)
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -27,12 +35,13 @@ class DBWorker(Thread):
     NAME
         __init__ - constructor to set the variables for the instance
     SYNOPSIS
-        __init__(self, worker_name, exit_event, utils, actioner)
+        __init__(self, worker_name, exit_event, utils, actioner, lane_names=None)
             self            -> the instance of the class
             worker_name     -> Thread name
             exit_event      -> Event that indicates when it's time to shut off the thread safely
             utils           -> DBUtils to be used for reaching 'global' tools
-            actioner        -> DBAction to execute database actions
+            actioner        -> DBAction to execute database actions - used by this worker only (it has its own session)
+            lane_names      -> list of names of DBTaskList lanes to pop from (default is None - all lanes)
     DESCRIPTION
         The constructor sets up the class variables
     RETURNS
@@ -42,11 +51,17 @@ class DBWorker(Thread):
     DATE
         4/25/2016
     """
-    def __init__(self, worker_name, exit_event, utils, actioner):
+    def __init__(self, worker_name, exit_event, utils, actioner, lane_names=None):
         Thread.__init__(self, name=worker_name)
         self.exit_event = exit_event
         self.utils = utils
         self.actioner = actioner
+        self.current_task_lock = RLock()
+        self.lane_names = lane_names
+        self.time_assigned = None
+        self.retired = False
+        self.last_shard = None
+        self.shard_streak = 0
 
     """
     NAME
@@ -57,16 +72,18 @@ class DBWorker(Thread):
     DESCRIPTION
         default function called after thread is started
 
-        While exit_event is not set:
-            if a task is assigned:
-                1. perform the task using actioner
-                    if any exceptions occur, print exception and move on
-                2. make the worker available - remove task
-            else:
-                sleep 150 milliseconds and restart loop
+        While exit_event is not set and the worker is not retired:
+            if no task is assigned:
+                wait on the DBTaskList until a task of lane_names can be popped (blocking - no polling)
+                    prefer the shard of the last task for up to SHARD_AFFINITY_TASKS tasks in a row
+                    DBPool wakes the worker up with DBTaskList.wake_all() when it's time to exit
+            1. perform the task (see __perform_task__)
+            2. tell the DBTaskList the task is done - releases the task's shard
+            3. make the worker available - remove task
 
-        Once exit_event is set:
-            stop thread
+        Once exit_event is set (or the worker is retired):
+            1. close the session of actioner
+            2. stop thread
     RETURNS
         None
     AUTHOR
@@ -76,19 +93,75 @@ class DBWorker(Thread):
     """
     def run(self):
         while True:
-            if self.exit_event.isSet():
+            if self.__should_stop__():
                 self.utils.printer.push("{0} is exiting now.".format(self.getName()))
+                self.actioner.close()
                 break
 
             if self.__is_available__():
-                sleep(0.15)
+                preferred_shard = None
+                if self.shard_streak < SHARD_AFFINITY_TASKS:
+                    preferred_shard = self.last_shard
+
+                task_to_do = self.utils.tasks.pop(block=True, should_stop=self.__should_stop__,
+                                                  preferred_shard=preferred_shard, lane_names=self.lane_names)
+                if task_to_do is None or not self.add_task(task_to_do):
+                    continue
+
+            # self.utils.printer.push("{0} just got busy".format(self.getName()))
+            task_to_do = self.current_task
+            self.__perform_task__(task_to_do)
+            self.utils.tasks.task_done(task_to_do)
+
+            if task_to_do.shard == self.last_shard:
+                self.shard_streak += 1
+            else:
+                self.last_shard = task_to_do.shard
+                self.shard_streak = 1
+            self.__make_available__()
+
+    """
+    NAME
+        __perform_task__ - performs a DBTask and resolves whoever waits for it
+    SYNOPSIS
+        __perform_task__(self, task_to_do)
+            self        -> the instance of the class
+            task_to_do  -> DBTask instance to perform
+    DESCRIPTION
+        If task_to_do is a select (READ_ACTIONS) whose deadline passed (see DBFuture), it is skipped
+            nobody waits for it anymore
+
+        Performs task_to_do using actioner
+            if any exceptions occur, print exception and move on
+
+        The future of task_to_do (or of every task it was merged from) gets the result or the exception
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __perform_task__(self, task_to_do):
+        if task_to_do.action in READ_ACTIONS and task_to_do.future is not None and task_to_do.future.is_expired():
+            task_to_do.future.set_exception(DBTaskTimeout(task_to_do.action, task_to_do.object_name))
+            return
+
+        result = None
+        exception = None
+        try:
+            result = self.actioner.create_new_action(task_to_do)
+        except Exception as e:
+            print e
+            exception = e
+
+        for done_task in task_to_do.merged or [task_to_do]:
+            if done_task.future is None:
+                continue
+            if exception is not None:
+                done_task.future.set_exception(exception)
             else:
-                # self.utils.printer.push("{0} just got busy".format(self.getName()))
-                try:
-                    self.actioner.create_new_action(self.current_task)
-                except Exception as e:
-                    print e
-                self.__make_available__()
+                done_task.future.set_result(result)
 
     """
     NAME
@@ -98,7 +171,8 @@ class DBWorker(Thread):
             self            -> the instance of the class
             db_task_to_do   -> DBTask instance to assign to the worker
     DESCRIPTION
-        This function should be called by DBPool to assign a pending task to a worker
+        The worker calls this function for every task it pops from the DBTaskList
+        DBPool may also call it to hand a task directly to a new worker (ex: the task of a stuck worker)
 
         Only assigns a task if the worker is available
     RETURNS
@@ -110,11 +184,52 @@ class DBWorker(Thread):
         4/25/2016
     """
     def add_task(self, db_task_to_do):
-        if self.__is_available__():
-            self.current_task = db_task_to_do
-            return True
-        else:
-            return False
+        with self.current_task_lock:
+            if self.current_task is None:
+                self.current_task = db_task_to_do
+                self.time_assigned = datetime.now()
+                return True
+            else:
+                return False
+
+    """
+    NAME
+        retire - asks the worker to exit once its current task is done
+    SYNOPSIS
+        retire(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        Marks the worker as retired so it stops popping new tasks from the DBTaskList
+
+        The caller should call DBTaskList.wake_all() so an idle worker notices right away
+    RETURNS
+        None
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def retire(self):
+        self.retired = True
+
+    """
+    NAME
+        __should_stop__ - checks if the worker should exit
+    SYNOPSIS
+        __should_stop__(self)
+            self    -> the instance of the class
+    DESCRIPTION
+        The worker should exit if exit_event is set or if the worker was retired
+    RETURNS
+        True if the worker should exit
+        else, returns False
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+    def __should_stop__(self):
+        return self.retired or self.exit_event.isSet()
 
     """
     NAME
@@ -160,4 +275,5 @@ class DBWorker(Thread):
     """
     def __make_available__(self):
         with self.current_task_lock:
-            self.current_task = None
\ No newline at end of file
+            self.current_task = None
+            self.time_assigned = None
\ No newline at end of file
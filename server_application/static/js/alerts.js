@@ -1,5 +1,5 @@
-var current_f_offset = 0
-var current_r_offset = 0
+var f_page_cursors = [""]
+var r_page_cursors = [""]
 var reached_max_f_next = false;
 var reached_max_r_next = false;
 
@@ -9,8 +9,8 @@ NAME
 Synopsis
     get_next_f_page()
 DESCRIPTION
-    increases the target offset of the database
-        For example, if showing findings 0-4, increase offset to 5 so the page will show 5-9
+    pushes the cursor of the next page (next_f_cursor of the page shown) onto f_page_cursors
+        the database seeks past the last finding shown instead of counting findings from the start
     calls get_different_f_page function
 
     makes sure to enable the "previous page" button so the user can go back
@@ -22,12 +22,14 @@ DATE
     5/9/2016
 */
 function get_next_f_page() {
-    current_f_offset += page_limit
+    if (next_f_cursor == null) {
+        return
+    }
+
+    f_page_cursors.push(next_f_cursor)
     get_different_f_page()
 
-    if (current_f_offset != 0) {
-        $("#findings button[name='prev-btn").prop("disabled", false)
-    }
+    $("#findings button[name='prev-btn").prop("disabled", false)
 }
 
 /*
@@ -36,8 +38,8 @@ NAME
 Synopsis
     get_next_r_page()
 DESCRIPTION
-    increases the target offset of the database
-        For example, if showing rules 0-4, increase offset to 5 so the page will show 5-9
+    pushes the cursor of the next page (next_r_cursor of the page shown) onto r_page_cursors
+        the database seeks past the last rule shown instead of counting rules from the start
     calls get_different_r_page function
 
     makes sure to enable the "previous page" button so the user can go back
@@ -49,12 +51,14 @@ DATE
     5/9/2016
 */
 function get_next_r_page() {
-    current_r_offset += page_limit
+    if (next_r_cursor == null) {
+        return
+    }
+
+    r_page_cursors.push(next_r_cursor)
     get_different_r_page()
 
-    if (current_r_offset != 0) {
-        $("#rules button[name='prev-btn").prop("disabled", false)
-    }
+    $("#rules button[name='prev-btn").prop("disabled", false)
 }
 
 /*
@@ -63,15 +67,12 @@ NAME
 Synopsis
     get_previous_f_page()
 DESCRIPTION
-    Makes sure the user is not trying to go back to a negative offset.
+    Makes sure the user is not trying to go back from the first page.
 
-    decreases the target offset of the database
-        For example, if showing findings 5-9, decrease offset to 0 so the page will be 0-4
+    pops the cursor of the page shown off f_page_cursors - the cursor of the previous page is on top
     calls get_different_f_page function
 
-    potentially disables the "previous page" button so the user will not be able to go back to negative offsets
-
-    makes sure to enable the "next page" button so the user can go forward again
+    potentially disables the "previous page" button on the first page
 RETURNS
     null
 AUTHOR
@@ -80,20 +81,17 @@ DATE
     5/9/2016
 */
 function get_previous_f_page() {
-    if (current_f_offset == 0) {
+    if (f_page_cursors.length == 1) {
         return
 
     }
 
-    current_f_offset -= page_limit
+    f_page_cursors.pop()
     get_different_f_page()
 
-    if (current_f_offset == 0) {
+    if (f_page_cursors.length == 1) {
         $("#findings button[name='prev-btn").prop("disabled", true)
     }
-
-    // clicking the "previous" button would make it not the last page
-    $("#findings button[name='next-btn").prop("disabled", false)
 }
 
 /*
@@ -102,15 +100,12 @@ NAME
 Synopsis
     get_previous_r_page()
 DESCRIPTION
-    Makes sure the user is not trying to go back to a negative offset.
+    Makes sure the user is not trying to go back from the first page.
 
-    decreases the target offset of the database
-        For example, if showing rules 5-9, decrease offset to 0 so the page will be 0-4
+    pops the cursor of the page shown off r_page_cursors - the cursor of the previous page is on top
     calls get_different_r_page function
 
-    potentially disables the "previous page" button so the user will not be able to go back to negative offsets
-
-    makes sure to enable the "next page" button so the user can go forward again
+    potentially disables the "previous page" button on the first page
 RETURNS
     null
 AUTHOR
@@ -119,20 +114,17 @@ DATE
     5/9/2016
 */
 function get_previous_r_page() {
-    if (current_r_offset == 0) {
+    if (r_page_cursors.length == 1) {
         return
 
     }
 
-    current_r_offset -= page_limit
+    r_page_cursors.pop()
     get_different_r_page()
 
-    if (current_r_offset == 0) {
+    if (r_page_cursors.length == 1) {
         $("#rules button[name='prev-btn").prop("disabled", true)
     }
-
-    // clicking the "previous" button would make it not the last page
-    $("#rules button[name='next-btn").prop("disabled", false)
 }
 
 /*
@@ -141,12 +133,12 @@ NAME
 Synopsis
     get_different_f_page()
 DESCRIPTION
-    Synchronously calls the SELECT API to get the next/previous rows of alert findings
-        requests page_limit (currently set to 5) + 2 = 7 findings
+    Synchronously calls the SELECT API to get the page of alert findings after the cursor on top of f_page_cursors
+        requests page_limit (currently set to 5) findings
 
-        If I get 0 findings, remain in current page
-        If I get 1 - page_limit findings, show requested page and disable "next page" button
-        If I get more than page_limit findings, show requested page and keep "next page" button enabled
+        If I get 0 findings, go back to the previous page
+        If the page has no next_cursor, it is the last page - disable "next page" button
+        Else, keep "next page" button enabled
 
     calls fill_valued_f_rows and clear_remaining_f_rows to change the actual table of data
 
@@ -158,16 +150,16 @@ DATE
     5/9/2016
 */
 function get_different_f_page() {
-    var select_object_data_url = "/api/tracking/select?object_name=_Alert_Finds&column_data=_id,rule_name,object_name,column_name,found_value"
-    select_object_data_url += "&limit=" + (page_limit+2) + "&offset=" + current_f_offset
+    var select_object_data_url = "/api/tracking/select?object_name=_Alert_Finds"
+    select_object_data_url += "&column_data=_id,rule_name,object_name,column_name,found_value"
+    select_object_data_url += "&limit=" + page_limit
+    select_object_data_url += "&cursor=" + encodeURIComponent(f_page_cursors[f_page_cursors.length - 1])
 
     $.get(select_object_data_url, function(data) {
         page_data = data.page_data
+        next_f_cursor = data.next_cursor
 
-        if (page_data.length < (page_limit+1)) {
-            // reached the max page
-            $("#findings button[name='next-btn").prop("disabled", true)
-        }
+        $("#findings button[name='next-btn").prop("disabled", next_f_cursor == null)
         if (page_data.length > 0) {
             fill_valued_f_rows(page_data)
             clear_remaining_f_rows(page_data.length)
@@ -184,12 +176,12 @@ NAME
 Synopsis
     get_different_r_page()
 DESCRIPTION
-    Synchronously calls the SELECT API to get the next/previous rows of alert rules
-        requests page_limit (currently set to 5) + 2 = 7 findings
+    Synchronously calls the SELECT API to get the page of alert rules after the cursor on top of r_page_cursors
+        requests page_limit (currently set to 5) rules
 
-        If I get 0 rules, remain in current page
-        If I get 1 - page_limit rules, show requested page and disable "next page" button
-        If I get more than page_limit rules, show requested page and keep "next page" button enabled
+        If I get 0 rules, go back to the previous page
+        If the page has no next_cursor, it is the last page - disable "next page" button
+        Else, keep "next page" button enabled
 
     calls fill_valued_r_rows and clear_remaining_r_rows to change the actual table of data
 
@@ -203,15 +195,14 @@ DATE
 function get_different_r_page() {
     var select_object_data_url = "/api/tracking/select?object_name=_Alert_Rules"
     select_object_data_url += "&column_data=_id,name,object_name,column_name,column_value"
-    select_object_data_url += "&limit=" + (page_limit+2) + "&offset=" + current_r_offset
+    select_object_data_url += "&limit=" + page_limit
+    select_object_data_url += "&cursor=" + encodeURIComponent(r_page_cursors[r_page_cursors.length - 1])
 
     $.get(select_object_data_url, function(data) {
         page_data = data.page_data
+        next_r_cursor = data.next_cursor
 
-        if (page_data.length < (page_limit+1)) {
-            // reached the max page
-            $("#rules button[name='next-btn").prop("disabled", true)
-        }
+        $("#rules button[name='next-btn").prop("disabled", next_r_cursor == null)
         if (page_data.length > 0) {
             fill_valued_r_rows(page_data)
             clear_remaining_r_rows(page_data.length)
@@ -1,4 +1,4 @@
-var current_offset = 0
+var page_cursors = [""]
 var reached_max_next = false;
 
 
@@ -8,8 +8,8 @@ NAME
 Synopsis
     get_next_page()
 DESCRIPTION
-    increases the target offset of the database
-        For example, if showing rows 0-4, increase offset to 5 so the page will show 5-9
+    pushes the cursor of the next page (next_cursor of the page shown) onto page_cursors
+        the database seeks past the last row shown instead of counting rows from the start
     calls get_different_page function
 
     makes sure to enable the "previous page" button so the user can go back
@@ -21,12 +21,14 @@ DATE
     5/9/2016
 */
 function get_next_page() {
-    current_offset += page_limit
+    if (next_cursor == null) {
+        return
+    }
+
+    page_cursors.push(next_cursor)
     get_different_page()
 
-    if (current_offset != 0) {
-        $("button[name='prev-btn").prop("disabled", false)
-    }
+    $("button[name='prev-btn").prop("disabled", false)
 }
 
 /*
@@ -35,11 +37,10 @@ NAME
 Synopsis
     get_previous_page()
 DESCRIPTION
-    increases the target offset of the database
-        For example, if showing rows 0-4, increase offset to 5 so the page will show 5-9
+    pops the cursor of the page shown off page_cursors - the cursor of the previous page is on top
     calls get_different_page function
 
-    makes sure to enable the "previous page" button so the user can go back
+    potentially disables the "previous page" button on the first page
 RETURNS
     null
 AUTHOR
@@ -48,20 +49,17 @@ DATE
     5/9/2016
 */
 function get_previous_page() {
-    if (current_offset == 0) {
+    if (page_cursors.length == 1) {
         return
 
     }
 
-    current_offset -= page_limit
+    page_cursors.pop()
     get_different_page()
 
-    if (current_offset == 0) {
+    if (page_cursors.length == 1) {
         $("button[name='prev-btn").prop("disabled", true)
     }
-
-    // clicking the "previous" button would make it not the last page
-    $("button[name='next-btn").prop("disabled", false)
 }
 
 /*
@@ -70,12 +68,12 @@ NAME
 Synopsis
     get_different_page()
 DESCRIPTION
-    Synchronously calls the SELECT API to get the next/previous rows of tracker events
-        requests page_limit (currently set to 5) + 2 = 7 events
+    Synchronously calls the SELECT API to get the page of tracker events after the cursor on top of page_cursors
+        requests page_limit (currently set to 5) events
 
-        If I get 0 events, remain in current page
-        If I get 1 - page_limit events, show requested page and disable "next page" button
-        If I get more than page_limit events, show requested page and keep "next page" button enabled
+        If I get 0 events, go back to the previous page
+        If the page has no next_cursor, it is the last page - disable "next page" button
+        Else, keep "next page" button enabled
 
     calls fill_valued_rows and clear_remaining_rows to change the actual table of data
 RETURNS
@@ -87,15 +85,14 @@ DATE
 */
 function get_different_page() {
     var select_object_data_url = "/api/tracking/select?object_name=" + object_name + "&column_data=" + select_columns
-    select_object_data_url += "&limit=" + (page_limit+2) + "&offset=" + current_offset
+    select_object_data_url += "&limit=" + page_limit
+    select_object_data_url += "&cursor=" + encodeURIComponent(page_cursors[page_cursors.length - 1])
 
     $.get(select_object_data_url, function(data) {
         page_data = data.page_data
+        next_cursor = data.next_cursor
 
-        if (page_data.length < (page_limit+1)) {
-            // reached the max page
-            $("button[name='next-btn").prop("disabled", true)
-        }
+        $("button[name='next-btn").prop("disabled", next_cursor == null)
         if (page_data.length > 0) {
             fill_valued_rows(page_data)
             clear_remaining_rows(page_data.length)
@@ -1,14 +1,34 @@
-from flask import Flask, jsonify, render_template, request, redirect, session
+from flask import Flask, Response, jsonify, render_template, request, redirect, session
 
 import json
 from collections import Counter
 from functools import wraps
+from itertools import chain, islice
 from time import sleep
 
 from database_actions.db_manager import DBManager
-from database_actions.db_task import DBTask
+from database_actions.db_task import DBTaskListFull
+from database_actions.db_action import verify_index_columns, get_index_name
+from database_actions.db_future import DBTaskTimeout
 from database_actions import USER_MANAGEMENT_OBJECT_NAME, ALERT_RULES_OBJECT_NAME, ALERT_FINDS_OBJECT_NAME, DEFAULT_OBJECT_NAMES
 
+# max seconds a request waits for the rows of a select (the first rows of a streamed select)
+SELECT_TIMEOUT = 10
+
+# formats of a streamed select (the "stream" parameter of /api/tracking/select) and their mimetypes
+#   json - the same { "page_data": [ rows ] } object as a regular select, sent row by row
+#   ndjson - one JSON object per line per row
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson"
+}
+
+# rows per piece of a streamed response
+STREAM_RESPONSE_ROWS = 200
+
+# rows per page of the tables of the tracker profile and alerts pages
+PAGE_ROWS = 5
+
 
 
 def stop_backend(db_manager):
@@ -212,6 +232,7 @@ def start_backend():
         get_all_trackers()
     DESCRIPTION
         Gathers data from custom objects to display in the table format about all of the available APIs
+        A tracker whose row count is not known yet shows the estimate of PostgreSQL (~N) - tables are never scanned
     RETURNS
         rendered JINJA2 template of the all trackers page
     AUTHOR
@@ -227,13 +248,21 @@ def start_backend():
             "user_name": session.get("user_name"),
             "trackers": []
         }
+        count_estimates = None
         for object_name, values in db_manager.utils.dynamic_objects.iteritems():
             if object_name in DEFAULT_OBJECT_NAMES:
                 continue
 
+            count = values["count"]
+            if count == -1:
+                if count_estimates is None:
+                    count_estimates = db_manager.get_count_estimates()
+                if values["table_name"] in count_estimates:
+                    count = "~{0}".format(count_estimates[values["table_name"]])
+
             data["trackers"].append({
                 "name": object_name,
-                "count": values["count"],
+                "count": count,
                 "api": values["api"]
             })
         return render_template("all_trackers.html", data=data)
@@ -307,12 +336,10 @@ def start_backend():
                 object_columns[col_name] = col_type.replace("()", "").split(" ")[0]
                 object_columns_example_request[col_name] = col_type.replace("()", "").split(" ")[0]
 
-        # get all results from the tracker's table
-        tracker_data = select_data(object_name=tracker_name,
-                                   where_data={},
-                                   column_data=object_columns.keys(),
-                                   limit=7,
-                                   offset=0)
+        # get the first page of the tracker's table - the next pages are requested by cursor
+        tracker_page = page_data(object_name=tracker_name,
+                                 column_data=object_columns.keys(),
+                                 limit=PAGE_ROWS)
 
         # generate data to be inserted into the profile page
         data = {
@@ -322,7 +349,8 @@ def start_backend():
             "url": "https://customer.actmonitor.com/api/tracking/insert/{0}".format(tracker_api),
             "columns": object_columns,
             "example_columns": object_columns_example_request,
-            "tracker_data": tracker_data
+            "tracker_data": tracker_page["page_data"],
+            "next_cursor": tracker_page["next_cursor"]
         }
         return render_template("tracker_profile.html", data=data)
 
@@ -375,23 +403,21 @@ def start_backend():
     @app.route("/alerts/", methods=["GET"])
     @is_authenticated
     def get_alerts_page():
-        rule_data = select_data(object_name="_Alert_Rules",
-                                   where_data={},
-                                   column_data=["_id", "name", "object_name", "column_name", "column_value"],
-                                   limit=7,
-                                   offset=0)
-
-        alert_data = select_data(object_name="_Alert_Finds",
-                                   where_data={},
-                                   column_data=["_id", "rule_name", "object_name", "column_name", "found_value"],
-                                   limit=7,
-                                   offset=0)
+        rule_page = page_data(object_name=ALERT_RULES_OBJECT_NAME,
+                              column_data=["_id", "name", "object_name", "column_name", "column_value"],
+                              limit=PAGE_ROWS)
+
+        alert_page = page_data(object_name=ALERT_FINDS_OBJECT_NAME,
+                               column_data=["_id", "rule_name", "object_name", "column_name", "found_value"],
+                               limit=PAGE_ROWS)
 
         data = {
             "name": "Alerts",
             "user_name": session.get("user_name"),
-            "rules": rule_data,
-            "alerts": alert_data
+            "rules": rule_page["page_data"],
+            "rules_next_cursor": rule_page["next_cursor"],
+            "alerts": alert_page["page_data"],
+            "alerts_next_cursor": alert_page["next_cursor"]
         }
         return render_template("alerts.html", data=data)
 
@@ -417,6 +443,59 @@ def start_backend():
             "user_name": session.get("user_name"),}
         return render_template('not_found.html', data=data), 404
 
+    '''
+    NAME
+        task_queue_full - Flask error handler for a task refused by the full database task queue
+    SYNOPSIS
+        task_queue_full(e)
+            e       -> DBTaskListFull raised while creating a database task
+    DESCRIPTION
+        this handler is called when any route fails to create a database task because the task queue is full
+        tells the client to try again later instead of growing the queue without limit
+    RETURNS
+        JSON object with status 503 (Service Unavailable) and a Retry-After header
+            {
+                "status": "fail",
+                "status_description": reason
+            }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    @app.errorhandler(DBTaskListFull)
+    def task_queue_full(e):
+        response = jsonify({"status": "fail", "status_description": str(e)})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response
+
+    '''
+    NAME
+        task_timed_out - Flask error handler for a database task that did not finish in time
+    SYNOPSIS
+        task_timed_out(e)
+            e       -> DBTaskTimeout raised while waiting for a database task
+    DESCRIPTION
+        this handler is called when any route gives up waiting for a database task (ex: a slow select)
+        the request thread is freed instead of hanging until the database answers
+    RETURNS
+        JSON object with status 504 (Gateway Timeout)
+            {
+                "status": "fail",
+                "status_description": reason
+            }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    @app.errorhandler(DBTaskTimeout)
+    def task_timed_out(e):
+        response = jsonify({"status": "fail", "status_description": str(e)})
+        response.status_code = 504
+        return response
+
     ###########
     # APIs
     ###########
@@ -469,8 +548,15 @@ def start_backend():
                         "nullable": True/False,
                         "unique": True/False
                     }
+                ],
+                "indexes": [
+                    property_name,
+                    [ property_name, property_name ]
                 ]
             }
+        "indexes" is optional - each item indexes a property, or a list of properties (composite index)
+            filters and sorts on indexed properties do not scan the whole table
+            _timestamp_created is always indexed
     RETURNS
         JSON object with status of dynamic object creation.
     AUTHOR
@@ -487,6 +573,7 @@ def start_backend():
         # extract needed variables
         object_name = data.get("name")
         object_properties = data.get("properties")
+        object_indexes = data.get("indexes") or []
         api_url = object_name.lower().replace(" ", "_").replace("-", "_")
 
         if object_name[0] == "_":
@@ -503,8 +590,18 @@ def start_backend():
                 "status_description": "Attempted to duplicate a tracker!"
             })
 
+        # make sure every index is of existing properties
+        property_names = [prop.get("name") for prop in object_properties or []] + ["_id", "_timestamp_created",
+                                                                                   "_timestamp_modified"]
+        try:
+            for index_columns in object_indexes:
+                verify_index_columns(object_name, index_columns, property_names)
+        except ValueError as e:
+            return jsonify({"status": "fail", "status_description": str(e)})
+
         # not duplicating! create a new task to create object
-        db_manager.create_task("create", object_name, properties=object_properties, api_url=api_url)
+        db_manager.create_task("create", object_name, properties=object_properties, api_url=api_url,
+                               indexes=object_indexes)
         return jsonify({"status": "success"})
 
     '''
@@ -546,6 +643,7 @@ def start_backend():
             adds another row to the table
     RETURNS
         { "status": "success" }
+        if the task queue is full, status 503 with a Retry-After header (see task_queue_full)
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -719,10 +817,25 @@ def start_backend():
                     "column_name"
                 ],
                 "limit": 0,
-                "offset": 0
+                "offset": 0,
+                "stream": "ndjson",
+                "cursor": "",
+                "page_by": "_id"
             }
+
+        If "stream" is one of STREAM_FORMATS, the rows are streamed (chunked response) instead of collected first
+            the database hands them over chunk by chunk (server-side cursor) - memory stays flat however many rows
+            the response starts once the first rows arrive (or fails with 503/504 like a regular select)
+
+        If "cursor" is given, returns the page of "limit" rows after the cursor (keyset pagination) - offset is ignored
+            "cursor" is empty for the first page, then the "next_cursor" of the previous page
+            "page_by" is "_id" (default) or "_timestamp_created"
+            every page costs the same however deep it is - the database seeks past the cursor on an index
     RETURNS
-        { "status": "success" }
+        { "page_data": [ rows ] }
+        with "stream": "ndjson" - one row per line
+        with "cursor" - { "page_data": [ rows ], "next_cursor": cursor of the next page (null on the last page) }
+            an invalid cursor or page_by returns status 400
     AUTHOR
         Yoav Nathaniel
     DATE
@@ -737,8 +850,35 @@ def start_backend():
         column_data = request.args.get("column_data").split(",")
         column_data = map(lambda x: str(x), column_data)
 
-        limit = request.args.get("limit", 0)
-        offset = request.args.get("offset", 0)
+        limit = int(request.args.get("limit", 0))
+        offset = int(request.args.get("offset", 0))
+
+        if "cursor" in request.args:
+            try:
+                page = page_data(object_name=object_name,
+                                 where_data=where_data,
+                                 column_data=column_data,
+                                 limit=limit,
+                                 cursor=request.args.get("cursor"),
+                                 page_by=request.args.get("page_by", "_id"))
+            except ValueError as e:
+                response = jsonify({"status": "fail", "status_description": str(e)})
+                response.status_code = 400
+                return response
+            return jsonify(page)
+
+        stream_format = request.args.get("stream")
+        if stream_format in STREAM_FORMATS:
+            stream = stream_data(object_name=object_name,
+                                 where_data=where_data,
+                                 column_data=column_data,
+                                 limit=limit,
+                                 offset=offset)
+            rows = stream.iter_rows()
+            # wait for the first rows here - a full queue or a timeout still gets its own status code
+            first_rows = list(islice(rows, 1))
+            return Response(generate_stream_response(stream, chain(first_rows, rows), stream_format),
+                            mimetype=STREAM_FORMATS[stream_format])
 
         data_to_return = select_data(object_name=object_name,
                                      where_data=where_data,
@@ -812,6 +952,112 @@ def start_backend():
 
         return jsonify(users_data)
 
+    '''
+    NAME
+        get_queue_stats_api - Flask route for API to get the state of the database task queue
+    SYNOPSIS
+        get_queue_stats_api()
+    DESCRIPTION
+        API only accepting GET requests
+        Allows authenticated users to see how many tasks wait in every lane of the task queue and for how long
+            and how many database workers perform them
+    RETURNS
+        {
+            "lanes": [
+                {
+                    "name": "ingest",
+                    "weight": 3,
+                    "depth": 120,
+                    "oldest_wait_ms": 35.2,
+                    "popped": 5021,
+                    "avg_wait_ms": 4.1,
+                    "max_wait_ms": 812.5
+                }
+            ],
+            "pool": {
+                "writers": 4,
+                "busy_writers": 3,
+                "readers": 2,
+                "min_workers": 2,
+                "max_workers": 12,
+                "utilization": 0.8,
+                "scale_ups": 2,
+                "scale_downs": 1,
+                "last_scale_reason": "DBPool grew from 3 to 4 writers (depth=180, oldest_wait_ms=1210.4, ...)"
+            }
+        }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    @app.route("/api/admin/queue-stats", methods=["GET"])
+    @is_authenticated
+    def get_queue_stats_api():
+        return jsonify({"lanes": db_manager.get_queue_stats(), "pool": db_manager.get_pool_stats()})
+
+    '''
+    NAME
+        create_indexes_api - Flask route for API to index properties of an existing dynamic object
+    SYNOPSIS
+        create_indexes_api()
+    DESCRIPTION
+        API only accepting POST requests
+        Allows authenticated users to index properties of a tracker - filters and sorts on them stop scanning the
+            whole table
+
+        Request body looks like the following:
+            {
+                "name": object_name,
+                "indexes": [
+                    property_name,
+                    [ property_name, property_name ]
+                ]
+            }
+        Each item indexes a property, or a list of properties (composite index)
+            an unknown tracker, or an index of properties the tracker does not have, is refused with status 400
+            before any index is requested (same check as when the tracker is created - see verify_index_columns)
+
+        This function is asynchronous - every index is built by a database task of its own without blocking writes
+            to the tracker (an existing index is not built again)
+    RETURNS
+        If successful
+            { "status": "success", "indexes": [ names of the indexes ] }
+        else (status 400)
+            { "status": "fail", "status_description": reason }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    @app.route("/api/admin/create-indexes", methods=["POST"])
+    @is_authenticated
+    def create_indexes_api():
+        # convert POSTed data
+        data = request.get_json(force=True)
+
+        object_name = data.get("name")
+        object_indexes = data.get("indexes") or []
+
+        if object_name not in db_manager.utils.dynamic_objects or object_name in DEFAULT_OBJECT_NAMES:
+            return jsonify({"status": "fail",
+                            "status_description": "Unrecognized tracker: {0}".format(object_name)}), 400
+
+        # make sure every index is of existing properties - nothing is requested otherwise
+        table_name = db_manager.utils.dynamic_objects[object_name]["table_name"]
+        property_names = [column["name"] for column in db_manager.get_columns_in_table(table_name)]
+        try:
+            all_index_columns = [verify_index_columns(object_name, index_columns, property_names)
+                                 for index_columns in object_indexes]
+        except ValueError as e:
+            return jsonify({"status": "fail", "status_description": str(e)}), 400
+
+        index_names = []
+        for column_names in all_index_columns:
+            db_manager.create_task("create_index", object_name, columns=column_names)
+            index_names.append(get_index_name(table_name, column_names))
+        return jsonify({"status": "success", "indexes": index_names})
+
     ###########
     # Database Action Helper Functions
     ###########
@@ -910,7 +1156,8 @@ def start_backend():
     DESCRIPTION
         Performs a database task to update some rows for some table
 
-        This function is synchronous
+        This function is synchronous - the select runs on a reader of the DBPool (read lane)
+            waits up to SELECT_TIMEOUT seconds, then raises DBTaskTimeout
 
         Can be selective by the where_data parameter. Similar to the sql 'WHERE'
     RETURNS
@@ -932,14 +1179,139 @@ def start_backend():
             where_data = {}
         if column_data is None:
             column_data = []
-        return db_manager.pool.action.create_new_action(DBTask(action_type="select",
-                                                               object_name=object_name,
-                                                               where_data=where_data,
-                                                               select_data=column_data,
-                                                               limit=limit,
-                                                               offset=offset,
-                                                               order_by=order_by,
-                                                               sort_order=sort_order))
+        return db_manager.create_task("select", object_name,
+                                      timeout=SELECT_TIMEOUT,
+                                      where_data=where_data,
+                                      select_data=column_data,
+                                      limit=limit,
+                                      offset=offset,
+                                      order_by=order_by,
+                                      sort_order=sort_order).wait()
+
+    '''
+    NAME
+        stream_data - general helper function to stream rows of a dynamic object
+    SYNOPSIS
+        stream_data(object_name, where_data=None, column_data=None, limit=0, offset=0, order_by="_id", sort_order=True)
+            object_name     -> name of dynamic object to select from
+            where_data      -> dictionary of columns and values to filter by (default is None - all rows)
+            column_data     -> list of column names to select (default is None - no columns)
+            limit           -> max number of rows (default is 0 - all rows)
+            offset          -> number of rows to skip (default is 0)
+            order_by        -> column to sort by (default is "_id")
+            sort_order      -> True if ascending (default), False if descending
+    DESCRIPTION
+        Creates a "stream" task - a reader of the DBPool fetches the rows from a server-side cursor chunk by chunk
+            the first chunk must arrive within SELECT_TIMEOUT seconds
+    RETURNS
+        DBStream instance - iter_rows() yields the rows
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    def stream_data(object_name, where_data=None, column_data=None, limit=0, offset=0, order_by="_id",
+                    sort_order=True):
+        if where_data is None:
+            where_data = {}
+        if column_data is None:
+            column_data = []
+        return db_manager.create_task("stream", object_name,
+                                      timeout=SELECT_TIMEOUT,
+                                      where_data=where_data,
+                                      select_data=column_data,
+                                      limit=limit,
+                                      offset=offset,
+                                      order_by=order_by,
+                                      sort_order=sort_order)
+
+    '''
+    NAME
+        page_data - general helper function to select a page of rows of a dynamic object
+    SYNOPSIS
+        page_data(object_name, where_data=None, column_data=None, limit=0, cursor=None, page_by="_id", sort_order=True)
+            object_name     -> name of dynamic object to select from
+            where_data      -> dictionary of columns and values to filter by (default is None - all rows)
+            column_data     -> list of column names to select (default is None - no columns)
+            limit           -> number of rows of the page (default is 0 - the default page size of DBAction)
+            cursor          -> next_cursor of the previous page (default is None - the first page)
+            page_by         -> "_id" (default) or "_timestamp_created"
+            sort_order      -> True if ascending (default), False if descending
+    DESCRIPTION
+        Creates a "page" task - a reader of the DBPool seeks past the cursor instead of skipping rows with an offset
+
+        This function is synchronous - waits up to SELECT_TIMEOUT seconds, then raises DBTaskTimeout
+        Raises ValueError if the cursor or page_by is invalid
+    RETURNS
+        { "page_data": [ rows ], "next_cursor": cursor of the next page (None on the last page) }
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    def page_data(object_name, where_data=None, column_data=None, limit=0, cursor=None, page_by="_id",
+                  sort_order=True):
+        if where_data is None:
+            where_data = {}
+        if column_data is None:
+            column_data = []
+        return db_manager.create_task("page", object_name,
+                                      timeout=SELECT_TIMEOUT,
+                                      where_data=where_data,
+                                      select_data=column_data,
+                                      limit=limit,
+                                      cursor=cursor,
+                                      sort_by=page_by,
+                                      sort_order=sort_order).wait()
+
+    '''
+    NAME
+        generate_stream_response - general helper function to write streamed rows as a chunked response
+    SYNOPSIS
+        generate_stream_response(stream, rows, stream_format)
+            stream          -> DBStream instance the rows come from
+            rows            -> iterable of rows (dictionaries)
+            stream_format   -> one of STREAM_FORMATS
+    DESCRIPTION
+        Generator - serializes STREAM_RESPONSE_ROWS rows at a time (same JSON encoding as jsonify)
+
+        If the stream fails midway, the response still ends as valid JSON:
+            json - "status": "fail" and "status_description" are added after "page_data"
+            ndjson - a last line { "status": "fail", "status_description": reason }
+
+        Cancels stream once done - also when the client disconnects before the end
+    RETURNS
+        pieces (strings) of the response body
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    '''
+    def generate_stream_response(stream, rows, stream_format):
+        first = True
+        try:
+            if stream_format == "json":
+                yield '{"page_data": ['
+
+            while True:
+                piece = [json.dumps(row, cls=app.json_encoder) for row in islice(rows, STREAM_RESPONSE_ROWS)]
+                if not piece:
+                    break
+                if stream_format == "json":
+                    yield ("" if first else ",") + ",".join(piece)
+                else:
+                    yield "\n".join(piece) + "\n"
+                first = False
+
+            if stream_format == "json":
+                yield "]}"
+        except Exception as e:
+            if stream_format == "json":
+                yield '], "status": "fail", "status_description": {0}}}'.format(json.dumps(str(e)))
+            else:
+                yield json.dumps({"status": "fail", "status_description": str(e)}) + "\n"
+        finally:
+            stream.cancel()
 
     ###########
     # General Helper Functions
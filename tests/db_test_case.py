@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event
+
+from ActMonitor.server_application.database_actions import DB_SCHEMA, DYNAMIC_API_OBJECT_NAME, \
+    DYNAMIC_API_PROPERTIES, ALERT_RULES_OBJECT_NAME, ALERT_RULES_PROPERTIES, ALERT_FINDS_OBJECT_NAME, \
+    ALERT_FINDS_PROPERTIES
+from ActMonitor.server_application.database_actions.db_action import DBAction
+from ActMonitor.server_application.database_actions.db_task import DBTask
+from ActMonitor.server_application.database_actions.db_utils import DBUtils
+
+
+class DBActionTestCase(unittest.TestCase):
+    """
+    NAME
+        DBActionTestCase - base of the tests that perform DBActions on a database
+            SQLite - the schema of the dynamic objects (DB_SCHEMA) is a database attached to every connection
+            the default objects and a "Tracker" dynamic object are created
+                columns "name", "value" and "code" (unique - a row of a code that exists fails to insert)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.path, "main.db"),
+                                    connect_args={"check_same_thread": False})
+        records_path = os.path.join(self.path, "records.db")
+
+        @event.listens_for(self.engine, "connect")
+        def attach_schema(dbapi_connection, connection_record):
+            dbapi_connection.execute("ATTACH DATABASE '{0}' AS {1}".format(records_path, DB_SCHEMA))
+
+        self.utils = DBUtils(self.engine, journal_path=os.path.join(self.path, "journal"),
+                             schema_cache_path=os.path.join(self.path, "schema_cache"))
+        self.utils.tasks.coalesce_wait = 0
+        self.action = DBAction(self.utils)
+        for object_name, properties in [(DYNAMIC_API_OBJECT_NAME, DYNAMIC_API_PROPERTIES),
+                                        (ALERT_RULES_OBJECT_NAME, ALERT_RULES_PROPERTIES),
+                                        (ALERT_FINDS_OBJECT_NAME, ALERT_FINDS_PROPERTIES)]:
+            self.perform("create", object_name, properties=properties)
+        self.perform("create", "Tracker", api_url="tracker",
+                     properties=[{"name": "name", "type": "String"}, {"name": "value", "type": "Integer"},
+                                 {"name": "code", "type": "String", "unique": True}])
+
+    def tearDown(self):
+        self.action.close()
+        self.utils.journal.close()
+        self.engine.dispose()
+        shutil.rmtree(self.path, True)
+
+    def perform(self, action_type, object_name, **kwargs):
+        return self.action.create_new_action(DBTask(action_type, object_name, **kwargs))
+
+    def perform_pending(self):
+        performed = []
+        while self.utils.tasks.get_size() > 0:
+            task = self.utils.tasks.pop()
+            if task is None:
+                break
+            try:
+                self.action.create_new_action(task)
+            finally:
+                self.utils.tasks.task_done(task)
+            performed.append(task)
+        return performed
+
+    def select(self, object_name, **kwargs):
+        return self.perform("select", object_name, **kwargs)
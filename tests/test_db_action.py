@@ -0,0 +1,446 @@
+import unittest
+from datetime import datetime
+from time import time
+
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
+
+from ActMonitor.server_application.database_actions import DB_SCHEMA, DYNAMIC_API_OBJECT_NAME, \
+    ALERT_RULES_OBJECT_NAME, ALERT_FINDS_OBJECT_NAME
+from ActMonitor.server_application.database_actions.db_action import DBAction, encode_page_cursor, \
+    decode_page_cursor, get_action_timeout, get_engine_options, get_index_name, verify_index_columns, \
+    ACTION_TIMEOUTS, DEFAULT_ACTION_TIMEOUT
+from ActMonitor.server_application.database_actions.db_task import DBTask, merge_insert_tasks, get_insert_times
+from ActMonitor.tests.db_test_case import DBActionTestCase
+
+
+class PageCursorTest(unittest.TestCase):
+    """
+    NAME
+        PageCursorTest - encode_page_cursor and decode_page_cursor
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def test_id_cursor_round_trip(self):
+        cursor = encode_page_cursor("_id", [42])
+        self.assertEqual(decode_page_cursor(cursor, "_id"), [42])
+
+    def test_timestamp_cursor_round_trip(self):
+        created = datetime(2026, 10, 18, 12, 30, 15, 123456)
+        cursor = encode_page_cursor("_timestamp_created", [created, 7])
+        self.assertEqual(decode_page_cursor(cursor, "_timestamp_created"), [created, 7])
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_page_cursor("_timestamp_created", [datetime(2026, 10, 18), 10 ** 12])
+        self.assertFalse(set(cursor) & set("+/"))
+
+    def test_cursor_of_another_key_is_refused(self):
+        cursor = encode_page_cursor("_id", [42])
+        self.assertRaises(ValueError, decode_page_cursor, cursor, "_timestamp_created")
+
+    def test_invalid_cursors_are_refused(self):
+        for cursor in ["garbage", "", None, encode_page_cursor("_id", [1, 2]),
+                       encode_page_cursor("_timestamp_created", ["not a date", 1])]:
+            self.assertRaises(ValueError, decode_page_cursor, cursor, "_timestamp_created")
+        self.assertRaises(ValueError, decode_page_cursor, "garbage", "_id")
+
+
+class AlertFindsTest(DBActionTestCase):
+    """
+    NAME
+        AlertFindsTest - alert findings of inserted rows are written once committed, one per row
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        DBActionTestCase.setUp(self)
+        self.perform("create", "Other", api_url="other", properties=[{"name": "value", "type": "Integer"}])
+        self.add_rule("one", "Tracker", "value", "1")
+        self.add_rule("named", "Tracker", "name", "a")
+        self.add_rule("other one", "Other", "value", "1")
+
+    def add_rule(self, rule_name, object_name, column_name, column_value):
+        self.perform("insert", ALERT_RULES_OBJECT_NAME, insert_data={"name": rule_name, "object_name": object_name,
+                                                                     "column_name": column_name,
+                                                                     "column_value": column_value})
+
+    def get_finds(self):
+        self.perform_pending()
+        return sorted((str(row["rule_name"]), int(row["found_id"]))
+                      for row in self.select(ALERT_FINDS_OBJECT_NAME, select_data=["rule_name", "found_id"]))
+
+    def test_row_matching_two_rules_is_found_once(self):
+        new_ids = self.perform("insert", "Tracker", insert_data=[{"name": "a", "value": 1}, {"name": "a", "value": 2},
+                                                                  {"name": "b", "value": 1}])
+        finds = dict((found_id, rule_name) for rule_name, found_id in self.get_finds())
+        self.assertEqual(sorted(finds), new_ids)
+        self.assertIn(finds[new_ids[0]], ["one", "named"])
+
+    def test_row_already_found_does_not_drop_the_other_findings(self):
+        other_id = self.perform("insert", "Other", insert_data={"value": 1})[0]
+        self.assertEqual(self.get_finds(), [("other one", other_id)])
+
+        new_ids = self.perform("insert", "Tracker", insert_data=[{"name": "b", "value": 1}, {"name": "b", "value": 1}])
+        self.assertEqual(new_ids[0], other_id)
+        self.assertEqual(self.get_finds(), [("one", new_ids[1]), ("other one", other_id)])
+
+    def test_non_ascii_rule_finds_its_rows(self):
+        self.add_rule("hebrew", "Tracker", "name", u"\u05d9\u05d5\u05d0\u05d1")
+        new_ids = self.perform("insert", "Tracker", insert_data=[{"name": u"\u05d9\u05d5\u05d0\u05d1", "value": 2},
+                                                                  {"name": u"caf\xe9", "value": 2}])
+        self.assertEqual(self.get_finds(), [("hebrew", new_ids[0])])
+
+    def test_rolled_back_insert_has_no_findings(self):
+        self.assertRaises(Exception, self.perform, "insert", "Tracker",
+                          insert_data=[{"value": 1, "code": "a"}, {"value": 1, "code": "a"}])
+        self.assertEqual(self.get_finds(), [])
+
+
+class ActionTimeoutTest(DBActionTestCase):
+    """
+    NAME
+        ActionTimeoutTest - statement timeouts and backend process IDs of the actions of a DBAction
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def record_begins(self):
+        begins = []
+        begin_dynamic_action = self.action.__begin_dynamic_action__
+
+        def record_begin(action_type=None):
+            begins.append(action_type)
+            begin_dynamic_action(action_type)
+        self.action.__begin_dynamic_action__ = record_begin
+        return begins
+
+    def test_timeout_of_every_action_type(self):
+        self.assertEqual(get_action_timeout("select"), ACTION_TIMEOUTS["select"])
+        self.assertEqual(get_action_timeout("create_index"), ACTION_TIMEOUTS["create_index"])
+        self.assertEqual(get_action_timeout("unknown"), DEFAULT_ACTION_TIMEOUT)
+        self.assertEqual(get_action_timeout(None), DEFAULT_ACTION_TIMEOUT)
+
+    def test_backend_pid_is_cleared_once_the_action_ends(self):
+        for end_action in [self.action.__end_dynamic_action__, self.action.__rollback_dynamic_action__]:
+            self.action.__begin_dynamic_action__("insert")
+            self.action.backend_pid = 1234
+            end_action()
+            self.assertIsNone(self.action.backend_pid)
+            self.assertFalse(self.action.cancel_backend())
+
+    def test_every_insert_of_a_failed_merge_begins_an_action(self):
+        tasks = [DBTask("insert", "Tracker", insert_data={"value": 1, "code": "a"}),
+                 DBTask("insert", "Tracker", insert_data={"value": 2, "code": "a"}),
+                 DBTask("insert", "Tracker", insert_data={"value": 3, "code": "b"})]
+        for task in tasks:
+            task.compact()
+        begins = self.record_begins()
+
+        self.action.create_new_action(merge_insert_tasks(tasks))
+        self.assertEqual(begins, ["insert"] * 4)
+        self.assertEqual(sorted(row["value"] for row in self.select("Tracker", select_data=["value"])), [1, 3])
+        self.assertIsNone(self.action.backend_pid)
+
+
+class DynamicObjectTest(DBActionTestCase):
+    """
+    NAME
+        DynamicObjectTest - "create" and "drop" are one action each, and DBActions never share a session
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def record_actions(self):
+        actions = []
+        begin_dynamic_action = self.action.__begin_dynamic_action__
+        end_dynamic_action = self.action.__end_dynamic_action__
+
+        def record_begin(action_type=None):
+            actions.append(action_type)
+            begin_dynamic_action(action_type)
+
+        def record_end():
+            actions.append("end")
+            end_dynamic_action()
+        self.action.__begin_dynamic_action__ = record_begin
+        self.action.__end_dynamic_action__ = record_end
+        return actions
+
+    def get_apis(self):
+        return sorted(str(row["object_name"]) for row in self.select(DYNAMIC_API_OBJECT_NAME,
+                                                                     select_data=["object_name"]))
+
+    def test_create_is_one_action(self):
+        actions = self.record_actions()
+        self.perform("create", "Other", api_url="other", properties=[{"name": "value", "type": "Integer"}])
+
+        self.assertEqual(actions, ["create", "end"])
+        self.assertIn("Other", self.get_apis())
+        self.assertEqual(self.utils.dynamic_objects["Other"]["count"], 0)
+        self.assertEqual(self.perform("insert", "Other", insert_data={"value": 1}), [1])
+
+    def test_failed_create_leaves_nothing_behind(self):
+        self.assertRaises(ValueError, self.perform, "create", "Other", api_url="other",
+                          properties=[{"name": "value", "type": "Integer"}], indexes=["missing"])
+
+        self.assertNotIn("Other", self.get_apis())
+        self.assertNotIn("Other", self.utils.dynamic_objects)
+        self.assertNotIn("{0}.other".format(DB_SCHEMA), self.utils.metadata.tables)
+
+    def test_drop_is_one_action(self):
+        self.perform("insert", "Tracker", insert_data={"value": 1})
+        actions = self.record_actions()
+        self.perform("drop", "Tracker")
+
+        self.assertEqual(actions, ["drop", "end"])
+        self.assertNotIn("Tracker", self.get_apis())
+        self.assertNotIn("Tracker", self.utils.dynamic_objects)
+        self.assertNotIn("{0}.tracker".format(DB_SCHEMA), self.utils.metadata.tables)
+        self.assertFalse(self.engine.has_table("tracker", schema=DB_SCHEMA))
+
+    def test_actions_do_not_share_a_session(self):
+        other_action = DBAction(self.utils, load_objects=False)
+        try:
+            other_action.create_new_action(DBTask("insert", "Tracker", insert_data={"value": 1}))
+
+            self.action.__begin_dynamic_action__("insert")
+            self.action.__insert_record__("Tracker", self.utils.dynamic_objects["Tracker"]["class"], {"value": 2})
+            other_rows = other_action.create_new_action(DBTask("select", "Tracker", select_data=["value"]))
+            self.action.__rollback_dynamic_action__()
+        finally:
+            other_action.close()
+
+        self.assertEqual(other_rows, [{"value": 1}])
+        self.assertEqual(self.select("Tracker", select_data=["value"]), [{"value": 1}])
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 1)
+
+
+class InsertTest(DBActionTestCase):
+    """
+    NAME
+        InsertTest - timestamps of inserted rows, and the statements bulk inserts are cached by
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def get_timestamps(self):
+        return [row["_timestamp_created"] for row in self.select("Tracker", select_data=["_timestamp_created"],
+                                                                 sort_by="_id")]
+
+    def test_timestamps_entered_are_overwritten(self):
+        self.perform("insert", "Tracker", insert_data={"value": 1, "_timestamp_created": datetime(2000, 1, 1),
+                                                       "_timestamp_modified": datetime(2000, 1, 1)})
+
+        row = self.select("Tracker", select_data=["_timestamp_created", "_timestamp_modified"])[0]
+        self.assertGreater(row["_timestamp_created"], datetime(2000, 1, 1))
+        self.assertEqual(row["_timestamp_modified"], row["_timestamp_created"])
+
+    def test_rows_are_created_at_the_time_of_their_task(self):
+        created_at = time() - 3600
+        self.perform("insert", "Tracker", insert_data=[{"value": 1}, {"value": 2}], created_at=created_at)
+        self.assertEqual(self.get_timestamps(), [datetime.fromtimestamp(created_at)] * 2)
+
+    def test_merged_rows_keep_the_time_of_their_own_task(self):
+        tasks = [DBTask("insert", "Tracker", insert_data={"value": 1}, created_at=time() - 60),
+                 DBTask("insert", "Tracker", insert_data=[{"value": 2}, {"value": 3}], created_at=time() - 30)]
+        for task in tasks:
+            task.compact()
+
+        self.action.create_new_action(merge_insert_tasks(tasks))
+        self.assertEqual(self.get_timestamps(), get_insert_times(tasks))
+        self.assertEqual(len(set(self.get_timestamps())), 2)
+
+    def test_bulk_inserts_of_any_size_share_a_statement(self):
+        for num_of_rows in [2, 3, 5]:
+            self.perform("insert", "Tracker", insert_data=[{"value": i} for i in range(num_of_rows)])
+
+        insert_keys = [key for key in self.utils.statements.statements.items
+                       if key[0] == "Tracker" and key[1][0] == "insert"]
+        self.assertEqual(len(insert_keys), 1)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 10)
+
+    def test_engine_options(self):
+        self.assertEqual(get_engine_options("postgresql://user@localhost")["executemany_mode"], "values")
+        self.assertEqual(get_engine_options("sqlite://"), {})
+
+
+
+class IndexTest(DBActionTestCase):
+    """
+    NAME
+        IndexTest - indexes of the columns of existing dynamic objects
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def get_index_names(self):
+        return [index["name"] for index in inspect(self.engine).get_indexes("tracker", schema=DB_SCHEMA)]
+
+    def test_index_is_built(self):
+        index_name = self.perform("create_index", "Tracker", columns=["name", "value"])
+        self.assertEqual(index_name, get_index_name("tracker", ["name", "value"]))
+        self.assertIn(index_name, self.get_index_names())
+        self.assertEqual(self.perform("create_index", "Tracker", columns="name"), get_index_name("tracker", ["name"]))
+
+    def test_index_of_missing_columns_is_refused(self):
+        self.assertRaises(ValueError, self.perform, "create_index", "Tracker", columns=["name", "missing"])
+        self.assertNotIn(get_index_name("tracker", ["name", "missing"]), self.get_index_names())
+
+    def test_index_columns_are_verified(self):
+        column_names = ["name", "value"]
+        self.assertEqual(verify_index_columns("Tracker", "name", column_names), ["name"])
+        self.assertEqual(verify_index_columns("Tracker", [u"value", "name"], column_names), ["value", "name"])
+        for index_columns in [["name", "missing"], [], {"name": 1}, 1]:
+            self.assertRaises(ValueError, verify_index_columns, "Tracker", index_columns, column_names)
+
+
+class SetBasedWriteTest(DBActionTestCase):
+    """
+    NAME
+        SetBasedWriteTest - deletes and updates of the rows a filter, a limit and an offset match
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        DBActionTestCase.setUp(self)
+        self.perform("insert", "Tracker", insert_data=[{"name": "odd" if i % 2 else "even", "value": i}
+                                                       for i in range(10)], created_at=time() - 86400)
+
+    def get_values(self):
+        return [row["value"] for row in self.select("Tracker", select_data=["value"], sort_by="_id")]
+
+    def test_delete_with_a_limit_and_an_offset(self):
+        deleted = self.perform("delete", "Tracker", where_data={"name": "even"}, limit=2, offset=1)
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.get_values(), [0, 1, 3, 5, 6, 7, 8, 9])
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 8)
+
+    def test_delete_of_every_row(self):
+        self.assertEqual(self.perform("delete", "Tracker"), 10)
+        self.assertEqual(self.get_values(), [])
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 0)
+
+    def test_delete_of_null_values(self):
+        self.perform("insert", "Tracker", insert_data={"value": 10})
+
+        self.assertEqual(self.perform("delete", "Tracker", where_data={"name": None}), 1)
+        self.assertEqual(self.get_values(), range(10))
+
+    def test_update_with_a_limit_and_an_offset(self):
+        updated = self.perform("update", "Tracker", where_data={"name": "odd"}, update_data={"value": 100},
+                               limit=2, offset=1)
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.get_values(), [0, 1, 2, 100, 4, 100, 6, 7, 8, 9])
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 10)
+
+    def test_update_stamps_only_the_updated_rows(self):
+        self.perform("update", "Tracker", where_data={"value": 3}, update_data={"name": "three",
+                                                                                "_timestamp_created": datetime.now()})
+
+        rows = self.select("Tracker", select_data=["value", "_timestamp_created", "_timestamp_modified"],
+                           sort_by="_id")
+        for row in rows:
+            if row["value"] == 3:
+                self.assertGreater(row["_timestamp_modified"], row["_timestamp_created"])
+            else:
+                self.assertEqual(row["_timestamp_modified"], row["_timestamp_created"])
+        self.assertEqual(self.select("Tracker", select_data=["name"], where_data={"value": 3}), [{"name": "three"}])
+
+    def test_filter_of_a_missing_column_is_refused(self):
+        self.assertRaises(ValueError, self.perform, "delete", "Tracker", where_data={"missing": 1})
+        self.assertRaises(ValueError, self.perform, "update", "Tracker", where_data={"missing": 1},
+                          update_data={"value": 1})
+        self.assertEqual(self.get_values(), range(10))
+
+    def test_writes_of_one_shape_share_a_statement(self):
+        for value in range(3):
+            self.perform("delete", "Tracker", where_data={"value": value})
+            self.perform("update", "Tracker", where_data={"value": value + 5}, update_data={"name": "updated"})
+
+        write_keys = [key for key in self.utils.statements.statements.items
+                      if key[0] == "Tracker" and key[1][0] in ["delete", "update"]]
+        self.assertEqual(len(write_keys), 2)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 7)
+
+
+class RowCountTest(DBActionTestCase):
+    """
+    NAME
+        RowCountTest - the table of row counts changes in the transaction of the rows it counts
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def get_row_count(self, object_name="Tracker"):
+        row_counts = self.utils.row_counts
+        return self.engine.execute(select([row_counts.c.row_count])
+                                   .where(row_counts.c.object_name == object_name)).scalar()
+
+    def forget_row_count(self):
+        row_counts = self.utils.row_counts
+        self.engine.execute(row_counts.delete().where(row_counts.c.object_name == "Tracker"))
+        self.action.__record_dynamic_stub__("Tracker", "tracker", None)
+
+    def test_new_object_counts_no_rows(self):
+        self.assertEqual(self.get_row_count(), 0)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 0)
+
+    def test_count_follows_inserts_and_deletes(self):
+        self.perform("insert", "Tracker", insert_data=[{"value": i} for i in range(5)])
+        self.perform("delete", "Tracker", where_data={"value": 1})
+
+        self.assertEqual(self.get_row_count(), 4)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 4)
+
+    def test_failed_insert_does_not_change_the_count(self):
+        self.perform("insert", "Tracker", insert_data={"code": "a"})
+        self.assertRaises(IntegrityError, self.perform, "insert", "Tracker", insert_data=[{"code": "b"}, {"code": "a"}])
+
+        self.assertEqual(self.get_row_count(), 1)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 1)
+
+    def test_dropped_object_has_no_count(self):
+        self.perform("drop", "Tracker")
+        self.assertIsNone(self.get_row_count())
+
+    def test_object_without_a_count_is_counted_once(self):
+        self.perform("insert", "Tracker", insert_data=[{"value": i} for i in range(3)])
+        self.forget_row_count()
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], -1)
+
+        self.perform("insert", "Tracker", insert_data={"value": 3})
+        self.assertIsNone(self.get_row_count())
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], -1)
+
+        self.assertTrue(any(task.action == "update_count" for task in self.perform_pending()))
+        self.assertEqual(self.get_row_count(), 4)
+        self.assertEqual(self.utils.dynamic_objects["Tracker"]["count"], 4)
+
+        self.perform("delete", "Tracker", where_data={"value": 0})
+        self.assertEqual(self.perform("update_count", "Tracker"), 3)
+        self.assertEqual(self.get_row_count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
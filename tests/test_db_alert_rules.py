@@ -0,0 +1,70 @@
+import unittest
+
+from ActMonitor.server_application.database_actions.db_alert_rules import AlertRules, get_matching_rules
+
+
+class GetMatchingRulesTest(unittest.TestCase):
+    """
+    NAME
+        GetMatchingRulesTest - get_matching_rules and the index of AlertRules
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.rules = AlertRules().set_rules([
+            ("slow", "Tracker", "duration", "600"),
+            ("mobile", "Tracker", "is_mobile", True),
+            ("very slow", "Tracker", "duration", 600),
+            ("anonymous", "Tracker", "user_name", None),
+            ("other", "Other", "duration", "600")
+        ], 0)
+
+    def test_no_rules_no_matches(self):
+        self.assertEqual(get_matching_rules(self.rules, "Untracked", [{"duration": 600}]), [])
+        self.assertEqual(get_matching_rules({}, "Tracker", [{"duration": 600}]), [])
+
+    def test_values_match_as_strings(self):
+        matches = get_matching_rules(self.rules, "Tracker", [{"duration": 600, "user_name": "a"},
+                                                             {"duration": "600", "user_name": "b"},
+                                                             {"duration": 601, "user_name": "c"}])
+        self.assertEqual(sorted(matches), [(0, "slow", "duration"), (0, "very slow", "duration"),
+                                           (1, "slow", "duration"), (1, "very slow", "duration")])
+
+    def test_non_ascii_values_match(self):
+        rules = AlertRules().set_rules([("hebrew", "Tracker", "user_name", u"\u05d9\u05d5\u05d0\u05d1"),
+                                        ("bytes", "Tracker", "user_name", "\xd7\xa0\xd7\x95\xd7\xa2\xd7\x9d")], 0)
+        matches = get_matching_rules(rules, "Tracker", [{"user_name": "\xd7\x99\xd7\x95\xd7\x90\xd7\x91"},
+                                                        {"user_name": u"\u05e0\u05d5\u05e2\u05dd"},
+                                                        {"user_name": u"caf\xe9"},
+                                                        {"user_name": "\xff"}])
+        self.assertEqual(matches, [(0, "hebrew", "user_name"), (1, "bytes", "user_name")])
+
+    def test_missing_column_matches_rule_without_value(self):
+        self.assertEqual(get_matching_rules(self.rules, "Tracker", [{"duration": 1}]),
+                         [(0, "anonymous", "user_name")])
+
+    def test_matches_are_in_order_of_rows(self):
+        matches = get_matching_rules(self.rules, "Tracker", [{"user_name": "a", "is_mobile": True},
+                                                             {"user_name": "b", "duration": 600},
+                                                             {"user_name": "c", "is_mobile": True}])
+        self.assertEqual([match[0] for match in matches], [0, 1, 1, 2])
+
+    def test_rules_loaded_before_a_change_are_not_kept(self):
+        alert_rules = AlertRules()
+        rules, version = alert_rules.get_rules()
+        self.assertIsNone(rules)
+
+        alert_rules.invalidate()
+        alert_rules.set_rules([("slow", "Tracker", "duration", 600)], version)
+        self.assertIsNone(alert_rules.get_rules()[0])
+
+        rules, version = alert_rules.get_rules()
+        alert_rules.set_rules([("slow", "Tracker", "duration", 600)], version)
+        self.assertEqual(alert_rules.get_rules()[0], {"Tracker": {"duration": {"600": ["slow"]}}})
+
+
+if __name__ == "__main__":
+    unittest.main()
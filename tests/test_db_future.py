@@ -0,0 +1,83 @@
+import unittest
+from threading import Thread
+from time import time
+
+from ActMonitor.server_application.database_actions import db_future
+from ActMonitor.server_application.database_actions.db_future import DBStream, DBTaskTimeout, STREAM_MAX_CHUNKS
+
+
+class DBStreamTest(unittest.TestCase):
+    """
+    NAME
+        DBStreamTest - a DBStream ends with all of its rows, or with an error - never quietly short
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.stream = DBStream("stream", "Tracker", 5)
+
+    def fill(self):
+        for i in range(STREAM_MAX_CHUNKS):
+            self.stream.put_chunk([{"value": i}])
+
+    def test_rows_are_read_in_order(self):
+        self.fill()
+        self.stream.set_result(STREAM_MAX_CHUNKS)
+        self.assertEqual([row["value"] for row in self.stream.iter_rows()], range(STREAM_MAX_CHUNKS))
+
+    def test_stream_done_without_room_for_its_end_ends_once_read(self):
+        self.fill()
+        start = time()
+        self.stream.set_result(STREAM_MAX_CHUNKS)
+        self.assertLess(time() - start, 1)
+
+        self.assertEqual(len(list(self.stream.iter_rows())), STREAM_MAX_CHUNKS)
+
+    def test_failed_stream_raises_after_its_rows(self):
+        self.fill()
+        self.stream.set_exception(DBTaskTimeout("stream", "Tracker"))
+
+        rows = []
+        start = time()
+        with self.assertRaises(DBTaskTimeout):
+            for row in self.stream.iter_rows():
+                rows.append(row)
+        self.assertEqual(len(rows), STREAM_MAX_CHUNKS)
+        self.assertLess(time() - start, 5)
+
+    def test_slow_reader_gets_an_error(self):
+        put_seconds = db_future.STREAM_PUT_SECONDS
+        db_future.STREAM_PUT_SECONDS = 1
+        try:
+            self.fill()
+            self.assertRaises(DBTaskTimeout, self.stream.put_chunk, [{"value": STREAM_MAX_CHUNKS}])
+        finally:
+            db_future.STREAM_PUT_SECONDS = put_seconds
+        self.stream.set_exception(DBTaskTimeout("stream", "Tracker"))
+
+        rows = self.stream.iter_rows()
+        self.assertEqual([next(rows)["value"] for i in range(STREAM_MAX_CHUNKS)], range(STREAM_MAX_CHUNKS))
+        self.assertRaises(DBTaskTimeout, next, rows)
+
+    def test_rows_put_while_reading_are_read(self):
+        def put_chunks():
+            self.fill()
+            self.fill()
+            self.stream.set_result(2 * STREAM_MAX_CHUNKS)
+        writer = Thread(target=put_chunks)
+        writer.start()
+
+        self.assertEqual(len(list(self.stream.iter_rows())), 2 * STREAM_MAX_CHUNKS)
+        writer.join()
+
+    def test_no_first_chunk_by_the_deadline(self):
+        stream = DBStream("stream", "Tracker", 0.2)
+        self.assertRaises(DBTaskTimeout, list, stream.iter_rows())
+        self.assertTrue(stream.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
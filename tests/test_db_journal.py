@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from threading import Thread
+
+from ActMonitor.server_application.database_actions.db_journal import DBJournal, __segment_first_seq__
+from ActMonitor.server_application.database_actions.db_task import DBTask, DBTaskList
+
+
+class DBJournalTest(unittest.TestCase):
+    """
+    NAME
+        DBJournalTest - replay, checkpoint and compaction of DBJournal
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, True)
+
+    def open_journal(self, segment_max_bytes=1024 * 1024):
+        journal = DBJournal(self.path, durability_window=0, segment_max_bytes=segment_max_bytes)
+        replayed = list(journal.replay())
+        journal.open()
+        return journal, replayed
+
+    def append(self, journal, count):
+        tasks = [DBTask("insert", "Tracker", insert_data={"v": i}) for i in range(count)]
+        for task in tasks:
+            journal.append(task)
+        return tasks
+
+    def test_empty_journal_replays_nothing(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        journal.close()
+        self.assertEqual(replayed, [])
+
+    def test_replays_only_records_that_are_not_done(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        tasks = self.append(journal, 3)
+        journal.complete(tasks[0].journal_id)
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        self.assertEqual([record["args"]["insert_data"]["v"] for record in replayed], [1, 2])
+        self.assertEqual(replayed[0]["action"], "insert")
+        self.assertEqual(replayed[0]["object_name"], "Tracker")
+        journal.close()
+
+    def test_done_records_are_not_replayed_again(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        for task in self.append(journal, 3):
+            journal.complete(task.journal_id)
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        journal.close()
+        self.assertEqual(replayed, [])
+
+    def test_replayed_records_are_done_once_pushed_again(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        self.append(journal, 2)
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        self.assertEqual(len(replayed), 2)
+        pushed_again = self.append(journal, 1)
+        journal.end_replay()
+        journal.complete(pushed_again[0].journal_id)
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        journal.close()
+        self.assertEqual(replayed, [])
+
+    def test_partially_written_record_is_skipped(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        self.append(journal, 1)
+        journal.segment.write("{\"seq\": 99, \"action\": ")
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        journal.close()
+        self.assertEqual(len(replayed), 1)
+
+    def test_checkpoint_waits_for_the_oldest_pending_record(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        tasks = self.append(journal, 100)
+        for task in tasks[1:]:
+            journal.complete(task.journal_id)
+
+        self.assertEqual(journal.checkpoint_seq, tasks[0].journal_id - 1)
+        self.assertEqual(len(journal.pending_seqs), 1)
+
+        journal.complete(tasks[0].journal_id)
+        self.assertEqual(journal.checkpoint_seq, tasks[-1].journal_id)
+        self.assertEqual(len(journal.pending_seqs), 0)
+        journal.close()
+
+    def test_done_segments_are_removed(self):
+        journal, replayed = self.open_journal(segment_max_bytes=200)
+        journal.end_replay()
+        for task in self.append(journal, 20):
+            journal.complete(task.journal_id)
+        journal.flush()
+
+        segments = [name for name in os.listdir(self.path) if name.endswith(".log")]
+        self.assertEqual(len(segments), 1)
+        journal.close()
+
+    def test_replayed_dates_decode_back(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        journal.append(DBTask("insert", "Tracker", insert_data={"at": datetime(2026, 10, 18, 12, 30)}))
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        self.assertEqual(replayed[0]["args"]["insert_data"]["at"], datetime(2026, 10, 18, 12, 30))
+        journal.close()
+
+    def test_reserved_records_are_written_in_order(self):
+        journal, replayed = self.open_journal(segment_max_bytes=200)
+        journal.end_replay()
+        tasks = [DBTask("insert", "Tracker", insert_data={"v": i}) for i in range(20)]
+        for task in tasks:
+            journal.reserve(task)
+        self.assertEqual(os.path.getsize(journal.segment.name), 0)
+
+        journal.write()
+        self.append(journal, 20)
+        journal.close()
+
+        journal, replayed = self.open_journal()
+        journal.close()
+        self.assertEqual([record["seq"] for record in replayed], range(tasks[0].journal_id, tasks[0].journal_id + 40))
+        for segment_name in journal.__list_segments__():
+            with open(os.path.join(self.path, segment_name), "rb") as f:
+                first_record = f.readline()
+            if first_record:
+                self.assertEqual(json.loads(first_record)["seq"], __segment_first_seq__(segment_name))
+
+    def test_push_writes_outside_the_list_lock(self):
+        journal, replayed = self.open_journal()
+        journal.end_replay()
+        tasks = DBTaskList(journal=journal)
+        list_lock_free = []
+        write = journal.write
+
+        def check_list_lock():
+            list_lock_free.append(tasks.list_lock.acquire(False))
+            if list_lock_free[-1]:
+                tasks.list_lock.release()
+
+        def check_and_write():
+            checker = Thread(target=check_list_lock)
+            checker.start()
+            checker.join()
+            write()
+        journal.write = check_and_write
+
+        tasks.push(DBTask("insert", "Tracker", insert_data={"v": 1}))
+        journal.close()
+        self.assertEqual(list_lock_free, [True])
+
+        journal, replayed = self.open_journal()
+        journal.close()
+        self.assertEqual(len(replayed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
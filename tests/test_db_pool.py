@@ -0,0 +1,282 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from threading import Event, RLock
+from time import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool, NullPool
+
+from ActMonitor.server_application.database_actions.db_action import get_action_timeout
+from ActMonitor.server_application.database_actions.db_future import DBFuture
+from ActMonitor.server_application.database_actions.db_pool import DBPool, get_max_workers, STUCK_GRACE_SECONDS, \
+    CANCEL_GRACE_SECONDS, NUMBER_OF_READERS, NUMBER_OF_STREAM_READERS, RESERVED_CONNECTIONS, SCALE_UP_CHECKS, \
+    SCALE_DOWN_CHECKS, SCALE_UP_DEPTH_PER_WORKER
+from ActMonitor.server_application.database_actions.db_task import DBTask, WRITE_LANES, READ_LANE, STREAM_LANE
+from ActMonitor.tests.db_test_case import DBActionTestCase
+
+
+class FakeActioner:
+    """
+    NAME
+        FakeActioner - stands for the DBAction of a FakeWorker - counts the statements it was asked to cancel
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def __init__(self):
+        self.cancels = 0
+
+    def cancel_backend(self):
+        self.cancels += 1
+        return True
+
+
+class FakeWorker:
+    """
+    NAME
+        FakeWorker - stands for a DBWorker that never finishes its task (or has none)
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def __init__(self, lane_names, task=None, seconds_on_task=0):
+        self.lane_names = lane_names
+        self.current_task = task
+        self.current_task_lock = RLock()
+        self.time_assigned = datetime.now() - timedelta(seconds=seconds_on_task) if task is not None else None
+        self.actioner = FakeActioner()
+        self.retired = False
+        self.name = "FakeWorker"
+
+    def __is_available__(self):
+        return self.current_task is None
+
+    def retire(self):
+        self.retired = True
+
+    def is_alive(self):
+        return True
+
+
+class DBPoolTestCase(DBActionTestCase):
+    """
+    NAME
+        DBPoolTestCase - base of the tests of a DBPool that is not started - the tests call its checks themselves
+            DBWorkers it sets up are real, and exit once the test is done
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        DBActionTestCase.setUp(self)
+        self.pool = DBPool(Event(), self.utils)
+        self.pool.workers = []
+        self.pool.workers_stuck = []
+        self.pool.workers_event = Event()
+
+    def tearDown(self):
+        self.pool.workers_event.set()
+        self.utils.tasks.wake_all()
+        for worker in self.pool.workers:
+            if not isinstance(worker, FakeWorker):
+                worker.join(5)
+        DBActionTestCase.tearDown(self)
+
+    def get_new_workers(self):
+        return [worker for worker in self.pool.workers if not isinstance(worker, FakeWorker)]
+
+
+class StuckWorkerTest(DBPoolTestCase):
+    """
+    NAME
+        StuckWorkerTest - a stuck DBWorker has its statement cancelled first, and is replaced only if that fails
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def add_stuck_worker(self, task, lane_names):
+        worker = FakeWorker(lane_names, task, get_action_timeout(task.action) + STUCK_GRACE_SECONDS + 1)
+        self.pool.workers.append(worker)
+        return worker
+
+    def check(self, worker):
+        self.pool._DBPool__is_worker_stuck(worker)
+
+    def expire_cancel(self, worker):
+        self.pool.cancelled[worker] = datetime.now() - timedelta(seconds=CANCEL_GRACE_SECONDS + 1)
+
+    def test_worker_within_the_timeout_is_not_stuck(self):
+        worker = FakeWorker([READ_LANE], DBTask("select", "Tracker"), get_action_timeout("select"))
+        self.pool.workers.append(worker)
+        self.check(worker)
+        self.assertEqual(worker.actioner.cancels, 0)
+
+    def test_stuck_statement_is_cancelled_once(self):
+        worker = self.add_stuck_worker(DBTask("select", "Tracker"), [READ_LANE])
+        self.check(worker)
+        self.check(worker)
+
+        self.assertEqual(worker.actioner.cancels, 1)
+        self.assertEqual(self.pool.get_stats()["cancelled"], 1)
+        self.assertFalse(worker.retired)
+        self.assertIn(worker, self.pool.workers)
+
+    def test_worker_still_stuck_after_the_cancel_is_replaced_and_its_read_retried(self):
+        stuck_task = DBTask("select", "Tracker", select_data=["value"])
+        stuck_task.future = DBFuture(stuck_task.action, stuck_task.object_name)
+        worker = self.add_stuck_worker(stuck_task, [READ_LANE])
+        self.check(worker)
+        self.expire_cancel(worker)
+        self.check(worker)
+
+        self.assertTrue(worker.retired)
+        self.assertEqual(self.pool.workers_stuck, [worker])
+        self.assertEqual(len(self.get_new_workers()), 1)
+        self.assertEqual(stuck_task.future.wait(5), [])
+        self.assertEqual(self.pool.get_stats()["retried"], 1)
+
+    def test_stuck_write_is_not_retried(self):
+        worker = self.add_stuck_worker(DBTask("delete", "Tracker"), WRITE_LANES)
+        self.check(worker)
+        self.expire_cancel(worker)
+        self.check(worker)
+
+        self.assertTrue(worker.retired)
+        self.assertEqual(self.pool.get_stats()["retried"], 0)
+        self.assertEqual(len(self.get_new_workers()), 1)
+
+
+class ScaleWorkersTest(DBPoolTestCase):
+    """
+    NAME
+        ScaleWorkersTest - the writers grow with a backlog and shrink when idle, with hysteresis and a cooldown
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def add_writers(self, busy, idle):
+        for i in range(busy):
+            self.pool.workers.append(FakeWorker(WRITE_LANES, DBTask("delete", "Tracker")))
+        for i in range(idle):
+            self.pool.workers.append(FakeWorker(WRITE_LANES))
+
+    def push_backlog(self, num_of_tasks):
+        for i in range(num_of_tasks):
+            self.utils.tasks.push(DBTask("update", "Tracker", where_data={"value": i}, update_data={"value": i}))
+
+    def decide(self, times=1):
+        for i in range(times):
+            self.pool.scale_stats["last_check"] = 0
+            self.pool._DBPool__scale_workers()
+
+    def get_writers(self):
+        return [worker for worker in self.pool.workers if worker.lane_names == WRITE_LANES]
+
+    def test_backlog_grows_the_writers_after_the_hysteresis(self):
+        self.pool.max_workers = 4
+        self.add_writers(busy=2, idle=0)
+        self.push_backlog(4 * SCALE_UP_DEPTH_PER_WORKER)
+
+        self.decide(SCALE_UP_CHECKS - 1)
+        self.assertEqual(len(self.get_writers()), 2)
+        self.decide()
+        self.assertEqual(len(self.get_writers()), 4)
+        self.assertEqual(self.pool.get_stats()["scale_ups"], 1)
+        self.assertIn("grew from 2 to 4", self.pool.get_stats()["last_scale_reason"])
+
+    def test_no_growth_within_the_cooldown_or_past_max_workers(self):
+        self.pool.max_workers = 4
+        self.add_writers(busy=2, idle=0)
+        self.push_backlog(10 * SCALE_UP_DEPTH_PER_WORKER)
+        self.pool.scale_stats["last_scale"] = time()
+
+        self.decide(SCALE_UP_CHECKS)
+        self.assertEqual(len(self.get_writers()), 2)
+
+        self.pool.scale_stats["last_scale"] = 0
+        self.decide(SCALE_UP_CHECKS)
+        self.assertEqual(len(self.get_writers()), 4)
+
+    def test_backlog_of_idle_writers_does_not_grow_them(self):
+        self.pool.max_workers = 4
+        self.add_writers(busy=0, idle=2)
+        self.push_backlog(4 * SCALE_UP_DEPTH_PER_WORKER)
+
+        self.decide(SCALE_UP_CHECKS)
+        self.assertEqual(len(self.get_writers()), 2)
+        self.assertEqual(self.pool.get_stats()["scale_ups"], 0)
+
+    def test_idle_writers_shrink_down_to_min_workers(self):
+        self.pool.min_workers = 2
+        self.add_writers(busy=0, idle=3)
+
+        self.decide(SCALE_DOWN_CHECKS - 1)
+        self.assertEqual(len(self.get_writers()), 3)
+        self.decide()
+        self.assertEqual(len(self.get_writers()), 2)
+        self.assertEqual(self.pool.get_stats()["scale_downs"], 1)
+
+        self.pool.scale_stats["last_scale"] = 0
+        self.decide(SCALE_DOWN_CHECKS)
+        self.assertEqual(len(self.get_writers()), 2)
+
+    def test_max_workers_is_bounded_by_the_connections(self):
+        engine = create_engine("sqlite:///" + os.path.join(self.path, "pool.db"), poolclass=QueuePool, pool_size=5,
+                               max_overflow=3)
+        null_engine = create_engine("sqlite:///" + os.path.join(self.path, "pool.db"), poolclass=NullPool)
+        try:
+            connection_workers = get_max_workers(engine)
+            self.assertEqual(get_max_workers(engine, connection_workers + 10), connection_workers)
+            self.assertEqual(get_max_workers(engine, 2), 2)
+            self.assertEqual(get_max_workers(null_engine, 6), 6)
+        finally:
+            engine.dispose()
+            null_engine.dispose()
+
+
+class StreamReaderTest(DBPoolTestCase):
+    """
+    NAME
+        StreamReaderTest - streams have DBWorkers of their own - they never take the DBWorkers of selects
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def test_stream_readers_have_connections_of_their_own(self):
+        engine = create_engine("sqlite:///" + os.path.join(self.path, "pool.db"), poolclass=QueuePool, pool_size=5,
+                               max_overflow=3)
+        try:
+            self.assertEqual(get_max_workers(engine), 8 - NUMBER_OF_READERS - NUMBER_OF_STREAM_READERS -
+                             RESERVED_CONNECTIONS)
+        finally:
+            engine.dispose()
+
+    def test_select_is_not_held_up_by_streams(self):
+        for i in range(NUMBER_OF_STREAM_READERS):
+            self.pool.workers.append(FakeWorker([STREAM_LANE], DBTask("stream", "Tracker")))
+        self.pool._DBPool__set_up_workers(NUMBER_OF_READERS, [READ_LANE])
+        self.utils.tasks.push(DBTask("stream", "Tracker"))
+        select_task = DBTask("select", "Tracker", select_data=["value"])
+        select_task.future = DBFuture(select_task.action, select_task.object_name)
+
+        self.utils.tasks.push(select_task)
+        self.assertEqual(select_task.future.wait(5), [])
+        self.assertEqual(self.utils.tasks.lanes[STREAM_LANE]["size"], 1)
+        self.assertEqual(self.pool.get_stats()["stream_readers"], NUMBER_OF_STREAM_READERS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event, MetaData, Table, Column, Integer, String, Index
+
+from ActMonitor.server_application.database_actions import DB_SCHEMA
+from ActMonitor.server_application.database_actions.db_schema_cache import DBSchemaCache, SNAPSHOT_SUFFIX
+
+
+class DBSchemaCacheTest(unittest.TestCase):
+    """
+    NAME
+        DBSchemaCacheTest - snapshots of reflected tables are used only while the table does not change
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.engine = create_engine("sqlite:///" + os.path.join(self.path, "main.db"))
+        records_path = os.path.join(self.path, "records.db")
+
+        @event.listens_for(self.engine, "connect")
+        def attach_schema(dbapi_connection, connection_record):
+            dbapi_connection.execute("ATTACH DATABASE '{0}' AS {1}".format(records_path, DB_SCHEMA))
+
+        self.table = Table("Tracker", MetaData(bind=self.engine), Column("_id", Integer, primary_key=True),
+                           Column("name", String(20)), schema=DB_SCHEMA)
+        self.table.create()
+        self.snapshot_path = os.path.join(self.path, "snapshots")
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.path, True)
+
+    def open_cache(self):
+        cache = DBSchemaCache(self.snapshot_path)
+        cache.load_fingerprints(self.engine, DB_SCHEMA)
+        return cache
+
+    def reflect(self):
+        return Table("Tracker", MetaData(bind=self.engine), schema=DB_SCHEMA, autoload=True)
+
+    def test_snapshot_is_used_after_restart(self):
+        self.open_cache().put_table(self.engine, self.reflect())
+
+        table = self.open_cache().get_table("Tracker", MetaData())
+        self.assertIsNotNone(table)
+        self.assertEqual([column.name for column in table.c], ["_id", "name"])
+        self.assertEqual([column["name"] for column in self.open_cache().get_columns("Tracker")], ["_id", "name"])
+
+    def test_snapshot_of_a_changed_table_is_not_used(self):
+        self.open_cache().put_table(self.engine, self.reflect())
+        Index("Tracker_name_idx", self.table.c.name).create(self.engine)
+
+        cache = self.open_cache()
+        self.assertIsNone(cache.get_table("Tracker", MetaData()))
+        self.assertIsNone(cache.get_columns("Tracker"))
+
+    def test_forgotten_table_has_no_snapshot(self):
+        cache = self.open_cache()
+        cache.put_table(self.engine, self.reflect())
+        cache.forget("Tracker")
+
+        self.assertEqual([name for name in os.listdir(self.snapshot_path) if name.endswith(SNAPSHOT_SUFFIX)], [])
+        self.assertIsNone(self.open_cache().get_table("Tracker", MetaData()))
+
+    def test_no_snapshot_before_fingerprints_are_loaded(self):
+        self.open_cache().put_table(self.engine, self.reflect())
+        self.assertIsNone(DBSchemaCache(self.snapshot_path).get_table("Tracker", MetaData()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import unittest
+from datetime import datetime, date
+from decimal import Decimal
+
+from sqlalchemy import Integer
+
+from ActMonitor.server_application.database_actions.db_future import DBFuture
+from ActMonitor.server_application.database_actions.db_task import DBTask, DBTaskList, DBTaskListFull, READ_LANE, \
+    STREAM_LANE, INGEST_LANE, MAINTENANCE_LANE, INDEX_LANE, HARD_LIMIT_MODE
+
+
+class DBTaskListTest(unittest.TestCase):
+    """
+    NAME
+        DBTaskListTest - push, pop, shed and merge semantics of DBTaskList
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def setUp(self):
+        self.tasks = DBTaskList(coalesce_wait=0)
+
+    def pop_all(self):
+        popped = []
+        while True:
+            task = self.tasks.pop()
+            if task is None:
+                return popped
+            popped.append(task)
+
+    def test_push_routes_tasks_to_lanes(self):
+        self.assertEqual(self.tasks.push(DBTask("select", "Tracker")).lane, READ_LANE)
+        self.assertEqual(self.tasks.push(DBTask("stream", "Tracker")).lane, STREAM_LANE)
+        self.assertEqual(self.tasks.push(DBTask("insert", "Tracker", insert_data={"v": 1})).lane, INGEST_LANE)
+        self.assertEqual(self.tasks.push(DBTask("update_count", "Tracker")).lane, MAINTENANCE_LANE)
+        self.assertEqual(self.tasks.push(DBTask("create_index", "Tracker", columns="v")).lane, INDEX_LANE)
+        self.assertEqual(self.tasks.get_size(), 5)
+
+    def test_push_refuses_non_tasks(self):
+        self.assertRaises(Exception, self.tasks.push, {"action": "insert"})
+
+    def test_tasks_of_an_object_pop_in_order_one_at_a_time(self):
+        self.tasks.push(DBTask("delete", "Tracker", where_data={"v": 1}))
+        self.tasks.push(DBTask("delete", "Tracker", where_data={"v": 2}))
+
+        first = self.tasks.pop()
+        self.assertEqual(first.additional_args["where_data"], {"v": 1})
+        self.assertIsNone(self.tasks.pop())
+
+        self.tasks.task_done(first)
+        second = self.tasks.pop()
+        self.assertEqual(second.additional_args["where_data"], {"v": 2})
+
+    def test_leased_object_does_not_hold_up_other_objects(self):
+        for i in range(100):
+            self.tasks.push(DBTask("delete", "Tracker{0}".format(i)))
+            self.tasks.push(DBTask("delete", "Tracker{0}".format(i)))
+
+        popped = self.pop_all()
+        self.assertEqual(len(popped), 100)
+        self.assertEqual(len(set(task.object_name for task in popped)), 100)
+
+    def test_index_build_does_not_lease_its_object(self):
+        self.tasks.push(DBTask("create_index", "Tracker", columns="v"))
+        self.tasks.push(DBTask("insert", "Tracker", insert_data={"v": 1}))
+
+        popped = self.pop_all()
+        self.assertEqual(sorted(task.action for task in popped), ["create_index", "insert"])
+
+    def test_reads_run_side_by_side(self):
+        self.tasks.push(DBTask("select", "Tracker"))
+        self.tasks.push(DBTask("select", "Tracker"))
+        self.assertEqual(len(self.pop_all()), 2)
+
+    def test_adjacent_inserts_are_merged(self):
+        pushed = [self.tasks.push(DBTask("insert", "Tracker", insert_data={"v": i})) for i in range(3)]
+
+        merged = self.tasks.pop()
+        self.assertEqual(merged.merged, pushed)
+        self.assertEqual(merged.additional_args["insert_data"], [{"v": 0}, {"v": 1}, {"v": 2}])
+        self.assertEqual(self.tasks.get_size(), 0)
+
+    def test_merge_is_capped(self):
+        tasks = DBTaskList(coalesce_max_tasks=2, coalesce_wait=0)
+        for i in range(3):
+            tasks.push(DBTask("insert", "Tracker", insert_data={"v": i}))
+
+        merged = tasks.pop()
+        self.assertEqual(len(merged.merged), 2)
+        tasks.task_done(merged)
+        self.assertEqual(tasks.pop().additional_args["insert_data"], {"v": 2})
+
+    def test_inserts_of_other_objects_are_not_merged(self):
+        self.tasks.push(DBTask("insert", "Tracker", insert_data={"v": 1}))
+        self.tasks.push(DBTask("insert", "Other", insert_data={"v": 2}))
+
+        popped = self.pop_all()
+        self.assertEqual(len(popped), 2)
+        self.assertTrue(all(task.merged is None for task in popped))
+
+    def test_idempotent_tasks_are_pushed_once(self):
+        first = self.tasks.push(DBTask("update_count", "Tracker"))
+        self.assertIs(self.tasks.push(DBTask("update_count", "Tracker")), first)
+        self.assertEqual(self.tasks.get_size(), 1)
+
+        self.tasks.task_done(self.tasks.pop())
+        self.assertIsNot(self.tasks.push(DBTask("update_count", "Tracker")), first)
+
+    def test_hard_limit_refuses_tasks(self):
+        tasks = DBTaskList(max_tasks=2, limit_mode=HARD_LIMIT_MODE)
+        tasks.push(DBTask("update_count", "Tracker1"))
+        tasks.push(DBTask("update_count", "Tracker2"))
+
+        self.assertRaises(DBTaskListFull, tasks.push, DBTask("delete", "Tracker"))
+        self.assertEqual(tasks.get_size(), 2)
+
+    def test_soft_limit_sheds_only_regenerable_tasks(self):
+        tasks = DBTaskList(max_tasks=4)
+        shed_task = DBTask("update_count", "Tracker1")
+        shed_task.future = DBFuture(shed_task.action, shed_task.object_name)
+        tasks.push(shed_task)
+        tasks.push(DBTask("insert", "Tracker2", insert_data={"v": 1}))
+        tasks.push(DBTask("delete", "Tracker3"))
+        tasks.push(DBTask("delete", "Tracker4"))
+
+        tasks.push(DBTask("delete", "Tracker5"))
+        self.assertEqual(tasks.get_size(), 4)
+        self.assertRaises(DBTaskListFull, shed_task.future.wait, 1)
+
+        self.assertRaises(DBTaskListFull, tasks.push, DBTask("delete", "Tracker6"))
+        self.assertEqual(tasks.lanes[INGEST_LANE]["size"], 1)
+
+    def test_reads_never_shed_writes(self):
+        tasks = DBTaskList(max_tasks=2)
+        tasks.push(DBTask("update_count", "Tracker1"))
+        tasks.push(DBTask("delete", "Tracker2"))
+
+        self.assertRaises(DBTaskListFull, tasks.push, DBTask("select", "Tracker3"))
+        self.assertEqual(tasks.lanes[MAINTENANCE_LANE]["size"], 1)
+
+    def test_forced_push_skips_the_limits(self):
+        tasks = DBTaskList(max_tasks=1, limit_mode=HARD_LIMIT_MODE)
+        tasks.push(DBTask("delete", "Tracker1"))
+        tasks.push(DBTask("delete", "Tracker2"), force=True)
+        self.assertEqual(tasks.get_size(), 2)
+
+    def test_no_more_popping(self):
+        self.tasks.push(DBTask("delete", "Tracker"))
+        self.tasks.no_more_popping()
+        self.assertIsNone(self.tasks.pop())
+
+
+class DBTaskArgsTest(unittest.TestCase):
+    """
+    NAME
+        DBTaskArgsTest - additional arguments of a task decode back to the values they were created with
+    AUTHOR
+        Yoav Nathaniel
+    DATE
+        10/18/2026
+    """
+
+    def compact(self, **kwargs):
+        task = DBTask("insert", "Tracker", **kwargs)
+        task.compact()
+        return task
+
+    def test_dates_and_decimals_decode_back(self):
+        insert_data = {"at": datetime(2026, 10, 18, 12, 30, 0, 5), "midnight": datetime(2026, 10, 18),
+                       "day": date(2026, 10, 18), "price": Decimal("10.05"), "name": u"\u05d9\u05d5\u05d0\u05d1"}
+        task = self.compact(insert_data=insert_data)
+        self.assertIsNone(task.args)
+        self.assertEqual(task.additional_args["insert_data"], insert_data)
+
+    def test_column_types_are_encoded_by_name(self):
+        self.assertEqual(self.compact(properties=[{"type": Integer}]).additional_args["properties"],
+                         [{"type": "Integer"}])
+
+    def test_unsupported_values_are_refused(self):
+        self.assertRaises(TypeError, self.compact, insert_data={"v": object()})
+        self.assertRaises(TypeError, DBTaskList().push, DBTask("insert", "Tracker", insert_data={"v": set([1])}))
+
+    def test_reads_are_not_compacted(self):
+        tasks = DBTaskList()
+        where_data = {"at": datetime(2026, 10, 18)}
+        read_task = tasks.push(DBTask("select", "Tracker", where_data=where_data))
+        write_task = tasks.push(DBTask("delete", "Tracker", where_data=where_data))
+
+        self.assertIsNone(read_task.payload)
+        self.assertIs(read_task.additional_args["where_data"], where_data)
+        self.assertGreater(read_task.size, 0)
+        self.assertIsNone(write_task.args)
+        self.assertEqual(write_task.additional_args["where_data"], where_data)
+
+
+if __name__ == "__main__":
+    unittest.main()